@@ -29,6 +29,9 @@ async def stream_chat(request: Request):
             try:
                 while True:
                     message = await queue.get()
+                    if message is None:  # 서버 종료(drain) 시 reconnect 이벤트 후 연결 종료
+                        sse_manager.disconnect(client_id)
+                        break
                     yield message
             except asyncio.CancelledError:
                 sse_manager.disconnect(client_id)
@@ -62,7 +65,6 @@ async def stop_stream_processing(request: Request, streamId: str):
     스트리밍 종료 및 메모리 삭제 요청 엔드포인트
     """
     controller = BotChatsController(request.app)
+    controller.cancel_stream(streamId)
     controller.delete_memory(streamId)
-    
-    # TODO: streamId를 기준으로 실제 스트리밍 작업을 중단하는 로직 추가
     return {"message": f"Stream({streamId}) 종료 및 메모리 삭제 완료"}
\ No newline at end of file
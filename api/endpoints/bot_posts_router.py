@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request
 from api.endpoints.controllers.bot_posts_controller import BotPostsController, BotPostsRequest
+from schemas.bot_posts_schema import BotPostsBatchRequest
 
 # APIRouter 인스턴스 생성
 router = APIRouter()
@@ -12,4 +13,13 @@ async def create_bot_post(request: Request, body: BotPostsRequest):
     """
     # 요청마다 app 인스턴스를 controller에 전달해 싱글턴 모델을 사용
     controller = BotPostsController(request.app)
-    return await controller.create_bot_post(body)
\ No newline at end of file
+    return await controller.create_bot_post(body)
+
+
+@router.post("/batch")
+async def create_bot_posts_batch(request: Request, body: BotPostsBatchRequest):
+    """
+    소셜봇이 여러 게시판의 게시글을 한 번에 생성하는 엔드포인트 (항목별 성공/실패 반환)
+    """
+    controller = BotPostsController(request.app)
+    return await controller.create_bot_posts_batch(body)
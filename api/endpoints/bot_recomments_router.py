@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request
 from api.endpoints.controllers.bot_recomments_controller import BotRecommentsController, BotRecommentsRequest
+from schemas.bot_recomments_schema import BotRecommentsBatchRequest
 
 # APIRouter 인스턴스 생성
 router = APIRouter()
@@ -12,4 +13,13 @@ async def create_bot_recomments(request: Request, body: BotRecommentsRequest):
     """
     # 요청마다 app 인스턴스를 controller에 전달해 싱글턴 모델을 사용
     controller = BotRecommentsController(request.app)
-    return await controller.create_bot_recomments(body)
\ No newline at end of file
+    return await controller.create_bot_recomments(body)
+
+
+@router.post("/batch")
+async def create_bot_recomments_batch(request: Request, body: BotRecommentsBatchRequest):
+    """
+    소셜봇이 여러 댓글의 대댓글을 한 번에 생성하는 엔드포인트 (항목별 성공/실패 반환)
+    """
+    controller = BotRecommentsController(request.app)
+    return await controller.create_bot_recomments_batch(body)
@@ -35,3 +35,9 @@ class BotChatsController:
         공유 서비스의 메모리 삭제 메서드를 호출합니다.
         """
         self.service.delete_memory(stream_id)
+
+    def cancel_stream(self, stream_id: str):
+        """
+        공유 서비스의 진행 중인 채팅 작업 취소 메서드를 호출합니다.
+        """
+        self.service.cancel_stream(stream_id)
@@ -1,7 +1,7 @@
 from fastapi import status
 from fastapi.responses import JSONResponse
 from services.bot_posts_service import BotPostsService
-from schemas.bot_posts_schema import BotPostsRequest, BotPostsResponse
+from schemas.bot_posts_schema import BotPostsRequest, BotPostsResponse, BotPostsBatchRequest, BotPostsBatchResponse
 from utils.error_handler import InvalidQueryParameterError, InternalServerError
 
 class BotPostsController:
@@ -38,4 +38,22 @@ class BotPostsController:
                     "error": "internal_server_error",
                     "message": "AI 서버에 문제가 발생하였습니다."
                 }
-            )
\ No newline at end of file
+            )
+
+    async def create_bot_posts_batch(self, request: BotPostsBatchRequest) -> BotPostsBatchResponse:
+        """
+        여러 BotPostsRequest를 한 번에 처리하여 항목별 결과를 반환.
+        (항목별 실패는 응답 data에 포함되고, 배치 전체가 실패한 경우에만 500)
+        """
+        try:
+            return await self.service.generate_bot_posts_batch(request.requests)
+
+        except InternalServerError as e:
+            # 500 Internal Server Error: AI 서버 내부 오류
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={
+                    "error": "internal_server_error",
+                    "message": "AI 서버에 문제가 발생하였습니다."
+                }
+            )
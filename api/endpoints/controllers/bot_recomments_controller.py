@@ -1,6 +1,6 @@
 from fastapi import HTTPException
 from services.bot_recomments_service import BotRecommentsService
-from schemas.bot_recomments_schema import BotRecommentsRequest, BotRecommentsResponse
+from schemas.bot_recomments_schema import BotRecommentsRequest, BotRecommentsResponse, BotRecommentsBatchRequest, BotRecommentsBatchResponse
 from utils.error_handler import InvalidQueryParameterError, InvalidFormatError, InternalServerError
 
 class BotRecommentsController:
@@ -45,3 +45,18 @@ class BotRecommentsController:
                     "message": e.message if hasattr(e, 'message') else str(e)
                 }
             )
+
+    async def create_bot_recomments_batch(self, request: BotRecommentsBatchRequest) -> BotRecommentsBatchResponse:
+        try:
+            # 항목별 실패는 응답 data에 포함되고, 배치 전체가 실패한 경우에만 500
+            return await self.service.generate_bot_recomments_batch(request.requests)
+
+        except InternalServerError as e:
+            # 500 Internal Server Error
+            raise HTTPException(
+                status_code=500,
+                detail={
+                    "error": "internal_server_error",
+                    "message": e.message if hasattr(e, 'message') else str(e)
+                }
+            )
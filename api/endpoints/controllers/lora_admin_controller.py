@@ -0,0 +1,58 @@
+import asyncio
+from fastapi import status
+from fastapi.responses import JSONResponse
+from schemas.lora_admin_schema import LoRAAdapterSpec, LoRAAdapterSwapRequest
+
+class LoRAAdminController:
+    def __init__(self, app):
+        self.app = app
+        # vLLM(gcp) 모드에서만 LoRA 레지스트리가 존재
+        self.registry = getattr(app.state.model.loader, "lora_registry", None)
+
+    @staticmethod
+    def _not_available():
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "error": "lora_registry_not_available",
+                "message": "현재 모드에서는 LoRA adapter를 관리할 수 없습니다."
+            }
+        )
+
+    @staticmethod
+    def _invalid(e: Exception):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "invalid_lora_adapter", "message": str(e)}
+        )
+
+    async def list_adapters(self):
+        if self.registry is None:
+            return self._not_available()
+        return self.registry.list_adapters()
+
+    async def add_adapter(self, body: LoRAAdapterSpec):
+        if self.registry is None:
+            return self._not_available()
+        try:
+            # 가중치 다운로드/검증은 블로킹이므로 워커 스레드에서 실행
+            return await asyncio.to_thread(self.registry.add, body.model_dump())
+        except ValueError as e:
+            return self._invalid(e)
+
+    async def swap_adapter(self, adapter_type: str, body: LoRAAdapterSwapRequest):
+        if self.registry is None:
+            return self._not_available()
+        spec = {"adapter_type": adapter_type, "lora_name": body.lora_name, "path": body.path, "revision": body.revision}
+        try:
+            return await asyncio.to_thread(self.registry.swap, spec, body.drain_timeout)
+        except ValueError as e:
+            return self._invalid(e)
+
+    async def remove_adapter(self, adapter_type: str, drain_timeout: float = None):
+        if self.registry is None:
+            return self._not_available()
+        try:
+            return await asyncio.to_thread(self.registry.remove, adapter_type, drain_timeout)
+        except ValueError as e:
+            return self._invalid(e)
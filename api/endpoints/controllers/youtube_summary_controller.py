@@ -1,8 +1,9 @@
+import json
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 from services.youtube_summary_service import YouTubeSummaryService
-from schemas.youtube_summary_schema import YouTubeSummaryRequest, YouTubeSummaryResponse
-from utils.error_handler import InvalidYouTubeUrlError, SubtitlesNotFoundError, UnsupportedSubtitleLanguageError, VideoPrivateError, VideoNotFoundError
+from schemas.youtube_summary_schema import YouTubeSummaryRequest, YouTubeSummaryResponse, YouTubeSummaryStreamRequest
+from utils.error_handler import InvalidYouTubeUrlError, SubtitlesNotFoundError, UnsupportedSubtitleLanguageError, VideoPrivateError, VideoNotFoundError, DeadlineExceededError
 
 class YouTubeSummaryController:
     def __init__(self, app):
@@ -14,39 +15,74 @@ class YouTubeSummaryController:
         try:
             result = await self.service.create_summary(str(request.url))
             return result
-        except InvalidYouTubeUrlError:
+        except Exception as e:
+            status_code, content = self._error_content(e)
+            return JSONResponse(status_code=status_code, content=content)
+
+    async def stream_summary(self, request: YouTubeSummaryStreamRequest):
+        """
+        요약 진행 이벤트를 SSE 형식 문자열로 yield
+        - 오류가 발생하면 error 이벤트(status_code 포함)를 보내고 종료
+        """
+        try:
+            async for event, data in self.service.stream_summary(str(request.url), request.include_chunk_summaries):
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            status_code, content = self._error_content(e)
+            yield f"event: error\ndata: {json.dumps({'status_code': status_code, **content}, ensure_ascii=False)}\n\n"
+
+    async def run_summary_job(self, payload: dict):
+        """
+        작업 큐 handler: 요약을 생성하고 (성공 여부, 결과 또는 에러 body)를 반환
+        """
+        try:
+            result = await self.service.create_summary(payload["url"])
+            return True, result.model_dump()
+        except Exception as e:
+            status_code, content = self._error_content(e)
+            return False, {"status_code": status_code, **content}
+
+    @staticmethod
+    def _error_content(e: Exception):
+        """서비스 예외를 (HTTP status code, 에러 응답 body)로 변환"""
+        if isinstance(e, InvalidYouTubeUrlError):
             # 잘못된 유튜브 URL 형식
-            return JSONResponse(status_code=400, content={
+            return 400, {
                 "error": "invalid_format",
                 "message": "YouTube URL 형식이 유효하지 않습니다."
-            })
-        except SubtitlesNotFoundError:
+            }
+        if isinstance(e, SubtitlesNotFoundError):
             # 유튜브 동영상에 자막이 없는 경우
-            return JSONResponse(status_code=404, content={
+            return 404, {
                 "error": "subtitles_not_found",
                 "message": "해당 YouTube 영상에 자막이 존재하지 않습니다."
-            })
-        except UnsupportedSubtitleLanguageError:
+            }
+        if isinstance(e, UnsupportedSubtitleLanguageError):
             # 지원하지 않는 언어(한국어/영어가 아닌 자막)인 경우
-            return JSONResponse(status_code=415, content={
+            return 415, {
                 "error": "unsupported_subtitle_language",
                 "message": "해당 YouTube 영상의 자막이 지원하는 언어가 한국어 또는 영어가 아닙니다."
-            })
-        except VideoPrivateError:
+            }
+        if isinstance(e, VideoPrivateError):
             # 비공개 동영상인 경우
-            return JSONResponse(status_code=403, content={
+            return 403, {
                 "error": "video_private",
                 "message": "해당 YouTube 영상은 비공개 동영상입니다."
-            })
-        except VideoNotFoundError:
+            }
+        if isinstance(e, VideoNotFoundError):
             # 존재하지 않는 동영상인 경우
-            return JSONResponse(status_code=404, content={
+            return 404, {
                 "error": "video_not_found",
                 "message": "해당 YouTube 영상은 존재하지 않는 동영상입니다."
-            })
-        except Exception:
-            # 서버 내부 오류, LLM 등 기타 예외 상황
-            return JSONResponse(status_code=500, content={
-                "error": "internal_server_error",
-                "message": "AI 서버에 문제가 발생하였습니다."
-            })
\ No newline at end of file
+            }
+        if isinstance(e, DeadlineExceededError):
+            # 요청 마감 시각(deadline)을 넘긴 경우
+            return 504, {
+                "error": "deadline_exceeded",
+                "message": "요청 처리 시간이 초과되었습니다."
+            }
+        # 서버 내부 오류, LLM 등 기타 예외 상황
+        return 500, {
+            "error": "internal_server_error",
+            "message": "AI 서버에 문제가 발생하였습니다."
+        }
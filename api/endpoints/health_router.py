@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from core.drain import drain_controller
+
+router = APIRouter()
+
+
+@router.get("/live")
+def live():
+    """liveness: 프로세스가 요청을 처리할 수 있으면 항상 200"""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def ready(request: Request):
+    """
+    readiness: warmup이 끝나야 200, 그 전(또는 warmup 필수 단계 실패 시)과 종료 drain 중에는 503
+    - warmup 단계별 소요 시간, 시작 단계 프로파일, drain 진행 상황을 함께 반환
+    """
+    warmup = getattr(request.app.state, "warmup", None)
+    body = {
+        "status": "draining" if drain_controller.draining else (warmup.status if warmup else "starting"),
+        "warmup": warmup.summary() if warmup else None,
+        "startup": getattr(request.app.state, "startup_profile", None),
+        "drain": drain_controller.status() if drain_controller.draining else None
+    }
+    if warmup is None or not warmup.ready or drain_controller.draining:
+        return JSONResponse(status_code=503, content=body)
+    return body
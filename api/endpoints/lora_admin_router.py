@@ -0,0 +1,49 @@
+import os
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from api.endpoints.controllers.lora_admin_controller import LoRAAdminController
+from schemas.lora_admin_schema import LoRAAdapterSpec, LoRAAdapterSwapRequest
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 같아야 허용 (ADMIN_TOKEN이 없으면 관리 API 비활성화)"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+# APIRouter 인스턴스 생성 (모든 엔드포인트에 관리자 토큰 검사)
+router = APIRouter(dependencies=[Depends(verify_admin_token)])
+
+
+@router.get("")
+async def list_lora_adapters(request: Request):
+    """
+    등록된 LoRA adapter 목록과 사용량(진행 중/누적 요청 수, 로딩 시간)
+    """
+    return await LoRAAdminController(request.app).list_adapters()
+
+
+@router.post("")
+async def add_lora_adapter(request: Request, body: LoRAAdapterSpec):
+    """
+    새 LoRA adapter를 받아 검증한 뒤 등록
+    """
+    return await LoRAAdminController(request.app).add_adapter(body)
+
+
+@router.put("/{adapter_type}")
+async def swap_lora_adapter(request: Request, adapter_type: str, body: LoRAAdapterSwapRequest):
+    """
+    adapter 버전 교체 (새 버전 검증 후 교체, 이전 버전은 진행 중인 요청이 끝난 뒤 내림)
+    """
+    return await LoRAAdminController(request.app).swap_adapter(adapter_type, body)
+
+
+@router.delete("/{adapter_type}")
+async def remove_lora_adapter(request: Request, adapter_type: str, drain_timeout: Optional[float] = None):
+    """
+    adapter 등록 해제 (새 요청은 바로 거절, 진행 중인 요청이 끝난 뒤 내림)
+    """
+    return await LoRAAdminController(request.app).remove_adapter(adapter_type, drain_timeout)
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from api.endpoints.controllers.youtube_summary_controller import YouTubeSummaryController, YouTubeSummaryRequest
+from schemas.youtube_summary_schema import YouTubeSummaryStreamRequest, YouTubeSummaryJobRequest
 
 # APIRouter 인스턴스 생성
 router = APIRouter()
@@ -12,4 +14,55 @@ async def create_youtube_summary(request: Request, body: YouTubeSummaryRequest):
     """
     # 요청마다 app 인스턴스를 controller에 전달해 싱글턴 모델을 사용
     controller = YouTubeSummaryController(request.app)
-    return await controller.create_summary(body)
\ No newline at end of file
+    return await controller.create_summary(body)
+
+
+@router.post("/summary/stream")
+async def stream_youtube_summary(request: Request, body: YouTubeSummaryStreamRequest):
+    """
+    YouTube 영상 요약 진행 상황을 SSE로 전송하는 엔드포인트
+    - transcript -> chunk(청크마다) -> token(최종 요약 토큰) -> done 순서, 실패 시 error
+    """
+    controller = YouTubeSummaryController(request.app)
+    return StreamingResponse(
+        controller.stream_summary(body),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/summary/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_youtube_summary_job(request: Request, body: YouTubeSummaryJobRequest):
+    """
+    YouTube 영상 요약 작업을 등록하고 job_id를 바로 반환하는 엔드포인트
+    - 완료 여부는 GET /summary/jobs/{job_id}로 조회하거나 callback_url로 전달받음
+    """
+    try:
+        job = request.app.state.summary_jobs.submit({"url": body.url}, body.callback_url)
+    except ValueError:
+        return JSONResponse(status_code=400, content={
+            "error": "invalid_callback_url",
+            "message": "허용되지 않은 callback_url입니다."
+        })
+    return {"message": "요약 작업이 등록되었습니다.", "data": {"job_id": job["job_id"], "status": job["status"]}}
+
+
+@router.get("/summary/jobs/{job_id}")
+async def get_youtube_summary_job(request: Request, job_id: str):
+    """
+    요약 작업 상태 조회 엔드포인트 (queued / running / succeeded / failed)
+    """
+    job = request.app.state.summary_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={
+            "error": "job_not_found",
+            "message": "해당 요약 작업이 존재하지 않습니다."
+        })
+    return {"message": "요약 작업 상태입니다.", "data": {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }}
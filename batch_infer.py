@@ -0,0 +1,187 @@
+"""
+오프라인 배치 추론 CLI (백필/평가용)
+
+JSONL 입력을 읽어 소셜봇 게시글 / 대댓글 / YouTube 요약을 생성하고 결과를 JSONL로 기록한다.
+- posts / recomments: 한 줄에 BotPostsRequest / BotRecommentsRequest 하나, batch-size개씩 한 번의 배치 호출로 생성
+- youtube: 한 줄에 {"url": ...} 또는 URL 문자열 하나, batch-size개씩 동시에 요약
+- 각 줄에 "id"가 있으면 결과 key로 사용 (없으면 입력 줄 번호)
+- 이미 output에 기록된 id는 건너뛰므로 중단 후 같은 명령으로 이어서 실행 가능 (--retry-failed면 실패한 id는 다시 처리)
+- --num-shards / --shard-index로 여러 프로세스가 입력을 나누어 처리
+
+실행 예시:
+    python batch_infer.py --mode gcp-prod --task posts --input posts.jsonl --output posts_out.jsonl --batch-size 64
+    python batch_infer.py --mode api-dev --task youtube --input urls.jsonl --output summaries.jsonl --num-shards 4 --shard-index 0
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+from pydantic import ValidationError
+
+from models.model_loader import ModelLoader
+from schemas.bot_posts_schema import BotPostsRequest
+from schemas.bot_recomments_schema import BotRecommentsRequest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="텐텐 오프라인 배치 추론")
+    parser.add_argument(
+        "--mode",
+        choices=["colab", "gcp-dev", "gcp-prod", "api-dev", "api-prod", "remote", "cpu"],
+        default="gcp-prod",
+        help="LLM inference 모드 (main.py의 --mode와 동일)"
+    )
+    parser.add_argument("--task", choices=["posts", "recomments", "youtube"], required=True)
+    parser.add_argument("--input", required=True, help="입력 JSONL 경로")
+    parser.add_argument("--output", required=True, help="결과 JSONL 경로 (이미 있으면 이어서 기록)")
+    parser.add_argument("--batch-size", type=int, default=32, help="한 번에 모델에 전달할 요청 수 (youtube는 동시 요약 수)")
+    parser.add_argument("--num-shards", type=int, default=1)
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--retry-failed", action="store_true", help="output에 실패로 기록된 id도 다시 처리 (성공한 id만 건너뜀)")
+    args = parser.parse_args()
+    if not 0 <= args.shard_index < args.num_shards:
+        parser.error("--shard-index는 0 이상 --num-shards 미만이어야 합니다.")
+    return args
+
+
+def read_inputs(path: str, num_shards: int, shard_index: int):
+    """(id, raw 입력) 목록 중 이 shard에 해당하는 것만 반환"""
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            if line_no % num_shards != shard_index:
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                raw = line  # youtube 입력은 URL 문자열만 있어도 됨
+            item_id = raw.get("id") if isinstance(raw, dict) and raw.get("id") is not None else line_no
+            items.append((str(item_id), raw))
+    return items
+
+
+def read_done_ids(path: str, retry_failed: bool = False) -> set:
+    """
+    이미 기록된 결과의 id (중단 후 재실행 시 건너뜀, 마지막 줄이 잘린 경우 무시)
+    - retry_failed면 한 번이라도 성공한 id만 반환 (실패 기록만 있는 id는 다시 처리)
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if not retry_failed or record.get("status") == "success":
+                    done.add(str(record["id"]))
+            except (ValueError, KeyError, AttributeError):
+                continue
+    return done
+
+
+async def run_bot_batch(service, task: str, batch):
+    """posts / recomments 배치를 한 번의 배치 호출로 생성하고 결과 레코드 리스트 반환"""
+    request_cls = BotPostsRequest if task == "posts" else BotRecommentsRequest
+    records, requests, request_ids = [], [], []
+    for item_id, raw in batch:
+        try:
+            requests.append(request_cls(**raw))
+            request_ids.append(item_id)
+        except (ValidationError, TypeError) as e:
+            records.append({"id": item_id, "status": "failed", "error": {"error": "invalid_format", "message": str(e)}})
+
+    if requests:
+        start = time.perf_counter()
+        if task == "posts":
+            response = await service.generate_bot_posts_batch(requests)
+        else:
+            response = await service.generate_bot_recomments_batch(requests)
+        elapsed = time.perf_counter() - start
+        for item_id, item in zip(request_ids, response.data):
+            records.append({
+                "id": item_id,
+                "status": item.status,
+                "result": item.data.model_dump() if item.data else None,
+                "error": item.error.model_dump() if item.error else None,
+                "batch_size": len(requests),
+                "batch_elapsed_sec": round(elapsed, 3)
+            })
+    return records
+
+
+async def run_youtube_batch(service, batch):
+    """youtube 배치를 동시에 요약하고 결과 레코드 리스트 반환"""
+    async def summarize(item_id, raw):
+        url = raw.get("url") if isinstance(raw, dict) else str(raw)
+        start = time.perf_counter()
+        try:
+            response = await service.create_summary(url)
+            record = {"id": item_id, "url": url, "status": "success", "result": response.data.model_dump()}
+        except Exception as e:
+            record = {"id": item_id, "url": url, "status": "failed", "error": {"error": type(e).__name__, "message": str(e)}}
+        record["elapsed_sec"] = round(time.perf_counter() - start, 3)
+        return record
+
+    return await asyncio.gather(*(summarize(item_id, raw) for item_id, raw in batch))
+
+
+def create_service(task: str, model: ModelLoader):
+    # 서비스는 FastAPI app.state의 싱글턴을 사용하므로 같은 형태의 state를 구성
+    app = SimpleNamespace(state=SimpleNamespace(model=model))
+    if task == "posts":
+        from services.bot_posts_service import BotPostsService
+        return BotPostsService(app)
+    elif task == "recomments":
+        from services.bot_recomments_service import BotRecommentsService
+        return BotRecommentsService(app)
+    from services.youtube_summary_service import YouTubeSummaryService
+    return YouTubeSummaryService(app)
+
+
+async def main(args):
+    items = read_inputs(args.input, args.num_shards, args.shard_index)
+    done_ids = read_done_ids(args.output, args.retry_failed)
+    pending = [(item_id, raw) for item_id, raw in items if item_id not in done_ids]
+    print(f"[batch_infer] shard {args.shard_index}/{args.num_shards}: 전체 {len(items)}건, 완료 {len(items) - len(pending)}건, 남은 {len(pending)}건")
+    if not pending:
+        return
+
+    service = create_service(args.task, ModelLoader(mode=args.mode))
+    started = time.perf_counter()
+    processed = 0
+    with open(args.output, "a+", encoding="utf-8") as out:
+        # 중단으로 마지막 줄이 잘린 경우 다음 기록이 이어 붙지 않도록 줄바꿈 추가
+        if out.tell() > 0:
+            out.seek(out.tell() - 1)
+            if out.read(1) != "\n":
+                out.write("\n")
+        for start in range(0, len(pending), args.batch_size):
+            batch = pending[start:start + args.batch_size]
+            if args.task == "youtube":
+                records = await run_youtube_batch(service, batch)
+            else:
+                records = await run_bot_batch(service, args.task, batch)
+            for record in records:
+                out.write(json.dumps({"task": args.task, **record}, ensure_ascii=False) + "\n")
+            # 배치마다 기록을 디스크에 반영하여 중단되어도 완료된 배치는 다시 처리하지 않음
+            out.flush()
+            os.fsync(out.fileno())
+            processed += len(batch)
+            elapsed = time.perf_counter() - started
+            print(f"[batch_infer] {processed}/{len(pending)}건 완료 ({elapsed:.1f}s, {processed / elapsed:.2f}건/s)")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ["LLM_MODE"] = args.mode
+    asyncio.run(main(args))
@@ -0,0 +1,50 @@
+from typing import Callable, List
+
+from core.request_context import has_retry_budget
+
+
+def generate_with_retries(
+    model,
+    messages_list: List[list],
+    clean_fn: Callable[[str], str],
+    trace,
+    name: str,
+    adapter_type: str,
+    max_retries: int = 3
+) -> List[dict]:
+    """
+    여러 요청의 messages를 한 번의 배치 호출로 생성하고, 실패한 항목만 모아 다시 배치 호출
+    - 항목별로 정제(clean_fn) 결과가 비어 있거나 호출이 실패하면 최대 max_retries번 재시도
+    - 요청 마감까지 남은 시간이 부족하면 재시도하지 않음
+    Returns:
+        messages_list와 같은 순서의 {"content": 정제된 응답 또는 None, "attempts": 시도 횟수, "error": 마지막 오류}
+    """
+    results = [{"content": None, "attempts": 0, "error": None} for _ in messages_list]
+    pending = list(range(len(messages_list)))
+
+    for attempt in range(max_retries + 1):
+        if not pending or (attempt > 0 and not has_retry_budget()):
+            break
+        try:
+            responses = model.get_batch_responses([messages_list[idx] for idx in pending], trace, name, adapter_type)
+        except Exception as e:
+            responses = [{"status_code": 500, "error": str(e)}] * len(pending)
+
+        failed = []
+        for idx, response in zip(pending, responses):
+            result = results[idx]
+            result["attempts"] += 1
+            if response.get("status_code") != 200:
+                result["error"] = response.get("error", "inference failed")
+                failed.append(idx)
+                continue
+            content = clean_fn(response.get("content") or "")
+            if not content.strip():
+                result["error"] = "empty"
+                failed.append(idx)
+                continue
+            result["content"] = content
+            result["error"] = None
+        pending = failed
+
+    return results
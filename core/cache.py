@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Iterable, Optional
+
+from cachetools import LRUCache, TTLCache
+
+from core.metrics import COMPLETION_CACHE_REQUESTS
+
+
+class CompletionCache:
+    """
+    LLM completion 캐시 (content-addressed)
+    - key: messages + sampling params + adapter(+ 버전) + model 의 정규화된(canonical) JSON 해시
+    - 메모리(LRU/TTL) -> 디스크(diskcache) 2단 구성, 디스크 hit는 메모리로 승격
+    - 정책: 허용된 endpoint(name)이면서 temperature가 기준 이하인 호출만 캐시
+    """
+    def __init__(
+        self,
+        endpoints: Iterable[str],
+        max_temperature: Optional[float] = None,
+        memory_size: int = 1024,
+        ttl: Optional[float] = None,
+        disk_dir: Optional[str] = None
+    ):
+        self.endpoints = set(endpoints)
+        self.max_temperature = max_temperature
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=memory_size, ttl=ttl) if ttl else LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self.disk = None
+        if disk_dir:
+            import diskcache
+            self.disk = diskcache.Cache(disk_dir)
+
+    @staticmethod
+    def make_key(messages, sampling_params: dict, adapter_type: str, model: str, adapter_version: Optional[str] = None) -> str:
+        # adapter가 교체되면 버전이 달라져 이전 버전의 응답을 재사용하지 않음
+        payload = {
+            "messages": messages,
+            "sampling_params": sampling_params,
+            "adapter_type": adapter_type,
+            "adapter_version": adapter_version,
+            "model": model
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, name: str, temperature: Optional[float]) -> bool:
+        if name not in self.endpoints:
+            return False
+        if self.max_temperature is not None and temperature is not None and temperature > self.max_temperature:
+            return False
+        return True
+
+    def get(self, key: str, name: str = "inference") -> Optional[dict]:
+        with self._lock:
+            value = self.memory.get(key)
+        if value is not None:
+            COMPLETION_CACHE_REQUESTS.labels(endpoint=name, result="memory_hit").inc()
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                with self._lock:
+                    self.memory[key] = value
+                COMPLETION_CACHE_REQUESTS.labels(endpoint=name, result="disk_hit").inc()
+                return value
+
+        COMPLETION_CACHE_REQUESTS.labels(endpoint=name, result="miss").inc()
+        return None
+
+    def set(self, key: str, value: dict):
+        with self._lock:
+            self.memory[key] = value
+        if self.disk is not None:
+            self.disk.set(key, value, expire=self.ttl)
+
+
+class ChunkSummaryStore:
+    """
+    청크 내용 해시 기반 청크 요약 저장소
+    - key: 청크 내용 해시 + 청크 위치 + adapter + model
+    - 재업로드/클립/편집본처럼 겹치는 영상의 청크 요약을 재사용
+    """
+    def __init__(self, memory_size: int = 4096, disk_dir: Optional[str] = None):
+        self.memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+        self.disk = None
+        if disk_dir:
+            import diskcache
+            self.disk = diskcache.Cache(disk_dir)
+
+    @staticmethod
+    def make_key(content_hash: str, position: str, adapter_type: str, model: str, adapter_version: Optional[str] = None) -> str:
+        return hashlib.sha256(f"{content_hash}|{position}|{adapter_type}|{adapter_version}|{model}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                with self._lock:
+                    self.memory[key] = value
+        COMPLETION_CACHE_REQUESTS.labels(endpoint="chunk_summary_store", result="miss" if value is None else "hit").inc()
+        return value
+
+    def set(self, key: str, summary: str):
+        with self._lock:
+            self.memory[key] = summary
+        if self.disk is not None:
+            self.disk.set(key, summary)
+
+
+def create_completion_cache() -> Optional[CompletionCache]:
+    """
+    환경변수로 completion 캐시를 생성 (COMPLETION_CACHE_ENDPOINTS가 비어 있으면 비활성화)
+    - COMPLETION_CACHE_ENDPOINTS: 캐시할 호출 이름 목록 (예: "chunk_summary,final_summary")
+    - COMPLETION_CACHE_MAX_TEMPERATURE: 이 값보다 temperature가 높은 호출은 캐시하지 않음
+    - COMPLETION_CACHE_SIZE / COMPLETION_CACHE_TTL: 메모리 캐시 크기 / 만료 시간(초)
+    - COMPLETION_CACHE_DIR: 디스크 캐시 경로 (지정하지 않으면 메모리만 사용)
+    """
+    endpoints = [name.strip() for name in os.getenv("COMPLETION_CACHE_ENDPOINTS", "").split(",") if name.strip()]
+    if not endpoints:
+        return None
+
+    max_temperature = os.getenv("COMPLETION_CACHE_MAX_TEMPERATURE")
+    ttl = os.getenv("COMPLETION_CACHE_TTL")
+    return CompletionCache(
+        endpoints=endpoints,
+        max_temperature=float(max_temperature) if max_temperature else None,
+        memory_size=int(os.getenv("COMPLETION_CACHE_SIZE", "1024")),
+        ttl=float(ttl) if ttl else None,
+        disk_dir=os.getenv("COMPLETION_CACHE_DIR") or None
+    )
+
+
+def create_chunk_summary_store() -> ChunkSummaryStore:
+    """
+    CHUNK_SUMMARY_CACHE_DIR가 지정되면 디스크에도 저장하는 청크 요약 저장소를 생성
+    """
+    return ChunkSummaryStore(
+        memory_size=int(os.getenv("CHUNK_SUMMARY_CACHE_SIZE", "4096")),
+        disk_dir=os.getenv("CHUNK_SUMMARY_CACHE_DIR") or None
+    )
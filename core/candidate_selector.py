@@ -0,0 +1,52 @@
+from typing import Callable, List, Optional, Tuple
+
+
+def score_candidate(content: str, messages: Optional[list] = None) -> float:
+    """
+    정제된 후보 응답의 점수를 계산 (높을수록 좋음)
+    - 빈 응답은 -1 (무효)
+    - 길이(최대 200자까지)와 단어 다양성을 반영
+    - 입력 메시지를 그대로 따라 쓴 응답은 감점
+    """
+    if not content or not content.strip():
+        return -1.0
+
+    words = content.split()
+    distinct_ratio = len(set(words)) / len(words) if words else 0.0
+    score = min(len(content), 200) * distinct_ratio
+
+    if messages:
+        for message in messages:
+            message_content = message.get("content", "") if isinstance(message, dict) else ""
+            if message_content and content in message_content:
+                score *= 0.1
+                break
+    return score
+
+
+def select_best_candidate(
+    candidates: List[str],
+    clean_fn: Callable[[str], str],
+    messages: Optional[list] = None
+) -> Tuple[int, str, List[float]]:
+    """
+    후보 응답들을 한 번에 정제/평가하고 가장 좋은 유효 후보를 선택
+    Args:
+        candidates: 모델이 생성한 원본 후보 리스트
+        clean_fn: 서비스의 clean_response 함수
+        messages: 모델에 전달한 messages (따라 쓰기 감점용)
+    Returns:
+        (선택된 후보 인덱스, 정제된 내용, 후보별 점수)
+        - 유효한 후보가 없으면 인덱스는 -1, 내용은 ""
+    """
+    cleaned = [clean_fn(candidate or "") for candidate in candidates]
+    scores = [score_candidate(content, messages) for content in cleaned]
+
+    best_idx = -1
+    for idx, score in enumerate(scores):
+        if score >= 0 and (best_idx < 0 or score > scores[best_idx]):
+            best_idx = idx
+
+    if best_idx < 0:
+        return -1, "", scores
+    return best_idx, cleaned[best_idx], scores
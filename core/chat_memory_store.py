@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from langchain.memory import ConversationBufferWindowMemory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+
+class ChatMemoryStore(ABC):
+    """
+    stream_id별 대화 메모리 저장소 인터페이스
+    - in-process: 워커 프로세스 메모리에 저장 (단일 워커 전용)
+    - sqlite: 로컬 SQLite 파일에 저장 (같은 호스트의 여러 워커가 공유)
+    """
+    def __init__(self, k: int):
+        self.k = k  # ConversationBufferWindowMemory와 동일하게 최근 k개의 대화 쌍을 유지
+
+    @abstractmethod
+    def get_memory(self, stream_id: str) -> ConversationBufferWindowMemory:
+        pass
+
+    @abstractmethod
+    def add_message(self, stream_id: str, role: str, content: str):
+        pass
+
+    @abstractmethod
+    def get_messages(self, stream_id: str) -> List[BaseMessage]:
+        pass
+
+    @abstractmethod
+    def delete(self, stream_id: str):
+        pass
+
+    @abstractmethod
+    def __contains__(self, stream_id: str) -> bool:
+        pass
+
+
+class InProcessChatMemoryStore(ChatMemoryStore):
+    def __init__(self, k: int):
+        super().__init__(k)
+        self.memories: Dict[str, ConversationBufferWindowMemory] = {}
+
+    def get_memory(self, stream_id: str) -> ConversationBufferWindowMemory:
+        if stream_id not in self.memories:
+            self.memories[stream_id] = ConversationBufferWindowMemory(k=self.k, return_messages=True)
+        return self.memories[stream_id]
+
+    def add_message(self, stream_id: str, role: str, content: str):
+        memory = self.get_memory(stream_id)
+        if role == 'user':
+            memory.chat_memory.add_user_message(content)
+        elif role == 'ai':
+            memory.chat_memory.add_ai_message(content)
+
+    def get_messages(self, stream_id: str) -> List[BaseMessage]:
+        return self.get_memory(stream_id).buffer_as_messages
+
+    def delete(self, stream_id: str):
+        if stream_id in self.memories:
+            del self.memories[stream_id]
+
+    def __contains__(self, stream_id: str) -> bool:
+        return stream_id in self.memories
+
+
+class SQLiteChatMemoryStore(ChatMemoryStore):
+    """
+    여러 uvicorn 워커가 공유하는 SQLite 기반 대화 메모리
+    - 스트림별로 최근 k*2개의 메시지만 남기고 오래된 메시지는 삭제
+    """
+    def __init__(self, k: int, db_path: str):
+        super().__init__(k)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chat_messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "stream_id TEXT NOT NULL, "
+            "role TEXT NOT NULL, "
+            "content TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_stream ON chat_messages (stream_id, id)")
+        self._conn.commit()
+
+    def get_memory(self, stream_id: str) -> ConversationBufferWindowMemory:
+        # 조회 시점의 스냅샷으로 메모리 객체를 구성 (수정은 add_message로만 반영됨)
+        memory = ConversationBufferWindowMemory(k=self.k, return_messages=True)
+        memory.chat_memory.add_messages(self.get_messages(stream_id))
+        return memory
+
+    def add_message(self, stream_id: str, role: str, content: str):
+        if role not in ('user', 'ai'):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO chat_messages (stream_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (stream_id, role, content, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM chat_messages WHERE stream_id = ? AND id NOT IN "
+                "(SELECT id FROM chat_messages WHERE stream_id = ? ORDER BY id DESC LIMIT ?)",
+                (stream_id, stream_id, self.k * 2)
+            )
+            self._conn.commit()
+
+    def get_messages(self, stream_id: str) -> List[BaseMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM chat_messages WHERE stream_id = ? ORDER BY id DESC LIMIT ?",
+                (stream_id, self.k * 2)
+            ).fetchall()
+        return [
+            HumanMessage(content=content) if role == 'user' else AIMessage(content=content)
+            for role, content in reversed(rows)
+        ]
+
+    def delete(self, stream_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_messages WHERE stream_id = ?", (stream_id,))
+            self._conn.commit()
+
+    def __contains__(self, stream_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM chat_messages WHERE stream_id = ? LIMIT 1", (stream_id,)
+            ).fetchone()
+        return row is not None
+
+
+def create_chat_memory_store(k: int) -> ChatMemoryStore:
+    """
+    STATE_BACKEND 환경변수(memory / sqlite)에 따라 대화 메모리 저장소를 생성
+    """
+    backend = os.getenv("STATE_BACKEND", "memory")
+    if backend == "memory":
+        return InProcessChatMemoryStore(k)
+    elif backend == "sqlite":
+        return SQLiteChatMemoryStore(k, os.getenv("STATE_SQLITE_PATH", "/tmp/tenten-state.db"))
+    else:
+        raise ValueError(f"Unsupported STATE_BACKEND: {backend}")
@@ -0,0 +1,72 @@
+import hashlib
+from typing import List
+
+
+def _unit_hash(unit: str) -> int:
+    normalized = " ".join(unit.split()).lower()
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def content_defined_chunks(
+    units: List[str],
+    max_chars: int = 6500,
+    min_chars: int = 2000,
+    window: int = 3,
+    boundary_divisor: int = 64
+) -> List[str]:
+    """
+    자막 조각(units)을 내용 기반 경계로 묶어 청크 리스트를 반환 (content-defined chunking)
+    - 최근 window개 조각의 해시를 합친 rolling hash가 boundary_divisor로 나누어떨어지면 경계로 사용
+    - 경계가 앞 내용이 아닌 주변 조각의 내용에만 의존하므로, 앞부분에 문장이 삽입되어도 이후 경계는 유지됨
+    - 청크 길이는 min_chars 이상, max_chars 이하 (max_chars를 넘는 조각은 글자 단위로 분할)
+    Args:
+        units: 자막 조각 텍스트 리스트
+        max_chars: 청크 최대 길이 (모델 입력 한도)
+        min_chars: 청크 최소 길이 (너무 잘게 나뉘는 것 방지)
+        window: rolling hash에 사용할 조각 수
+        boundary_divisor: 경계 확률의 역수 (조각 수 기준 평균 간격)
+    Returns:
+        청크 텍스트 리스트
+    """
+    pieces = []
+    for unit in units:
+        unit = unit.strip()
+        if not unit:
+            continue
+        # 단일 조각이 최대 길이를 넘으면 잘라서 사용
+        for start in range(0, len(unit), max_chars):
+            pieces.append(unit[start:start + max_chars])
+
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+    recent_hashes: List[int] = []
+
+    for piece in pieces:
+        added_len = len(piece) + (1 if current else 0)
+        if current and current_len + added_len > max_chars:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+            added_len = len(piece)
+
+        current.append(piece)
+        current_len += added_len
+
+        recent_hashes.append(_unit_hash(piece))
+        if len(recent_hashes) > window:
+            recent_hashes.pop(0)
+        rolling = 0
+        for unit_hash in recent_hashes:
+            rolling = ((rolling * 1000003) ^ unit_hash) & 0xFFFFFFFFFFFFFFFF
+        if current_len >= min_chars and rolling % boundary_divisor == 0:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_content_hash(chunk: str) -> str:
+    """공백을 정규화한 청크 내용의 해시 (청크 요약 재사용 key)"""
+    return hashlib.sha256(" ".join(chunk.split()).encode("utf-8")).hexdigest()
@@ -0,0 +1,171 @@
+import asyncio
+import inspect
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import uvicorn
+
+from core.metrics import DRAIN_IN_FLIGHT
+
+# drain 중에도 받는 경로 (health check, 메트릭)
+_EXEMPT_PREFIXES = ("/health", "/metrics")
+# 연결이 종료 시점까지 유지되어 진행 중인 요청 수에 세지 않는 경로 (SSE 구독)
+_LONG_LIVED_PATHS = ("/chat/stream",)
+_WORK_METHODS = ("POST", "PUT", "PATCH")
+
+
+class DrainController:
+    """
+    종료(rolling deploy) 시 진행 중인 작업을 마무리하는 drain 절차
+    1. draining 상태로 전환: readiness 503, 새 작업 요청 503 (on_start 훅: 사전 생성/작업 큐 수집 중단 등)
+    2. 등록된 진행 중 작업 수(HTTP 요청, 채팅 작업, 요약 작업, 모델 호출)가 0이 되거나 grace_seconds가 지날 때까지 대기
+    3. on_drained 훅 실행 (SSE 클라이언트에 reconnect 이벤트 전송, Langfuse 버퍼 flush 등)
+    """
+    def __init__(self, grace_seconds: Optional[float] = None, poll_interval: float = 0.2, report_interval: float = 2.0):
+        self.grace_seconds = grace_seconds
+        self.poll_interval = poll_interval
+        self.report_interval = report_interval
+        self.draining = False
+        self.drained: Optional[bool] = None  # 완료 후 grace 안에 모두 끝났는지
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.active_requests = 0
+        self.sources: Dict[str, Callable[[], int]] = {"http": lambda: self.active_requests}
+        self._on_start: List[Callable] = []
+        self._on_drained: List[Callable] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, count_fn: Callable[[], int]):
+        """진행 중인 작업 수를 반환하는 함수 등록"""
+        self.sources[name] = count_fn
+
+    def on_start(self, fn: Callable):
+        self._on_start.append(fn)
+
+    def on_drained(self, fn: Callable):
+        self._on_drained.append(fn)
+
+    def in_flight(self) -> Dict[str, int]:
+        counts = {}
+        for name, count_fn in self.sources.items():
+            try:
+                counts[name] = int(count_fn())
+            except Exception:
+                counts[name] = 0
+            DRAIN_IN_FLIGHT.labels(source=name).set(counts[name])
+        return counts
+
+    def status(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {"draining": self.draining, "drained": self.drained, "elapsed_seconds": elapsed, "in_flight": self.in_flight()}
+
+    async def _run_hooks(self, hooks: List[Callable]):
+        for fn in hooks:
+            try:
+                result = fn()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"drain 훅 실행 실패 ({getattr(fn, '__qualname__', fn)}): {e}")
+
+    async def _drain(self, should_abort: Callable[[], bool]) -> bool:
+        grace = self.grace_seconds
+        if grace is None:
+            grace = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+        self.draining = True
+        self.started_at = time.time()
+        print(f"drain 시작: 새 작업 요청을 받지 않고 진행 중인 작업을 최대 {grace:.0f}초 기다립니다.")
+        await self._run_hooks(self._on_start)
+
+        deadline = time.monotonic() + grace
+        next_report = 0.0
+        while True:
+            counts = self.in_flight()
+            total = sum(counts.values())
+            if total == 0 or time.monotonic() >= deadline or should_abort():
+                break
+            if time.monotonic() >= next_report:
+                left = deadline - time.monotonic()
+                print(f"drain 진행 중: {total}건 남음 {counts} (남은 시간 {left:.0f}s)")
+                next_report = time.monotonic() + self.report_interval
+            await asyncio.sleep(self.poll_interval)
+
+        self.drained = total == 0
+        if not self.drained:
+            print(f"drain 시간 초과: 진행 중인 작업 {total}건 {counts}을 남기고 종료합니다.")
+        await self._run_hooks(self._on_drained)
+        self.finished_at = time.time()
+        print(f"drain 완료 ({self.finished_at - self.started_at:.2f}s, drained: {self.drained})")
+        return self.drained
+
+    async def drain(self, should_abort: Callable[[], bool] = lambda: False) -> bool:
+        """drain 실행 (여러 곳에서 호출해도 한 번만 실행)"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._drain(should_abort))
+        return await asyncio.shield(self._task)
+
+
+class DrainMiddleware:
+    """
+    drain 중 새 작업 요청(POST/PUT/PATCH, SSE 구독)을 503으로 거절하고, 받은 요청 수를 세는 ASGI 미들웨어
+    - health check, 메트릭 경로와 조회/취소 요청(GET/DELETE)은 계속 처리
+    """
+    def __init__(self, app, controller: DrainController):
+        self.app = app
+        self.controller = controller
+
+    async def _reject(self, send):
+        body = json.dumps({"error": "draining", "message": "서버가 종료 중입니다. 잠시 후 다시 시도해 주세요."}, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1"),
+                (b"connection", b"close"),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path.startswith(_EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        long_lived = path in _LONG_LIVED_PATHS and scope.get("method") == "GET"
+        if self.controller.draining and (scope.get("method") in _WORK_METHODS or long_lived):
+            await self._reject(send)
+            return
+        if long_lived:
+            await self.app(scope, receive, send)
+            return
+        # 응답 이후 실행되는 BackgroundTasks(/chat 생성 등)도 이 구간에 포함됨
+        self.controller.active_requests += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.active_requests -= 1
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    종료 신호를 받으면 listen socket을 닫기 전에 drain을 먼저 실행하는 uvicorn 서버
+    - drain 동안에도 health check에 응답하여 로드밸런서가 readiness 503을 보고 트래픽을 뺄 수 있음
+    - drain 중 Ctrl+C를 한 번 더 누르면 기다리지 않고 종료
+    """
+    def __init__(self, config: uvicorn.Config, controller: Optional[DrainController] = None):
+        super().__init__(config)
+        self.controller = controller or drain_controller
+
+    async def shutdown(self, sockets=None):
+        await self.controller.drain(should_abort=lambda: self.force_exit)
+        await super().shutdown(sockets)
+
+
+# 미들웨어, readiness, lifespan, 서버가 같은 인스턴스를 사용 (uvicorn이 main 모듈을 다시 import해도 공유됨)
+drain_controller = DrainController()
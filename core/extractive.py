@@ -0,0 +1,107 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+_SENTENCE_END = re.compile(r"[.!?。？！]$|(?:요|다|죠|까)[.!?]?$")
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def split_segments(units: List[str], segment_chars: int = 200) -> List[str]:
+    """
+    자막 조각을 문장 단위 segment로 묶음
+    - 자동 자막은 문장부호가 없는 경우가 많으므로 문장 종결 또는 segment_chars 이상이면 끊음
+    """
+    segments, current, current_len = [], [], 0
+    for unit in units:
+        unit = unit.strip()
+        if not unit:
+            continue
+        current.append(unit)
+        current_len += len(unit) + 1
+        if current_len >= segment_chars or (current_len >= segment_chars // 4 and _SENTENCE_END.search(unit)):
+            segments.append(" ".join(current))
+            current, current_len = [], 0
+    if current:
+        segments.append(" ".join(current))
+    return segments
+
+
+def _tokens(segment: str) -> List[str]:
+    """단어 + 단어 내 글자 bigram (조사/어미가 붙는 한국어에서도 같은 어근끼리 겹치도록)"""
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(segment.lower()):
+        tokens.append(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def tfidf_matrix(segments: List[str]) -> sparse.csr_matrix:
+    """행 단위로 L2 정규화된 TF-IDF 행렬 (segment x vocab)"""
+    vocab = {}
+    rows, cols, values = [], [], []
+    for row, segment in enumerate(segments):
+        for token, count in Counter(_tokens(segment)).items():
+            rows.append(row)
+            cols.append(vocab.setdefault(token, len(vocab)))
+            values.append(1 + np.log(count))
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(segments), len(vocab)), dtype=np.float64)
+    df = np.bincount(matrix.indices, minlength=len(vocab))
+    idf = np.log((1 + len(segments)) / (1 + df)) + 1
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def textrank_scores(segments: List[str], damping: float = 0.85, max_iter: int = 100, tol: float = 1e-6) -> np.ndarray:
+    """TF-IDF 코사인 유사도 그래프에서 PageRank(power iteration)로 segment 중요도 계산"""
+    n = len(segments)
+    if n == 0:
+        return np.zeros(0)
+    matrix = tfidf_matrix(segments)
+    similarity = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(similarity, 0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    # 다른 segment와 전혀 겹치지 않는 segment는 모든 segment로 균등하게 전이
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums > 0, row_sums, 1), 1 / n)
+
+    scores = np.full(n, 1 / n)
+    for _ in range(max_iter):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def extractive_compress(units: List[str], budget_chars: int, segment_chars: int = 200) -> Tuple[List[str], dict]:
+    """
+    TextRank 점수가 높은 segment를 budget_chars 이내로 골라 원래 순서대로 반환
+    Returns:
+        (선택된 segment 리스트, 통계 dict)
+    """
+    segments = split_segments(units, segment_chars)
+    original_chars = len(" ".join(segments))
+    if original_chars <= budget_chars:
+        selected = segments
+    else:
+        scores = textrank_scores(segments)
+        chosen, total = [], 0
+        for idx in np.argsort(-scores, kind="stable"):
+            length = len(segments[idx]) + (1 if chosen else 0)
+            if total + length > budget_chars:
+                continue
+            chosen.append(int(idx))
+            total += length
+        selected = [segments[idx] for idx in sorted(chosen)]
+
+    return selected, {
+        "original_chars": original_chars,
+        "compressed_chars": len(" ".join(selected)),
+        "segments": len(segments),
+        "selected_segments": len(selected)
+    }
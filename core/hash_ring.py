@@ -0,0 +1,79 @@
+import bisect
+import hashlib
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+class ConsistentHashRing:
+    """
+    가상 노드를 사용하는 consistent hash ring (bounded-load 지원)
+    - 같은 key(stream_id, video_id)는 항상 같은 노드로 라우팅되어 해당 replica의 prefix cache / 대화 메모리를 재사용
+    - 노드가 추가/제거되면 해당 노드 구간의 key만 이동
+    - bounded load: 노드의 부하가 평균의 load_factor배를 넘으면 ring의 다음 노드로 넘김
+      (Consistent Hashing with Bounded Loads)
+    """
+    def __init__(self, nodes: Optional[List[str]] = None, replicas: int = 100, load_factor: float = 1.25):
+        self.replicas = replicas
+        self.load_factor = load_factor
+        self._lock = threading.Lock()
+        self._hashes: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self.nodes = set()
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def add_node(self, node: str):
+        with self._lock:
+            if node in self.nodes:
+                return
+            self.nodes.add(node)
+            for i in range(self.replicas):
+                point = self._hash(f"{node}#{i}")
+                self._owners[point] = node
+                bisect.insort(self._hashes, point)
+
+    def remove_node(self, node: str):
+        with self._lock:
+            if node not in self.nodes:
+                return
+            self.nodes.discard(node)
+            for i in range(self.replicas):
+                point = self._hash(f"{node}#{i}")
+                if self._owners.get(point) == node:
+                    del self._owners[point]
+                    idx = bisect.bisect_left(self._hashes, point)
+                    if idx < len(self._hashes) and self._hashes[idx] == point:
+                        self._hashes.pop(idx)
+
+    def get_node(self, key: str, loads: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """
+        key를 담당할 노드를 반환
+        Args:
+            key: 라우팅 key
+            loads: 노드별 현재 부하(진행 중인 요청 수). 주어지면 bounded-load 규칙을 적용
+        """
+        with self._lock:
+            if not self._hashes:
+                return None
+            start = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+            if not loads:
+                return self._owners[self._hashes[start]]
+
+            total = sum(loads.get(node, 0) for node in self.nodes) + 1
+            capacity = math.ceil(self.load_factor * total / len(self.nodes))
+            seen = set()
+            for offset in range(len(self._hashes)):
+                node = self._owners[self._hashes[(start + offset) % len(self._hashes)]]
+                if node in seen:
+                    continue
+                seen.add(node)
+                if loads.get(node, 0) < capacity:
+                    return node
+                if len(seen) == len(self.nodes):
+                    break
+            return self._owners[self._hashes[start]]
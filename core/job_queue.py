@@ -0,0 +1,396 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+# handler(payload) -> (성공 여부, 결과 또는 에러 body)
+JobHandler = Callable[[dict], Awaitable[Tuple[bool, dict]]]
+
+
+def is_allowed_callback_url(url: str, allowed_hosts: Iterable[str], allowed_schemes: Iterable[str] = ("https",)) -> bool:
+    """
+    callback_url이 허용 목록의 scheme/host인지 확인 (서버가 임의의 내부 주소로 요청을 보내지 않도록, SSRF 방지)
+    - allowed_hosts: 정확히 일치하는 host 또는 ".example.com" 형식(하위 도메인 포함)
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    host = (parsed.hostname or "").lower()
+    if parsed.scheme.lower() not in set(allowed_schemes) or not host:
+        return False
+    for allowed in allowed_hosts:
+        allowed = allowed.lower()
+        if host == allowed.lstrip(".") or (allowed.startswith(".") and host.endswith(allowed)):
+            return True
+    return False
+
+
+class JobStore:
+    """
+    SQLite에 작업 상태를 저장 (재시작/다른 워커에서도 조회 가능)
+    - status: queued -> running -> succeeded / failed
+    - running 작업은 lease 동안 heartbeat가 없으면 다른 워커가 다시 가져감
+    - 가져간 횟수(attempts)가 max_attempts에 이른 작업은 다시 가져가지 않고 failed 처리 (워커를 죽이는 작업 반복 방지)
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, "
+            "kind TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "result TEXT, "
+            "error TEXT, "
+            "callback_url TEXT, "
+            "callback_sent INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (kind, status, created_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        return {
+            "job_id": row["job_id"],
+            "status": row["status"],
+            "payload": json.loads(row["payload"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": json.loads(row["error"]) if row["error"] else None,
+            "callback_url": row["callback_url"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"]
+        }
+
+    def create(self, kind: str, payload: dict, callback_url: Optional[str] = None) -> dict:
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, payload, status, callback_url, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), callback_url, now, now)
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def fail_exhausted(self, kind: str, lease: float, max_attempts: Optional[int]) -> List[dict]:
+        """lease가 만료된 실행 중 작업 중 max_attempts번 가져간 작업을 failed 처리하고 반환"""
+        if not max_attempts:
+            return []
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT job_id, attempts FROM jobs WHERE kind = ? AND status = 'running' AND updated_at < ? AND attempts >= ?",
+                    (kind, now - lease, max_attempts)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE job_id = ?",
+                    [(json.dumps({
+                        "error": "max_attempts_exceeded",
+                        "message": f"작업이 {row['attempts']}번 시도 중 완료되지 못했습니다."
+                    }, ensure_ascii=False), now, row["job_id"]) for row in rows]
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return [self.get(row["job_id"]) for row in rows]
+
+    def claim_next(self, kind: str, owner: str, lease: float, max_attempts: Optional[int] = None) -> Optional[dict]:
+        """대기 중이거나 lease가 만료된 실행 중 작업 하나를 가져옴 (max_attempts번 가져간 작업은 제외)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE kind = ? AND (status = 'queued' OR (status = 'running' AND updated_at < ? AND attempts < ?)) "
+                    "ORDER BY created_at LIMIT 1",
+                    (kind, now - lease, max_attempts or sys.maxsize)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                        (owner, now, row["job_id"])
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return self._to_dict(row) if row else None
+
+    def heartbeat(self, job_ids: List[str]):
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET updated_at = ? WHERE job_id = ? AND status = 'running'",
+                [(time.time(), job_id) for job_id in job_ids]
+            )
+            self._conn.commit()
+
+    def finish(self, job_id: str, owner: str, succeeded: bool, body: dict) -> bool:
+        """
+        작업 결과 저장 (지금 작업을 가진 owner일 때만, 저장했으면 True)
+        - lease가 만료되어 다른 워커가 다시 가져간 작업의 결과를 이전 워커가 덮어쓰지 않도록 함
+        """
+        column = "result" if succeeded else "error"
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET status = ?, {column} = ?, updated_at = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+                ("succeeded" if succeeded else "failed", json.dumps(body, ensure_ascii=False), time.time(), job_id, owner)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def pending_callbacks(self, kind: str) -> List[dict]:
+        """완료됐지만 callback을 보내지 못한 작업"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND status IN ('succeeded', 'failed') "
+                "AND callback_url IS NOT NULL AND callback_sent = 0",
+                (kind,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def mark_callbacks_sent(self, job_ids: List[str]):
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET callback_sent = 1 WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            self._conn.commit()
+
+
+class JobQueue:
+    """
+    SQLite 기반 비동기 작업 큐
+    - submit(): 작업을 저장하고 job_id를 바로 반환
+    - 최대 workers개의 worker가 작업을 가져와 handler로 처리 (여러 프로세스가 같은 DB를 공유해도 중복 처리하지 않음)
+    - 완료된 작업은 callback_url별로 모아 batch로 webhook 전송 (실패 시 백오프 후 재시도, 계속 실패하면 url별로 백오프를 늘려가며 다시 대기열에 넣음)
+    """
+    def __init__(
+        self,
+        store: JobStore,
+        kind: str,
+        handler: JobHandler,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        lease: float = 120,
+        max_attempts: Optional[int] = 3,
+        callback_batch_size: int = 20,
+        callback_interval: float = 1.0,
+        callback_retries: int = 3,
+        callback_max_backoff: float = 300,
+        callback_allowed_hosts: Iterable[str] = (),
+        callback_allowed_schemes: Iterable[str] = ("https",)
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.kind = kind
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.callback_batch_size = callback_batch_size
+        self.callback_interval = callback_interval
+        self.callback_retries = callback_retries
+        self.callback_max_backoff = callback_max_backoff
+        self._callback_backoff: Dict[str, Tuple[int, float]] = {}  # callback_url -> (연속 실패 횟수, 다음 전송 시각)
+        self.callback_allowed_hosts = list(callback_allowed_hosts)
+        self.callback_allowed_schemes = list(callback_allowed_schemes)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.running: Dict[str, asyncio.Task] = {}
+        self.paused = False
+        self._callbacks: List[dict] = []
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def is_allowed_callback(self, callback_url: str) -> bool:
+        return is_allowed_callback_url(callback_url, self.callback_allowed_hosts, self.callback_allowed_schemes)
+
+    def submit(self, payload: dict, callback_url: Optional[str] = None) -> dict:
+        """
+        Raises:
+            ValueError: 허용 목록에 없는 callback_url
+        """
+        if callback_url and not self.is_allowed_callback(callback_url):
+            raise ValueError(f"허용되지 않은 callback_url입니다: {callback_url}")
+        job = self.store.create(self.kind, payload, callback_url)
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def in_flight_count(self) -> int:
+        return len(self.running)
+
+    def pause(self):
+        """새 작업을 더 가져오지 않음 (실행 중인 작업과 callback 전송은 계속, 종료 drain 시 사용)"""
+        self.paused = True
+        self._wakeup.set()
+
+    async def _worker(self, index: int):
+        while not self.paused:
+            for failed in await asyncio.to_thread(self.store.fail_exhausted, self.kind, self.lease, self.max_attempts):
+                self.logger.error(f"[job {failed['job_id']}] 최대 시도 횟수({self.max_attempts}) 초과로 실패 처리")
+                if failed["callback_url"]:
+                    self._callbacks.append(failed)
+            job = await asyncio.to_thread(self.store.claim_next, self.kind, self.owner, self.lease, self.max_attempts)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.running[job["job_id"]] = asyncio.current_task()
+            try:
+                succeeded, body = await self.handler(job["payload"])
+            except Exception as e:
+                self.logger.error(f"[job {job['job_id']}] 처리 실패: {e}", exc_info=True)
+                succeeded, body = False, {"error": "internal_server_error", "message": str(e)}
+            finally:
+                self.running.pop(job["job_id"], None)
+            if not await asyncio.to_thread(self.store.finish, job["job_id"], self.owner, succeeded, body):
+                self.logger.warning(f"[job {job['job_id']}] 다른 워커가 가져간 작업이라 결과를 저장하지 않음")
+                continue
+            self.logger.info(f"[job {job['job_id']}] 완료 (succeeded: {succeeded})")
+            if job["callback_url"]:
+                self._callbacks.append(self.store.get(job["job_id"]))
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await asyncio.to_thread(self.store.heartbeat, list(self.running))
+            except Exception as e:
+                self.logger.error(f"job heartbeat 실패: {e}")
+
+    async def _send_callbacks(self):
+        while True:
+            await asyncio.sleep(self.callback_interval)
+            if not self._callbacks:
+                continue
+            pending, self._callbacks = self._callbacks, []
+            now = time.monotonic()
+            by_url: Dict[str, List[dict]] = {}
+            for job in pending:
+                url = job["callback_url"]
+                if not self.is_allowed_callback(url):
+                    # 허용 목록이 바뀌어 더 이상 허용되지 않는 url (재시작 전에 등록된 작업 등)
+                    self.logger.warning(f"[job {job['job_id']}] 허용되지 않은 callback_url로 전송하지 않음: {url}")
+                    await asyncio.to_thread(self.store.mark_callbacks_sent, [job["job_id"]])
+                elif self._callback_backoff.get(url, (0, 0.0))[1] > now:
+                    self._callbacks.append(job)  # 백오프 중인 url은 다음 주기에 다시 확인
+                else:
+                    by_url.setdefault(url, []).append(job)
+            for url, jobs in by_url.items():
+                for start in range(0, len(jobs), self.callback_batch_size):
+                    batch = jobs[start:start + self.callback_batch_size]
+                    if await self._post_callback(url, batch):
+                        self._callback_backoff.pop(url, None)
+                        await asyncio.to_thread(self.store.mark_callbacks_sent, [job["job_id"] for job in batch])
+                    else:
+                        self._defer_callbacks(url, jobs[start:])
+                        break
+
+    def _defer_callbacks(self, url: str, jobs: List[dict]):
+        """전송하지 못한 callback을 대기열에 다시 넣고 url의 다음 전송 시각을 늦춤"""
+        failures = self._callback_backoff.get(url, (0, 0.0))[0] + 1
+        delay = min(self.callback_interval * 2 ** failures, self.callback_max_backoff)
+        self._callback_backoff[url] = (failures, time.monotonic() + delay)
+        self._callbacks.extend(jobs)
+        self.logger.error(f"job callback 전송 실패 ({url}): {len(jobs)}건, {delay:.0f}초 후 재시도")
+
+    async def _post_callback(self, url: str, jobs: List[dict]) -> bool:
+        body = {"jobs": [
+            {"job_id": job["job_id"], "status": job["status"], "result": job["result"], "error": job["error"]}
+            for job in jobs
+        ]}
+        for attempt in range(self.callback_retries):
+            try:
+                response = await self._client.post(url, json=body)
+                if response.status_code < 300:
+                    return True
+                self.logger.warning(f"job callback 응답 오류 ({url}): {response.status_code}")
+            except httpx.HTTPError as e:
+                self.logger.warning(f"job callback 전송 실패 ({url}): {e}")
+            if attempt + 1 < self.callback_retries:
+                await asyncio.sleep(2 ** attempt)
+        return False
+
+    async def start(self):
+        """worker/heartbeat/callback 태스크 시작 (재시작 전 전송하지 못한 callback도 다시 전송)"""
+        if self._tasks:
+            return
+        self._client = httpx.AsyncClient(timeout=10)
+        self._callbacks.extend(await asyncio.to_thread(self.store.pending_callbacks, self.kind))
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        self._tasks.append(asyncio.create_task(self._send_callbacks()))
+
+    async def stop(self):
+        """
+        태스크 종료 (실행 중이던 작업은 running 상태로 남아 lease 만료 후 다시 처리됨)
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_job_queue(kind: str, handler: JobHandler) -> JobQueue:
+    """
+    환경변수로 작업 큐를 생성
+    - JOB_SQLITE_PATH: 작업 상태 저장 경로
+    - JOB_WORKERS: 동시에 처리할 작업 수
+    - JOB_LEASE_SECONDS: heartbeat가 없는 실행 중 작업을 다시 가져가기까지의 시간
+    - JOB_MAX_ATTEMPTS: 작업을 가져갈 수 있는 최대 횟수 (넘으면 failed, 0이면 제한 없음)
+    - JOB_CALLBACK_BATCH_SIZE / JOB_CALLBACK_INTERVAL: callback 한 번에 보낼 작업 수 / 모으는 주기(초)
+    - JOB_CALLBACK_MAX_BACKOFF: 계속 실패하는 callback_url의 최대 재전송 간격(초)
+    - JOB_CALLBACK_ALLOWED_HOSTS: callback_url로 허용할 host 목록 (쉼표 구분, ".example.com"은 하위 도메인 포함, 비어 있으면 callback 사용 불가)
+    - JOB_CALLBACK_ALLOWED_SCHEMES: callback_url로 허용할 scheme 목록 (기본값 https)
+    """
+    return JobQueue(
+        JobStore(os.getenv("JOB_SQLITE_PATH", "/tmp/tenten-jobs.db")),
+        kind=kind,
+        handler=handler,
+        workers=int(os.getenv("JOB_WORKERS", "2")),
+        lease=float(os.getenv("JOB_LEASE_SECONDS", "120")),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        callback_batch_size=int(os.getenv("JOB_CALLBACK_BATCH_SIZE", "20")),
+        callback_interval=float(os.getenv("JOB_CALLBACK_INTERVAL", "1.0")),
+        callback_max_backoff=float(os.getenv("JOB_CALLBACK_MAX_BACKOFF", "300")),
+        callback_allowed_hosts=[host.strip() for host in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()],
+        callback_allowed_schemes=[scheme.strip().lower() for scheme in os.getenv("JOB_CALLBACK_ALLOWED_SCHEMES", "https").split(",") if scheme.strip()]
+    )
@@ -0,0 +1,96 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# 서비스 공통 Prometheus 메트릭 정의 (main.py에서 /metrics로 노출)
+
+COMPLETION_CACHE_REQUESTS = Counter(
+    "completion_cache_requests_total",
+    "LLM completion 캐시 조회 결과",
+    ["endpoint", "result"]  # result: memory_hit / disk_hit / miss
+)
+
+TRANSCRIPT_FETCH_SECONDS = Histogram(
+    "youtube_transcript_fetch_seconds",
+    "YouTube 자막 추출 소요 시간(초, 재시도 포함)",
+    ["result"],  # result: success / error / timeout
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+)
+
+TRANSCRIPT_FETCH_RETRIES = Counter(
+    "youtube_transcript_fetch_retries_total",
+    "일시적 오류로 인한 YouTube 자막 추출 재시도 횟수",
+    ["error"]
+)
+
+PREGEN_POOL_REQUESTS = Counter(
+    "bot_post_pregen_pool_requests_total",
+    "미리 생성한 소셜봇 게시글 pool 조회 결과",
+    ["board_type", "result"]  # result: hit / miss
+)
+
+SCHEDULER_QUEUE_WAIT_SECONDS = Histogram(
+    "model_scheduler_queue_wait_seconds",
+    "모델 호출 스케줄러 대기 시간(초)",
+    ["request_class"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120)
+)
+
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "model_scheduler_queue_depth",
+    "모델 호출 스케줄러 대기 중인 요청 수",
+    ["request_class"]
+)
+
+SCHEDULER_IN_FLIGHT = Gauge(
+    "model_scheduler_in_flight",
+    "모델 호출 스케줄러 실행 중인 요청 수",
+    ["request_class"]
+)
+
+SCHEDULER_DEADLINE_DROPS = Counter(
+    "model_scheduler_deadline_drops_total",
+    "마감 시각이 지나 실행하지 않고 버린 모델 호출 수",
+    ["request_class"]
+)
+
+LORA_BATCH_SIZE = Histogram(
+    "lora_adapter_batch_size",
+    "adapter별로 묶어 한 번에 generate한 요청 수",
+    ["adapter"],
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+
+LORA_SLOT_OCCUPANCY = Gauge(
+    "lora_slot_occupancy",
+    "엔진 LoRA slot에 올라가 있는 adapter 수"
+)
+
+LORA_SWAPS = Counter(
+    "lora_swaps_total",
+    "LoRA slot이 가득 찬 상태에서 다른 adapter를 올린 횟수",
+    ["adapter"]  # 새로 올린 adapter
+)
+
+LORA_ADAPTER_REQUESTS = Counter(
+    "lora_adapter_requests_total",
+    "LoRA adapter별 모델 호출 수",
+    ["adapter"]  # adapter_type
+)
+
+LORA_ADAPTER_LOAD_SECONDS = Histogram(
+    "lora_adapter_load_seconds",
+    "LoRA adapter 가중치 다운로드/검증 소요 시간(초)",
+    ["adapter", "result"],  # result: success / error
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+)
+
+WARMUP_STEP_SECONDS = Gauge(
+    "warmup_step_seconds",
+    "서버 시작 후 warmup 단계별 소요 시간(초)",
+    ["step"]  # tokenizer / prompt:* / generate:<adapter>:<prompt_type>
+)
+
+DRAIN_IN_FLIGHT = Gauge(
+    "drain_in_flight",
+    "종료(drain) 시 기다리는 진행 중인 작업 수",
+    ["source"]  # http / chat / summary_jobs / model
+)
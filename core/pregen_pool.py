@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from core.metrics import PREGEN_POOL_REQUESTS
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def context_tokens(request) -> frozenset:
+    """BotPostsRequest의 게시글 내용 단어 집합 (context 유사도 비교용)"""
+    return frozenset(word for post in request.posts for word in _WORD_PATTERN.findall(post.content.lower()))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class PregenPool:
+    """
+    board_type별 소셜봇 게시글 사전 생성 pool
+    - observe(): 요청이 들어올 때마다 board_type별 최신 context(최근 게시글)를 기록
+    - 모델이 유휴 상태일 때 최신 context로 게시글을 미리 생성/정제하여 board_type별 최대 size개 보관
+    - take(): context의 Jaccard 유사도가 min_similarity 이상이고 max_age 이내인 게시글을 바로 반환
+    """
+    def __init__(
+        self,
+        generate_fn: Callable[[object], Optional[str]],
+        is_idle: Callable[[], bool],
+        size: int = 2,
+        max_age: float = 600,
+        min_similarity: float = 0.5,
+        fill_interval: float = 2.0
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.generate_fn = generate_fn
+        self.is_idle = is_idle
+        self.size = size
+        self.max_age = max_age
+        self.min_similarity = min_similarity
+        self.fill_interval = fill_interval
+        self.contexts: Dict[str, object] = {}  # board_type -> 최신 BotPostsRequest
+        self.pools: Dict[str, Deque[dict]] = {}  # board_type -> [{"content", "tokens", "created_at"}]
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def observe(self, request):
+        self.contexts[request.board_type] = request
+        self._wakeup.set()
+
+    def _prune(self, board_type: str):
+        pool = self.pools.get(board_type)
+        now = time.time()
+        while pool and now - pool[0]["created_at"] > self.max_age:
+            pool.popleft()
+
+    def take(self, request) -> Optional[str]:
+        """context가 충분히 비슷한 사전 생성 게시글을 꺼냄 (없으면 None)"""
+        self._prune(request.board_type)
+        pool = self.pools.get(request.board_type)
+        if pool:
+            tokens = context_tokens(request)
+            best = max(pool, key=lambda entry: jaccard(tokens, entry["tokens"]))
+            if jaccard(tokens, best["tokens"]) >= self.min_similarity:
+                pool.remove(best)
+                PREGEN_POOL_REQUESTS.labels(board_type=request.board_type, result="hit").inc()
+                self._wakeup.set()
+                return best["content"]
+        PREGEN_POOL_REQUESTS.labels(board_type=request.board_type, result="miss").inc()
+        return None
+
+    def _next_board(self) -> Optional[str]:
+        """보관 개수가 가장 적은 board_type (모두 찼으면 None)"""
+        candidates = []
+        for board_type in self.contexts:
+            self._prune(board_type)
+            count = len(self.pools.get(board_type, ()))
+            if count < self.size:
+                candidates.append((count, board_type))
+        return min(candidates)[1] if candidates else None
+
+    async def _fill_loop(self):
+        while True:
+            board_type = self._next_board()
+            if board_type is None or not self.is_idle():
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.fill_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            request = self.contexts[board_type]
+            try:
+                content = await asyncio.to_thread(self.generate_fn, request)
+            except Exception as e:
+                self.logger.error(f"[pregen] {board_type} 게시글 사전 생성 실패: {e}")
+                await asyncio.sleep(self.fill_interval)
+                continue
+            if not content:
+                # 생성 결과가 없으면(정제 실패 등) 실패와 같이 잠시 쉬고 재시도 (유휴 모델을 연속 호출하지 않음)
+                await asyncio.sleep(self.fill_interval)
+                continue
+            self.pools.setdefault(board_type, deque()).append({
+                "content": content,
+                "tokens": context_tokens(request),
+                "created_at": time.time()
+            })
+            self.logger.info(f"[pregen] {board_type} 사전 생성 게시글 {len(self.pools[board_type])}/{self.size}")
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._fill_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def create_pregen_pool(generate_fn: Callable[[object], Optional[str]], model) -> Optional[PregenPool]:
+    """
+    환경변수로 사전 생성 pool을 생성 (BOT_PREGEN_POOL_SIZE=0이면 비활성화)
+    - BOT_PREGEN_POOL_SIZE: board_type별 보관 개수
+    - BOT_PREGEN_MAX_AGE: 보관 유효 시간(초)
+    - BOT_PREGEN_MIN_SIMILARITY: 요청 context와의 최소 Jaccard 유사도
+    """
+    size = int(os.getenv("BOT_PREGEN_POOL_SIZE", "0"))
+    if size <= 0:
+        return None
+    return PregenPool(
+        generate_fn=generate_fn,
+        is_idle=lambda: model.in_flight_count() == 0,
+        size=size,
+        max_age=float(os.getenv("BOT_PREGEN_MAX_AGE", "600")),
+        min_similarity=float(os.getenv("BOT_PREGEN_MIN_SIMILARITY", "0.5"))
+    )
@@ -0,0 +1,271 @@
+import asyncio
+import fnmatch
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+
+Handler = Callable[[str, str], Awaitable[None]]  # (channel, message)
+
+
+class Broker(ABC):
+    """
+    채널 기반 pub/sub 브로커 인터페이스
+    - publish / publish_batch: 채널에 메시지 발행 (batch는 한 번의 왕복으로 여러 메시지 발행)
+    - subscribe: 패턴(glob)에 매칭되는 채널의 메시지를 handler로 전달
+    """
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        pass
+
+    async def publish_batch(self, channel: str, messages: List[str]):
+        for message in messages:
+            await self.publish(channel, message)
+
+    @abstractmethod
+    async def subscribe(self, pattern: str, handler: Handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+class InMemoryBroker(Broker):
+    """같은 프로세스 안에서만 메시지를 전달하는 브로커 (단일 워커 전용)"""
+    def __init__(self):
+        self.subscriptions = []
+
+    async def publish(self, channel: str, message: str):
+        for pattern, handler in list(self.subscriptions):
+            if fnmatch.fnmatchcase(channel, pattern):
+                await handler(channel, message)
+
+    async def subscribe(self, pattern: str, handler: Handler):
+        self.subscriptions.append((pattern, handler))
+
+    async def close(self):
+        self.subscriptions.clear()
+
+
+class SQLiteBroker(Broker):
+    """
+    SQLite 파일을 이벤트 로그로 사용하는 브로커 (같은 호스트의 여러 워커가 공유)
+    - publish: 이벤트를 기록
+    - 구독 중인 각 워커의 poller가 새 이벤트를 읽어 handler에 전달
+    """
+    def __init__(self, db_path: str, poll_interval: float = 0.05, ttl: float = 60):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pubsub_events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "channel TEXT NOT NULL, "
+            "message TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._pollers = []
+
+    def _insert(self, channel: str, messages: List[str]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO pubsub_events (channel, message, created_at) VALUES (?, ?, ?)",
+                [(channel, message, now) for message in messages]
+            )
+            self._conn.commit()
+
+    def _fetch(self, last_id: int):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, channel, message FROM pubsub_events WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+            self._conn.execute("DELETE FROM pubsub_events WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+        return rows
+
+    async def publish(self, channel: str, message: str):
+        await asyncio.to_thread(self._insert, channel, [message])
+
+    async def publish_batch(self, channel: str, messages: List[str]):
+        if messages:
+            await asyncio.to_thread(self._insert, channel, messages)
+
+    async def subscribe(self, pattern: str, handler: Handler):
+        with self._lock:
+            # 구독 이전에 쌓인 이벤트는 전달하지 않음
+            last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM pubsub_events").fetchone()[0]
+
+        async def poll(last_id=last_id):
+            while True:
+                try:
+                    for row_id, channel, message in await asyncio.to_thread(self._fetch, last_id):
+                        last_id = row_id
+                        if fnmatch.fnmatchcase(channel, pattern):
+                            await handler(channel, message)
+                except Exception as e:
+                    self.logger.error(f"pub/sub 이벤트 확인 실패: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+        self._pollers.append(asyncio.create_task(poll()))
+
+    async def close(self):
+        for poller in self._pollers:
+            poller.cancel()
+        await asyncio.gather(*self._pollers, return_exceptions=True)
+        self._pollers.clear()
+
+
+class RedisBroker(Broker):
+    """
+    Redis 프로토콜(RESP2)로 PUBLISH / PSUBSCRIBE를 사용하는 브로커 (여러 replica 간 공유)
+    - 외부 클라이언트 라이브러리 없이 asyncio stream으로 RESP를 직접 주고받음
+    - publish_batch는 여러 PUBLISH 명령을 파이프라이닝하여 한 번의 왕복으로 전송
+    - 구독 연결이 끊기면 backoff 후 재연결
+    """
+    def __init__(self, url: str, reconnect_delay: float = 0.5, max_reconnect_delay: float = 10):
+        self.logger = logging.getLogger(__name__)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._publisher: Optional[tuple] = None
+        self._publish_lock = asyncio.Lock()
+        self._subscribers = []
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    @classmethod
+    async def _read_reply(cls, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("redis connection closed")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RuntimeError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2].decode("utf-8")
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await cls._read_reply(reader) for _ in range(length)]
+        raise RuntimeError(f"Unknown RESP reply: {line!r}")
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(self._encode("AUTH", self.password))
+            await self._read_reply(reader)
+        if self.db:
+            writer.write(self._encode("SELECT", self.db))
+            await self._read_reply(reader)
+        return reader, writer
+
+    async def _execute_pipeline(self, commands):
+        async with self._publish_lock:
+            for attempt in range(2):
+                try:
+                    if self._publisher is None:
+                        self._publisher = await self._open()
+                    reader, writer = self._publisher
+                    writer.write(b"".join(self._encode(*command) for command in commands))
+                    await writer.drain()
+                    return [await self._read_reply(reader) for _ in commands]
+                except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                    # 연결이 끊긴 경우 한 번 재연결 후 재시도
+                    self._publisher = None
+                    if attempt == 1:
+                        raise
+
+    async def publish(self, channel: str, message: str):
+        await self._execute_pipeline([("PUBLISH", channel, message)])
+
+    async def publish_batch(self, channel: str, messages: List[str]):
+        if messages:
+            await self._execute_pipeline([("PUBLISH", channel, message) for message in messages])
+
+    async def subscribe(self, pattern: str, handler: Handler):
+        ready = asyncio.Event()
+
+        async def listen():
+            delay = self.reconnect_delay
+            while True:
+                writer = None
+                try:
+                    reader, writer = await self._open()
+                    writer.write(self._encode("PSUBSCRIBE", pattern))
+                    await writer.drain()
+                    await self._read_reply(reader)  # psubscribe 확인 응답
+                    ready.set()
+                    delay = self.reconnect_delay
+                    while True:
+                        reply = await self._read_reply(reader)
+                        if isinstance(reply, list) and reply and reply[0] == "pmessage":
+                            await handler(reply[2], reply[3])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"redis 구독 연결 끊김, {delay:.1f}초 후 재연결: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+                finally:
+                    if writer is not None:
+                        writer.close()
+
+        self._subscribers.append(asyncio.create_task(listen()))
+        try:
+            await asyncio.wait_for(ready.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.logger.error(f"redis 구독 준비 지연: {self.host}:{self.port}")
+
+    async def close(self):
+        for subscriber in self._subscribers:
+            subscriber.cancel()
+        await asyncio.gather(*self._subscribers, return_exceptions=True)
+        self._subscribers.clear()
+        if self._publisher is not None:
+            self._publisher[1].close()
+            self._publisher = None
+
+
+def create_broker() -> Broker:
+    """
+    SSE_BROKER 환경변수(memory / sqlite / redis)에 따라 브로커를 생성
+    - 지정하지 않으면 STATE_BACKEND를 따름
+    """
+    broker = os.getenv("SSE_BROKER", os.getenv("STATE_BACKEND", "memory"))
+    if broker == "memory":
+        return InMemoryBroker()
+    elif broker == "sqlite":
+        return SQLiteBroker(os.getenv("STATE_SQLITE_PATH", "/tmp/tenten-state.db"))
+    elif broker == "redis":
+        return RedisBroker(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    else:
+        raise ValueError(f"Unsupported SSE_BROKER: {broker}")
@@ -0,0 +1,149 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from utils.error_handler import DeadlineExceededError
+
+# 요청의 절대 마감 시각 (epoch seconds, 엔진 워커 등 다른 프로세스에도 그대로 전달 가능)
+# asyncio task / asyncio.to_thread / BackgroundTasks는 contextvar를 복사하므로 함께 전파됨
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+DEADLINE_HEADER = "x-request-deadline"  # 절대 마감 시각 (epoch seconds)
+TIMEOUT_HEADER = "x-request-timeout-ms"  # 남은 시간 (밀리초)
+
+
+def get_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def set_deadline(deadline: Optional[float]) -> contextvars.Token:
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token):
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]):
+    """현재 컨텍스트에 timeout초 뒤의 마감 시각을 설정 (None이면 마감 없음)"""
+    token = set_deadline(time.time() + timeout if timeout else None)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 시간(초), 마감이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def is_expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def has_budget(seconds: float) -> bool:
+    """마감까지 seconds 이상 남았는지 (마감이 없으면 항상 True)"""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def has_retry_budget() -> bool:
+    """
+    재시도할 만큼 시간이 남았는지
+    - RETRY_MIN_BUDGET_SECONDS: 한 번의 재시도에 필요한 최소 남은 시간(초)
+    """
+    return has_budget(float(os.getenv("RETRY_MIN_BUDGET_SECONDS", "5")))
+
+
+def check_deadline():
+    """마감 시각이 지났으면 DeadlineExceededError"""
+    if is_expired():
+        raise DeadlineExceededError("요청 처리 마감 시각이 지났습니다.")
+
+
+def min_timeout(timeout: Optional[float]) -> Optional[float]:
+    """기존 timeout과 남은 시간 중 작은 값 (둘 다 없으면 None)"""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.0)
+    return left if timeout is None else min(timeout, left)
+
+
+def parse_deadline_defaults(value: str) -> Dict[str, float]:
+    """"/chat=120,/posts/bot=30" 형식의 경로 prefix별 기본 timeout(초) 파싱 (0이면 마감 없음)"""
+    defaults = {}
+    for item in value.split(","):
+        if "=" in item:
+            prefix, seconds = item.split("=", 1)
+            defaults[prefix.strip()] = float(seconds)
+    return defaults
+
+
+class DeadlineMiddleware:
+    """
+    요청마다 마감 시각을 contextvar에 설정하는 ASGI 미들웨어
+    - X-Request-Deadline(epoch seconds) > X-Request-Timeout-Ms > 경로 prefix별 기본값 순으로 적용
+    - 헤더로 받은 값도 경로 기본값보다 길게 잡을 수는 없음
+    - 기본값이 0인 경로(SSE 구독, 비동기 작업 등록 등)는 헤더가 없으면 마감을 두지 않음
+    """
+    def __init__(self, app, defaults: Optional[Dict[str, float]] = None):
+        self.app = app
+        # 긴 prefix가 먼저 매칭되도록 정렬
+        self.defaults = sorted((defaults or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _default_timeout(self, path: str) -> Optional[float]:
+        for prefix, seconds in self.defaults:
+            if path.startswith(prefix):
+                return seconds or None
+        return None
+
+    def _resolve(self, scope) -> Optional[float]:
+        now = time.time()
+        default_timeout = self._default_timeout(scope.get("path", ""))
+        default_deadline = now + default_timeout if default_timeout else None
+
+        headers = dict(scope.get("headers") or [])
+        header_deadline = None
+        try:
+            if DEADLINE_HEADER.encode() in headers:
+                header_deadline = float(headers[DEADLINE_HEADER.encode()])
+            elif TIMEOUT_HEADER.encode() in headers:
+                header_deadline = now + float(headers[TIMEOUT_HEADER.encode()]) / 1000
+        except ValueError:
+            header_deadline = None
+
+        if header_deadline is None:
+            return default_deadline
+        if default_deadline is None:
+            return header_deadline
+        return min(header_deadline, default_deadline)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = set_deadline(self._resolve(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
+
+
+def create_deadline_defaults() -> Dict[str, float]:
+    """
+    REQUEST_DEADLINE_DEFAULTS: 경로 prefix별 기본 timeout(초), 0이면 마감 없음
+    """
+    return parse_deadline_defaults(os.getenv(
+        "REQUEST_DEADLINE_DEFAULTS",
+        "/chat/stream=0,/chat=120,/posts/bot/batch=120,/posts/bot=30,/recomments/bot/batch=120,/recomments/bot=30,"
+        "/posts/youtube/summary/jobs=0,/posts/youtube/summary/stream=600,/posts/youtube/summary=300"
+    ))
@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Optional
+
+from core.metrics import SCHEDULER_DEADLINE_DROPS, SCHEDULER_IN_FLIGHT, SCHEDULER_QUEUE_DEPTH, SCHEDULER_QUEUE_WAIT_SECONDS
+from core.request_context import get_deadline
+from utils.error_handler import DeadlineExceededError
+
+# 숫자가 작을수록 우선 (chat > recomments > posts > summary > batch)
+PRIORITIES = {"chat": 0, "recomments": 1, "posts": 2, "summary": 3, "batch": 4}
+
+
+class _Ticket:
+    __slots__ = ("request_class", "key", "tag", "enqueued_at", "deadline", "future")
+
+    def __init__(self, request_class: str, key: str, tag: float, future: asyncio.Future, deadline: Optional[float] = None):
+        self.request_class = request_class
+        self.key = key
+        self.tag = tag
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline  # epoch seconds
+        self.future = future
+
+
+class RequestScheduler:
+    """
+    모델 호출 스케줄러
+    - 우선순위 클래스: chat > recomments > posts > summary > batch
+    - 클래스 안에서는 key(stream_id, board_type 등)별 weighted fair queuing (virtual finish time이 가장 작은 요청부터)
+    - 클래스별 동시 실행 상한(bulkhead)과 전체 동시 실행 상한
+    - aging: 대기 시간이 aging_seconds 늘어날 때마다 우선순위를 한 단계씩 올려 기아 방지
+    - 요청 마감 시각(deadline)이 지난 요청은 실행하지 않고 DeadlineExceededError로 버림
+    """
+    def __init__(self, max_concurrency: int = 4, class_limits: Optional[Dict[str, int]] = None, aging_seconds: float = 10.0):
+        self.max_concurrency = max_concurrency
+        self.class_limits = {request_class: max_concurrency for request_class in PRIORITIES}
+        self.class_limits.update(class_limits or {})
+        self.aging_seconds = aging_seconds
+        self.queues: Dict[str, List] = {request_class: [] for request_class in PRIORITIES}  # heap of (tag, seq, ticket)
+        self.virtual_time: Dict[str, float] = {request_class: 0.0 for request_class in PRIORITIES}
+        self.last_finish: Dict[str, Dict[str, float]] = {request_class: {} for request_class in PRIORITIES}
+        self.in_flight: Dict[str, int] = {request_class: 0 for request_class in PRIORITIES}
+        self.total_in_flight = 0
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _check_class(self, request_class: str):
+        if request_class not in PRIORITIES:
+            raise ValueError(f"Unknown request class: {request_class}")
+
+    def _pick(self) -> Optional[_Ticket]:
+        """실행 가능한 클래스의 맨 앞 요청 중 (aging 반영) 우선순위가 가장 높은 요청"""
+        if self.total_in_flight >= self.max_concurrency:
+            return None
+        now = time.monotonic()
+        best, best_priority = None, None
+        for request_class, queue in self.queues.items():
+            if not queue or self.in_flight[request_class] >= self.class_limits[request_class]:
+                continue
+            ticket = queue[0][2]
+            priority = PRIORITIES[request_class] - (now - ticket.enqueued_at) / self.aging_seconds
+            if best_priority is None or priority < best_priority:
+                best, best_priority = ticket, priority
+        return best
+
+    def _dispatch(self):
+        while True:
+            ticket = self._pick()
+            if ticket is None:
+                return
+            request_class = ticket.request_class
+            heapq.heappop(self.queues[request_class])
+            SCHEDULER_QUEUE_DEPTH.labels(request_class=request_class).dec()
+            if ticket.future.cancelled():
+                continue
+            if ticket.deadline is not None and ticket.deadline <= time.time():
+                SCHEDULER_DEADLINE_DROPS.labels(request_class=request_class).inc()
+                ticket.future.set_exception(DeadlineExceededError("스케줄러 대기 중 마감 시각이 지났습니다."))
+                continue
+            self.virtual_time[request_class] = max(self.virtual_time[request_class], ticket.tag)
+            self.in_flight[request_class] += 1
+            self.total_in_flight += 1
+            SCHEDULER_IN_FLIGHT.labels(request_class=request_class).inc()
+            SCHEDULER_QUEUE_WAIT_SECONDS.labels(request_class=request_class).observe(time.monotonic() - ticket.enqueued_at)
+            ticket.future.set_result(None)
+
+    def _release(self, request_class: str):
+        self.in_flight[request_class] -= 1
+        self.total_in_flight -= 1
+        SCHEDULER_IN_FLIGHT.labels(request_class=request_class).dec()
+        self._dispatch()
+
+    async def acquire(self, request_class: str, key: Optional[str] = None, weight: float = 1.0, deadline: Optional[float] = None):
+        """실행 권한을 받을 때까지 대기 (deadline을 지정하지 않으면 현재 요청 컨텍스트의 마감 시각 사용)"""
+        self._check_class(request_class)
+        self._loop = asyncio.get_running_loop()
+        deadline = deadline if deadline is not None else get_deadline()
+        if deadline is not None and deadline <= time.time():
+            SCHEDULER_DEADLINE_DROPS.labels(request_class=request_class).inc()
+            raise DeadlineExceededError("스케줄러 대기 전에 마감 시각이 지났습니다.")
+        key = key or "_default"
+        # WFQ: key별 virtual finish time = max(클래스 virtual time, 해당 key의 직전 finish) + 1/weight
+        tag = max(self.virtual_time[request_class], self.last_finish[request_class].get(key, 0.0)) + 1 / weight
+        self.last_finish[request_class][key] = tag
+        if len(self.last_finish[request_class]) > 10000:
+            # 오래된 key의 finish time 정리 (현재 virtual time보다 이전인 key는 영향 없음)
+            vt = self.virtual_time[request_class]
+            self.last_finish[request_class] = {k: v for k, v in self.last_finish[request_class].items() if v > vt}
+
+        ticket = _Ticket(request_class, key, tag, self._loop.create_future(), deadline)
+        heapq.heappush(self.queues[request_class], (tag, next(self._seq), ticket))
+        SCHEDULER_QUEUE_DEPTH.labels(request_class=request_class).inc()
+        self._dispatch()
+        try:
+            if deadline is None:
+                await ticket.future
+                return
+            await asyncio.wait({ticket.future}, timeout=max(deadline - time.time(), 0))
+            if not ticket.future.done():
+                # 대기열에 남은 요청은 취소 표시만 하고 _dispatch에서 건너뜀
+                ticket.future.cancel()
+                SCHEDULER_DEADLINE_DROPS.labels(request_class=request_class).inc()
+                raise DeadlineExceededError("스케줄러 대기 중 마감 시각이 지났습니다.")
+            ticket.future.result()
+        except asyncio.CancelledError:
+            # 이미 실행 권한을 받은 뒤 취소되면 슬롯 반환, 대기 중이었다면 대기열에서 건너뛰도록 취소 표시
+            if ticket.future.done() and not ticket.future.cancelled() and ticket.future.exception() is None:
+                self._release(request_class)
+            elif not ticket.future.done():
+                ticket.future.cancel()
+            raise
+
+    def release(self, request_class: str):
+        self._release(request_class)
+
+    @asynccontextmanager
+    async def slot(self, request_class: str, key: Optional[str] = None, weight: float = 1.0, deadline: Optional[float] = None):
+        await self.acquire(request_class, key, weight, deadline)
+        try:
+            yield
+        finally:
+            self.release(request_class)
+
+    @contextmanager
+    def slot_sync(self, request_class: str, key: Optional[str] = None, weight: float = 1.0):
+        """
+        이벤트 루프 밖의 워커 스레드(asyncio.to_thread 등)에서 사용하는 슬롯
+        - 이벤트 루프 스레드에서 호출하면 루프가 멈추므로 사용하지 않음
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            yield
+            return
+        # 이벤트 루프에서 실행되는 acquire는 이 스레드의 contextvar를 보지 못하므로 마감 시각을 직접 전달
+        asyncio.run_coroutine_threadsafe(self.acquire(request_class, key, weight, get_deadline()), loop).result()
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(self.release, request_class)
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """워커 스레드의 slot_sync가 사용할 이벤트 루프 등록"""
+        self._loop = loop
+
+
+def parse_class_limits(value: str) -> Dict[str, int]:
+    """"chat=4,summary=1" 형식의 클래스별 동시 실행 상한 파싱"""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            request_class, limit = item.split("=", 1)
+            limits[request_class.strip()] = int(limit)
+    return limits
+
+
+def create_scheduler() -> Optional[RequestScheduler]:
+    """
+    환경변수로 스케줄러를 생성 (MODEL_SCHEDULER=false이면 비활성화)
+    - SCHEDULER_MAX_CONCURRENCY: 전체 동시 모델 호출 수
+    - SCHEDULER_CLASS_LIMITS: 클래스별 동시 호출 상한 (예: "chat=4,recomments=2,posts=2,summary=1,batch=1")
+    - SCHEDULER_AGING_SECONDS: 우선순위가 한 단계 오르는 대기 시간(초)
+    """
+    if os.getenv("MODEL_SCHEDULER", "true").lower() != "true":
+        return None
+    return RequestScheduler(
+        max_concurrency=int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "4")),
+        class_limits=parse_class_limits(os.getenv("SCHEDULER_CLASS_LIMITS", "chat=4,recomments=2,posts=2,summary=1,batch=1")),
+        aging_seconds=float(os.getenv("SCHEDULER_AGING_SECONDS", "10"))
+    )
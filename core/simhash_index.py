@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+_BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+
+
+def normalize_transcript(text: str) -> list:
+    """소문자화, [음악] 같은 주석/문장부호 제거 후 단어 리스트 반환"""
+    text = re.sub(r'\[.*?\]', ' ', text.lower())
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return text.split()
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """
+    정규화된 단어 shingle(k-gram)로 64bit SimHash를 계산
+    Returns:
+        64bit 정수 fingerprint (shingle이 없으면 None)
+    """
+    words = normalize_transcript(text)
+    if len(words) < shingle_size:
+        return None
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = (bits.astype(np.int64) * 2 - 1).sum(axis=0)
+    fingerprint = 0
+    for position in np.nonzero(votes > 0)[0]:
+        fingerprint |= 1 << int(position)
+    return fingerprint
+
+
+class SimHashIndex:
+    """
+    이미 요약한 자막의 SimHash 인덱스 (미러/재업로드 영상의 요약 재사용)
+    - 해밍 거리가 max_distance 이하인 fingerprint를 근사 중복으로 판단
+    - 최대 max_entries개를 유지하며, 가장 오래 사용되지 않은 항목부터 제거
+    - path가 주어지면 JSON 파일로 저장/복원
+    - 항목마다 요약을 만든 모델/LoRA 버전을 저장하고, 같은 버전의 항목만 재사용
+    """
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000, max_distance: int = 3,
+                 min_words: int = 50, save_interval: float = 30):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()  # video_id -> {"fingerprint", "summary", "version"}
+        self._fingerprints = np.zeros(0, dtype=np.uint64)
+        self._video_ids = []
+        self._versions = np.zeros(0, dtype=object)
+        self._dirty = False
+        self._last_saved = 0.0
+        if path and os.path.exists(path):
+            self._load()
+
+    def _rebuild(self):
+        self._video_ids = list(self.entries.keys())
+        self._versions = np.array([entry["version"] for entry in self.entries.values()], dtype=object)
+        self._fingerprints = np.array([entry["fingerprint"] for entry in self.entries.values()], dtype=np.uint64)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for item in data.get("entries", [])[-self.max_entries:]:
+            self.entries[item["video_id"]] = {
+                "fingerprint": int(item["fingerprint"], 16),
+                "summary": item["summary"],
+                "version": item.get("version")
+            }
+        self._rebuild()
+
+    def save(self, force: bool = False):
+        """변경 사항을 파일에 저장 (save_interval 이내의 반복 저장은 생략)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._last_saved < self.save_interval):
+                return
+            data = {"entries": [
+                {"video_id": video_id, "fingerprint": f"{entry['fingerprint']:016x}", "summary": entry["summary"],
+                 "version": entry["version"]}
+                for video_id, entry in self.entries.items()
+            ]}
+            self._dirty = False
+            self._last_saved = time.time()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, transcript_text: str, version: Optional[str] = None) -> Optional[dict]:
+        """
+        근사 중복 자막의 요약을 조회 (version이 같은 항목만 대상)
+        Returns:
+            {"video_id", "summary", "distance", "similarity"} 또는 None
+        """
+        if len(normalize_transcript(transcript_text)) < self.min_words:
+            return None
+        fingerprint = simhash(transcript_text)
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            if not len(self._fingerprints):
+                return None
+            distances = np.bitwise_count(self._fingerprints ^ np.uint64(fingerprint)).astype(np.int64)
+            # 다른 모델/LoRA 버전으로 만든 요약은 재사용하지 않음
+            distances[self._versions != version] = 65
+            best = int(np.argmin(distances))
+            distance = int(distances[best])
+            if distance > self.max_distance:
+                return None
+            video_id = self._video_ids[best]
+            self.entries.move_to_end(video_id)
+            return {
+                "video_id": video_id,
+                "summary": self.entries[video_id]["summary"],
+                "distance": distance,
+                "similarity": 1 - distance / 64
+            }
+
+    def add(self, video_id: str, transcript_text: str, summary: str, version: Optional[str] = None):
+        if not summary or len(normalize_transcript(transcript_text)) < self.min_words:
+            return
+        fingerprint = simhash(transcript_text)
+        if fingerprint is None:
+            return
+        with self._lock:
+            self.entries[video_id] = {"fingerprint": fingerprint, "summary": summary, "version": version}
+            self.entries.move_to_end(video_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._rebuild()
+            self._dirty = True
+        self.save()
+
+
+def create_simhash_index() -> Optional[SimHashIndex]:
+    """
+    환경변수로 SimHash 인덱스를 생성 (SIMHASH_DEDUP=true일 때만 활성화)
+    - SIMHASH_INDEX_PATH: 저장 파일 경로 (지정하지 않으면 메모리에만 유지)
+    - SIMHASH_INDEX_MAX_ENTRIES: 최대 항목 수
+    - SIMHASH_MAX_DISTANCE: 근사 중복으로 볼 최대 해밍 거리 (64bit 기준)
+    """
+    if os.getenv("SIMHASH_DEDUP", "false").lower() != "true":
+        return None
+    return SimHashIndex(
+        path=os.getenv("SIMHASH_INDEX_PATH") or None,
+        max_entries=int(os.getenv("SIMHASH_INDEX_MAX_ENTRIES", "10000")),
+        max_distance=int(os.getenv("SIMHASH_MAX_DISTANCE", "3"))
+    )
@@ -1,9 +1,52 @@
 from asyncio import Queue
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import time
+import uuid
+
+from core.pubsub import Broker, InMemoryBroker
+
+CHANNEL_PREFIX = "stream:"
+BROADCAST_CHANNEL = f"{CHANNEL_PREFIX}_broadcast"
+
 
 class SSEManager:
-    def __init__(self):
+    """
+    SSE 연결 관리자
+    - 메시지는 stream_id별 채널(stream:{stream_id})로 브로커에 발행되고,
+      모든 replica가 stream:* 를 구독하여 자신에게 연결된 클라이언트에 전달
+    - 발행자(origin)별, stream_id별 시퀀스 번호로 중복/역순 메시지를 걸러냄
+      (스트림을 정리하면 epoch가 바뀌어 시퀀스가 1부터 다시 시작)
+    - 발행 시퀀스 상태는 스트림이 끝나거나(forget_stream) stream_ttl 동안 발행이 없으면 정리
+      (구독자가 다른 replica에 있을 수 있으므로 로컬 연결 수와는 무관)
+    """
+    MAX_TRACKED_STREAMS = 10000
+
+    def __init__(self, broker: Optional[Broker] = None, stream_ttl: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
         self.connections: Dict[str, Queue] = {}
+        self.broker = broker or InMemoryBroker()
+        self.started = False
+        self.origin = uuid.uuid4().hex[:12]
+        # stream_id -> (epoch, 마지막으로 발행한 시퀀스 번호, 마지막 발행 시각), 오래 발행하지 않은 순
+        self.publish_seq: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stream_ttl = stream_ttl if stream_ttl is not None else float(os.getenv("SSE_STREAM_TTL_SECONDS", "600"))
+        self.received_seq: "OrderedDict[tuple, int]" = OrderedDict()  # (origin, epoch, stream_id) -> 마지막으로 받은 시퀀스 번호
+        self.batch_size = int(os.getenv("SSE_PUBLISH_BATCH_SIZE", "16"))
+
+    async def start(self, broker: Optional[Broker] = None):
+        """브로커를 설정하고 구독을 시작 (서버 시작 시 호출)"""
+        if broker is not None:
+            self.broker = broker
+        await self.broker.subscribe(f"{CHANNEL_PREFIX}*", self._on_message)
+        self.started = True
+
+    async def stop(self):
+        await self.broker.close()
+        self.started = False
 
     async def connect(self, client_id: str) -> Queue:
         """새로운 클라이언트 연결 및 큐 생성"""
@@ -11,15 +54,92 @@ class SSEManager:
         self.connections[client_id] = queue
         return queue
 
+    async def close_connections(self, retry_ms: int = 1000) -> int:
+        """
+        서버 종료(drain) 시 이 프로세스에 연결된 클라이언트에 reconnect 이벤트를 보내고 연결을 닫음
+        - retry 필드로 EventSource 재연결 대기 시간을 지정 (다른 replica로 재연결)
+        """
+        data = json.dumps({"message": "서버 재시작으로 연결을 종료합니다. 다시 연결해 주세요.", "retry_ms": retry_ms}, ensure_ascii=False)
+        connections = list(self.connections.values())
+        for queue in connections:
+            await queue.put(f"event: reconnect\nretry: {retry_ms}\ndata: {data}\n\n")
+            await queue.put(None)  # 연결 종료 신호
+        return len(connections)
+
     def disconnect(self, client_id: str):
         """클라이언트 연결 종료"""
         if client_id in self.connections:
             del self.connections[client_id]
 
-    async def broadcast(self, message: str):
-        """모든 연결된 클라이언트에게 메시지 브로드캐스트"""
-        for queue in self.connections.values():
+    async def _deliver(self, message: str):
+        """이 프로세스에 연결된 클라이언트들에게 메시지 전달"""
+        for queue in list(self.connections.values()):
             await queue.put(message)
 
+    async def _on_message(self, channel: str, payload: str):
+        envelope = json.loads(payload)
+        key = (envelope["origin"], envelope["epoch"], envelope["stream_id"])
+        last_seq = self.received_seq.get(key, 0)
+        if envelope["seq"] <= last_seq:
+            return
+        if last_seq and envelope["seq"] != last_seq + 1:
+            self.logger.warning(f"SSE 메시지 누락 감지: stream {envelope['stream_id']} seq {last_seq} -> {envelope['seq']}")
+        self.received_seq[key] = envelope["seq"]
+        self.received_seq.move_to_end(key)
+        while len(self.received_seq) > self.MAX_TRACKED_STREAMS:
+            self.received_seq.popitem(last=False)
+        await self._deliver(envelope["message"])
+
+    def _expire_publish_seq(self, now: float):
+        """stream_ttl 동안 발행이 없었거나 추적 상한을 넘은 스트림의 시퀀스 상태 정리 (다음 발행은 새 epoch)"""
+        while self.publish_seq:
+            _, (_, _, last_used) = next(iter(self.publish_seq.items()))
+            if len(self.publish_seq) <= self.MAX_TRACKED_STREAMS and now - last_used < self.stream_ttl:
+                break
+            self.publish_seq.popitem(last=False)
+
+    def _envelope(self, stream_id: str, message: str) -> str:
+        now = time.monotonic()
+        epoch, seq, _ = self.publish_seq.get(stream_id) or (uuid.uuid4().hex[:8], 0, now)
+        self.publish_seq[stream_id] = (epoch, seq + 1, now)
+        self.publish_seq.move_to_end(stream_id)
+        self._expire_publish_seq(now)
+        return json.dumps({
+            "origin": self.origin,
+            "epoch": epoch,
+            "stream_id": stream_id,
+            "seq": seq + 1,
+            "message": message
+        }, ensure_ascii=False)
+
+    def _channel(self, stream_id: Optional[str]) -> str:
+        return f"{CHANNEL_PREFIX}{stream_id}" if stream_id else BROADCAST_CHANNEL
+
+    async def broadcast(self, message: str, stream_id: Optional[str] = None):
+        """모든 연결된 클라이언트에게 메시지 브로드캐스트 (브로커를 통해 다른 replica의 연결에도 전달)"""
+        if not self.started:
+            # 브로커 구독이 시작되지 않은 경우(테스트 등) 로컬 연결에만 전달
+            await self._deliver(message)
+            return
+        key = stream_id or "_broadcast"
+        await self.broker.publish(self._channel(stream_id), self._envelope(key, message))
+
+    async def broadcast_batch(self, messages: List[str], stream_id: Optional[str] = None):
+        """
+        여러 메시지(토큰 스트림 등)를 batch_size 단위로 묶어 발행
+        """
+        if not self.started:
+            for message in messages:
+                await self._deliver(message)
+            return
+        key = stream_id or "_broadcast"
+        for i in range(0, len(messages), self.batch_size):
+            envelopes = [self._envelope(key, message) for message in messages[i:i + self.batch_size]]
+            await self.broker.publish_batch(self._channel(stream_id), envelopes)
+
+    def forget_stream(self, stream_id: str):
+        """스트림 종료 시 발행 시퀀스 상태 정리 (다음 발행은 새 epoch로 시작)"""
+        self.publish_seq.pop(stream_id, None)
+
 # 싱글턴 인스턴스
-sse_manager = SSEManager() 
\ No newline at end of file
+sse_manager = SSEManager()
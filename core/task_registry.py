@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class TaskRegistry(ABC):
+    """
+    stream_id별 진행 중인 작업(asyncio.Task) 레지스트리 인터페이스
+    - 다른 워커가 받은 중단 요청(DELETE /chat/stream/{streamId})도 작업을 소유한 워커에서 취소되도록 함
+    """
+    def __init__(self):
+        # stream_id -> {task: 등록 시각}
+        self.local_tasks: Dict[str, Dict[asyncio.Task, float]] = {}
+
+    def register(self, stream_id: str, task: asyncio.Task):
+        self.local_tasks.setdefault(stream_id, {})[task] = time.time()
+
+    def unregister(self, stream_id: str, task: asyncio.Task):
+        tasks = self.local_tasks.get(stream_id)
+        if tasks is not None:
+            tasks.pop(task, None)
+            if not tasks:
+                del self.local_tasks[stream_id]
+
+    def cancel_local(self, stream_id: str, requested_at: Optional[float] = None) -> int:
+        """
+        stream_id의 로컬 작업을 취소하고 취소한 수를 반환
+        - requested_at이 있으면 그 시각 이전에 등록된 작업만 취소 (취소 요청 이후 같은 stream_id로 시작한 작업은 유지)
+        """
+        tasks = [
+            task for task, registered_at in self.local_tasks.get(stream_id, {}).items()
+            if requested_at is None or registered_at <= requested_at
+        ]
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def in_flight_count(self) -> int:
+        """이 워커에서 진행 중인 작업 수"""
+        return sum(len(tasks) for tasks in self.local_tasks.values())
+
+    @abstractmethod
+    def cancel(self, stream_id: str):
+        pass
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class InProcessTaskRegistry(TaskRegistry):
+    def cancel(self, stream_id: str):
+        self.cancel_local(stream_id)
+
+
+class SQLiteTaskRegistry(TaskRegistry):
+    """
+    SQLite 파일을 통해 워커 간 작업 취소 요청을 공유
+    - cancel(): 모든 워커가 볼 수 있도록 취소 요청을 기록
+    - 각 워커는 poll_interval마다 자신이 소유한 stream_id의 취소 요청을 확인하여 로컬 작업을 취소
+    """
+    def __init__(self, db_path: str, poll_interval: float = 0.5, ttl: float = 600):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.ttl = ttl
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_cancellations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "stream_id TEXT NOT NULL, "
+            "requested_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._last_id = self._max_id()
+        self._poller = None
+
+    def _max_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM task_cancellations").fetchone()
+        return row[0]
+
+    def cancel(self, stream_id: str):
+        self.cancel_local(stream_id)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO task_cancellations (stream_id, requested_at) VALUES (?, ?)",
+                (stream_id, time.time())
+            )
+            self._conn.commit()
+
+    def _fetch_cancellations(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, stream_id, requested_at FROM task_cancellations WHERE id > ? ORDER BY id",
+                (self._last_id,)
+            ).fetchall()
+            # 오래된 취소 요청 정리
+            self._conn.execute("DELETE FROM task_cancellations WHERE requested_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+        return rows
+
+    async def _poll(self):
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._fetch_cancellations)
+                for row_id, stream_id, requested_at in rows:
+                    self._last_id = max(self._last_id, row_id)
+                    if self.cancel_local(stream_id, requested_at):
+                        self.logger.info(f"[{self.worker_id}] stream {stream_id} 작업 취소")
+            except Exception as e:
+                self.logger.error(f"작업 취소 요청 확인 실패: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+
+def create_task_registry() -> TaskRegistry:
+    """
+    STATE_BACKEND 환경변수(memory / sqlite)에 따라 작업 레지스트리를 생성
+    """
+    backend = os.getenv("STATE_BACKEND", "memory")
+    if backend == "memory":
+        return InProcessTaskRegistry()
+    elif backend == "sqlite":
+        return SQLiteTaskRegistry(os.getenv("STATE_SQLITE_PATH", "/tmp/tenten-state.db"))
+    else:
+        raise ValueError(f"Unsupported STATE_BACKEND: {backend}")
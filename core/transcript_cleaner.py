@@ -0,0 +1,111 @@
+import os
+import re
+from typing import List, Tuple
+
+# [음악], [박수], (웃음), ♪ 같은 비발화 주석
+_ANNOTATION_PATTERN = re.compile(r"\[[^\]]*\]|\((?:음악|박수|웃음|music|applause|laughter)[^)]*\)|[♪♬]+", re.IGNORECASE)
+_PUNCTUATION_PATTERN = re.compile(r"[^\w]")
+
+DEFAULT_FILLERS = {"음", "음음", "으음", "어", "어어", "아", "에", "으", "엄", "uh", "um", "umm", "uhm", "er", "ah", "hmm"}
+DEFAULT_STEPS = ("annotations", "overlap", "repeats", "fillers")
+
+
+def _normalize_word(word: str) -> str:
+    return _PUNCTUATION_PATTERN.sub("", word).lower()
+
+
+def strip_annotations(unit: str) -> str:
+    """[음악], [박수] 같은 비발화 주석 제거"""
+    return " ".join(_ANNOTATION_PATTERN.sub(" ", unit).split())
+
+
+def remove_overlap(prev_words: List[str], words: List[str]) -> List[str]:
+    """
+    이전 조각의 끝과 겹치는 현재 조각의 앞부분을 제거 (자동 자막의 겹치는 줄)
+    - 현재 조각 전체가 이전 조각의 끝과 같으면 빈 리스트 반환
+    """
+    prev = [_normalize_word(w) for w in prev_words]
+    cur = [_normalize_word(w) for w in words]
+    for size in range(min(len(prev), len(cur)), 0, -1):
+        if prev[-size:] == cur[:size]:
+            # 한 단어짜리 우연한 일치는 제외 (조각 전체가 겹치는 경우는 허용)
+            if size == 1 and len(cur) > 1:
+                break
+            return words[size:]
+    return words
+
+
+def collapse_repeats(words: List[str], max_ngram: int = 4) -> List[str]:
+    """연속으로 반복되는 단어/구(n-gram, n <= max_ngram)를 한 번만 남김"""
+    result: List[str] = []
+    normalized: List[str] = []
+    for word in words:
+        result.append(word)
+        normalized.append(_normalize_word(word))
+        for n in range(1, max_ngram + 1):
+            if len(normalized) >= 2 * n and normalized[-n:] == normalized[-2 * n:-n]:
+                del result[-n:]
+                del normalized[-n:]
+                break
+    return result
+
+
+class TranscriptCleaner:
+    """
+    자막 조각(units) 전처리 파이프라인 (추출 -> 정제 -> 청크 분할)
+    - annotations: 비발화 주석 제거
+    - overlap: 이전 조각과 겹치는 앞부분/중복 조각 제거
+    - repeats: 연속 반복 단어/구 축약
+    - fillers: 추임새(음, 어, uh, um 등) 제거
+    """
+    def __init__(self, steps=DEFAULT_STEPS, fillers=None):
+        self.steps = set(steps)
+        self.fillers = set(fillers) if fillers is not None else DEFAULT_FILLERS
+
+    def clean(self, units: List[str]) -> Tuple[List[str], dict]:
+        """
+        Returns:
+            (정제된 조각 리스트, 통계 dict: 원본/정제 글자 수, 조각 수, 감소율)
+        """
+        cleaned: List[str] = []
+        prev_words: List[str] = []
+        for unit in units:
+            if "annotations" in self.steps:
+                unit = strip_annotations(unit)
+            words = unit.split()
+            if "fillers" in self.steps:
+                words = [w for w in words if _normalize_word(w) not in self.fillers]
+            full_words = words
+            if "overlap" in self.steps and prev_words:
+                words = remove_overlap(prev_words, words)
+            if "repeats" in self.steps:
+                words = collapse_repeats(words)
+            if not words:
+                continue
+            cleaned.append(" ".join(words))
+            # 다음 조각과의 겹침은 겹침 제거 전의 전체 조각 기준으로 비교
+            prev_words = full_words
+
+        original_chars = len(" ".join(units))
+        cleaned_chars = len(" ".join(cleaned))
+        stats = {
+            "original_units": len(units),
+            "cleaned_units": len(cleaned),
+            "original_chars": original_chars,
+            "cleaned_chars": cleaned_chars,
+            "reduction_ratio": round(1 - cleaned_chars / original_chars, 4) if original_chars else 0.0
+        }
+        return cleaned, stats
+
+
+def create_transcript_cleaner() -> TranscriptCleaner:
+    """
+    YOUTUBE_TRANSCRIPT_CLEANING: 적용할 단계 목록 (예: "annotations,overlap", none이면 비활성화)
+    YOUTUBE_TRANSCRIPT_FILLERS: 제거할 추임새 목록 (지정하지 않으면 기본 목록)
+    """
+    steps = os.getenv("YOUTUBE_TRANSCRIPT_CLEANING", ",".join(DEFAULT_STEPS))
+    fillers = os.getenv("YOUTUBE_TRANSCRIPT_FILLERS")
+    return TranscriptCleaner(
+        steps=[] if steps.strip().lower() == "none" else [step.strip() for step in steps.split(",") if step.strip()],
+        fillers=[filler.strip() for filler in fillers.split(",") if filler.strip()] if fillers else None
+    )
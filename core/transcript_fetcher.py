@@ -0,0 +1,168 @@
+import asyncio
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api.proxies import GenericProxyConfig
+
+from core.metrics import TRANSCRIPT_FETCH_RETRIES, TRANSCRIPT_FETCH_SECONDS
+from core.request_context import min_timeout
+
+# 재시도해도 결과가 바뀌지 않는 오류 (자막 없음/비공개/삭제 등)는 재시도하지 않음
+_TRANSIENT_ERRORS = {"RequestBlocked", "IpBlocked", "YouTubeRequestFailed", "YouTubeDataUnparsable"}
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """timeout을 지정하지 않은 요청에 기본 timeout을 적용하는 커넥션 풀 어댑터"""
+    def __init__(self, timeout: float, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class AsyncRateLimiter:
+    """초당 rate개, 최대 burst개까지 허용하는 token bucket (전역 요청 속도 제한)"""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class TranscriptFetcher:
+    """
+    YouTube 자막 추출기
+    - 블로킹 fetch를 제한된 크기의 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+    - 호출마다 deadline(timeout) 적용, 일시적 오류만 지수 백오프로 재시도
+    - 커넥션 풀을 가진 requests.Session을 재사용하고, 프록시가 주어지면 순환 사용
+    - 전역 rate limiter로 YouTube throttling 방지
+    """
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: float = 20.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        rate: float = 5.0,
+        burst: int = 5,
+        proxies: Optional[List[str]] = None,
+        pool_size: int = 10
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcript-fetch")
+        self.rate_limiter = AsyncRateLimiter(rate, burst) if rate > 0 else None
+        # 프록시마다 별도 세션/클라이언트를 만들어 순환 (프록시가 없으면 직접 연결 하나)
+        self.sessions = [self._create_session(timeout, pool_size) for _ in (proxies or [None])]
+        self.clients = [
+            YouTubeTranscriptApi(
+                proxy_config=GenericProxyConfig(http_url=proxy, https_url=proxy) if proxy else None,
+                http_client=session
+            )
+            for proxy, session in zip(proxies or [None], self.sessions)
+        ]
+        self._client_cycle = itertools.cycle(self.clients)
+
+    @staticmethod
+    def _create_session(timeout: float, pool_size: int) -> Session:
+        session = Session()
+        adapter = _TimeoutHTTPAdapter(timeout, pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        return isinstance(error, RequestException) or type(error).__name__ in _TRANSIENT_ERRORS
+
+    async def fetch(self, video_id: str, languages: List[str]):
+        """
+        자막을 추출 (deadline 초과 시 asyncio.TimeoutError)
+        Raises:
+            youtube_transcript_api의 예외를 그대로 전달 (호출 측에서 메시지로 분류)
+        """
+        loop = asyncio.get_running_loop()
+        # 요청 마감 시각이 더 빠르면 그에 맞춤
+        deadline = loop.time() + min_timeout(self.timeout)
+        start = time.perf_counter()
+        result = "error"
+        try:
+            attempt = 0
+            while True:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire()
+                client = next(self._client_cycle)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    transcript = await asyncio.wait_for(
+                        loop.run_in_executor(self.executor, client.fetch, video_id, languages),
+                        timeout=remaining
+                    )
+                    result = "success"
+                    return transcript
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    if attempt >= self.max_retries or not self._is_transient(e):
+                        raise
+                    delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                    if loop.time() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    TRANSCRIPT_FETCH_RETRIES.labels(error=type(e).__name__).inc()
+                    print(f"[DEBUG] 자막 추출 재시도 {attempt}/{self.max_retries} ({type(e).__name__}), {delay:.2f}초 대기")
+                    await asyncio.sleep(delay)
+        except asyncio.TimeoutError:
+            result = "timeout"
+            raise
+        finally:
+            TRANSCRIPT_FETCH_SECONDS.labels(result=result).observe(time.perf_counter() - start)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for session in self.sessions:
+            session.close()
+
+
+def create_transcript_fetcher() -> TranscriptFetcher:
+    """
+    환경변수로 자막 추출기를 생성
+    - YOUTUBE_FETCH_WORKERS: 스레드 풀 크기
+    - YOUTUBE_FETCH_TIMEOUT / YOUTUBE_FETCH_RETRIES: 호출당 deadline(초, 재시도 포함) / 최대 재시도 횟수
+    - YOUTUBE_FETCH_RATE / YOUTUBE_FETCH_BURST: 초당 요청 수 / 순간 허용량 (RATE=0이면 제한 없음)
+    - YOUTUBE_PROXIES: 콤마로 구분한 프록시 URL 목록 (순환 사용)
+    """
+    proxies = [proxy.strip() for proxy in os.getenv("YOUTUBE_PROXIES", "").split(",") if proxy.strip()]
+    return TranscriptFetcher(
+        max_workers=int(os.getenv("YOUTUBE_FETCH_WORKERS", "4")),
+        timeout=float(os.getenv("YOUTUBE_FETCH_TIMEOUT", "20")),
+        max_retries=int(os.getenv("YOUTUBE_FETCH_RETRIES", "2")),
+        rate=float(os.getenv("YOUTUBE_FETCH_RATE", "5")),
+        burst=int(os.getenv("YOUTUBE_FETCH_BURST", "5")),
+        proxies=proxies or None
+    )
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.metrics import WARMUP_STEP_SECONDS
+from core.request_context import deadline_scope
+
+# 합성 요청에 사용하는 샘플 데이터 (실제 요청과 같은 프롬프트 경로를 거치도록 스키마 형식 그대로 사용)
+_SAMPLE_USER = {"nickname": "warmup", "class_name": "warmup"}
+_SAMPLE_CREATED_AT = "2025-01-01T00:00:00.000Z"
+_SAMPLE_TEXT = "오늘 점심 뭐 먹을지 추천해 주세요."
+_SAMPLE_TRANSCRIPT = "안녕하세요. 오늘은 파이썬 비동기 프로그래밍의 기본 개념을 간단히 정리해 보겠습니다."
+
+
+class WarmupStep:
+    __slots__ = ("name", "fn", "required")
+
+    def __init__(self, name: str, fn: Callable[[], None], required: bool = False):
+        self.name = name
+        self.fn = fn
+        self.required = required  # 실패하면 ready가 되지 않는 단계 (모델 생성 등)
+
+
+class Warmup:
+    """
+    서버 시작 후 첫 요청이 치르는 초기화 비용(프롬프트 조회, 페르소나/tokenizer 로딩, adapter 로딩, CUDA graph 등)을
+    합성 요청으로 미리 치르는 단계 실행기
+    - 단계는 순서대로 워커 스레드에서 실행하며 단계별 소요 시간/결과를 기록
+    - 모든 필수 단계가 성공해야 ready (readiness probe가 이 값을 사용)
+    - 선택 단계 실패(Langfuse 미접속 등)는 기록만 하고 진행 (서비스에 폴백이 있음)
+    """
+    def __init__(self, steps: List[WarmupStep], step_timeout: Optional[float] = 120):
+        self.steps = steps
+        self.step_timeout = step_timeout
+        self.status = "pending"  # pending / running / ready / failed
+        self.results: List[dict] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def _run_step(self, step: WarmupStep):
+        start = time.perf_counter()
+        result = {"name": step.name, "required": step.required, "ok": True}
+        try:
+            # 단계별 마감 시각을 두어 멈춘 단계가 readiness를 무한정 막지 않도록 함
+            with deadline_scope(self.step_timeout):
+                await asyncio.to_thread(step.fn)
+        except Exception as e:
+            result.update(ok=False, error=f"{type(e).__name__}: {e}")
+            print(f"warmup 단계 실패 ({step.name}): {e}")
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        WARMUP_STEP_SECONDS.labels(step=step.name).set(result["seconds"])
+        self.results.append(result)
+        return result
+
+    async def run(self):
+        self.status = "running"
+        self.started_at = time.time()
+        failed = False
+        for step in self.steps:
+            result = await self._run_step(step)
+            failed = failed or (step.required and not result["ok"])
+        self.finished_at = time.time()
+        self.status = "failed" if failed else "ready"
+        print(self.report())
+
+    async def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> dict:
+        total = None
+        if self.started_at is not None:
+            total = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {"status": self.status, "total_seconds": total, "steps": list(self.results)}
+
+    def report(self) -> str:
+        lines = [f"warmup {self.status}:"]
+        for result in self.results:
+            mark = "ok" if result["ok"] else "failed"
+            lines.append(f"  - {result['name']:<40} {result['seconds']:>8.3f}s  {mark}")
+        return "\n".join(lines)
+
+
+def _check_response(response: dict) -> dict:
+    if response.get("status_code") != 200:
+        raise RuntimeError(response.get("error") or f"status_code={response.get('status_code')}")
+    return response
+
+
+def _build_steps(app, generate: bool, n_candidates: int) -> List[WarmupStep]:
+    """
+    프롬프트 종류별 (프롬프트 조회 -> 합성 생성) 단계 목록
+    - 프롬프트 단계가 만든 messages를 생성 단계에서 그대로 사용하여 실제 요청과 같은 길이/형식으로 예열
+    """
+    from core.prompt_templates.bot_posts_prompt import BotPostsPrompt
+    from core.prompt_templates.bot_recomments_prompt import BotRecommentsPrompt
+    from core.prompt_templates.youtube_summary_prompt import YoutubeSummaryPrompt
+    from schemas.bot_posts_schema import PostRequest
+    from schemas.bot_recomments_schema import BotRecommentsRequest
+
+    model = app.state.model
+    mode = model.mode
+    fallback = [{"role": "user", "content": _SAMPLE_TEXT}]
+    messages: Dict[str, list] = {}
+    steps = []
+
+    tokenizer = getattr(model.loader, "tokenizer", None)
+    if tokenizer is not None:
+        def warm_tokenizer():
+            prompt = tokenizer.apply_chat_template(fallback, add_generation_prompt=True, tokenize=False)
+            tokenizer(prompt)
+        steps.append(WarmupStep("tokenizer", warm_tokenizer))
+
+    def prompt_chats():
+        prompt_client = app.state.bot_chats_service.prompt_client
+        messages["chat"] = prompt_client.get_messages_with_persona(list(fallback))
+
+    def prompt_posts():
+        post = PostRequest(user=_SAMPLE_USER, created_at=_SAMPLE_CREATED_AT, content=_SAMPLE_TEXT)
+        _, messages["posts"] = BotPostsPrompt().json_to_messages([post], mode)
+
+    def prompt_recomments():
+        request = BotRecommentsRequest(
+            board_type="ALL",
+            post={"id": 0, "user": _SAMPLE_USER, "created_at": _SAMPLE_CREATED_AT, "content": _SAMPLE_TEXT},
+            comment={"id": 0, "user": _SAMPLE_USER, "created_at": _SAMPLE_CREATED_AT, "content": _SAMPLE_TEXT}
+        )
+        _, messages["recomments"] = BotRecommentsPrompt().json_to_messages(request, mode)
+
+    def prompt_youtube():
+        prompt_builder = YoutubeSummaryPrompt(mode)
+        _, messages["summary_chunk"] = prompt_builder.create_chunk_messages(_SAMPLE_TRANSCRIPT, "전체 텍스트의 시작 부분")
+        _, messages["summary_final"] = prompt_builder.create_final_messages([_SAMPLE_TRANSCRIPT])
+
+    steps += [
+        WarmupStep("prompt:chats_bot", prompt_chats),
+        WarmupStep("prompt:posts_bot", prompt_posts),
+        WarmupStep("prompt:recomments_bot", prompt_recomments),
+        WarmupStep("prompt:youtube_summary", prompt_youtube),
+    ]
+    if not generate:
+        return steps
+
+    def response(prompt_type, adapter_type):
+        return lambda: _check_response(model.get_response(
+            messages.get(prompt_type, fallback), None, name="warmup", adapter_type=adapter_type
+        ))
+
+    def candidates(prompt_type, adapter_type):
+        return lambda: _check_response(model.get_candidates(
+            messages.get(prompt_type, fallback), None, n=n_candidates, name="warmup", adapter_type=adapter_type
+        ))
+
+    def batch(prompt_type, adapter_type):
+        def run():
+            for item in model.get_batch_responses([messages.get(prompt_type, fallback)] * 2, None, name="warmup", adapter_type=adapter_type):
+                _check_response(item)
+        return run
+
+    def stream(prompt_type, adapter_type):
+        def run():
+            for _ in model.stream_response(messages.get(prompt_type, fallback), None, name="warmup", adapter_type=adapter_type):
+                pass
+        return run
+
+    generations = [
+        ("social_bot", "chat", response),
+        ("social_bot", "posts", candidates if n_candidates > 1 else response),
+        ("social_bot", "recomments", candidates if n_candidates > 1 else response),
+        ("youtube_summary", "summary_chunk", batch),
+        ("youtube_summary", "summary_final", stream),
+    ]
+    # 설정으로 추가된 adapter도 한 번씩 올려 둠
+    registry = getattr(model.loader, "lora_registry", None)
+    if registry is not None:
+        known = {adapter_type for adapter_type, _, _ in generations}
+        for info in registry.list_adapters()["adapters"]:
+            if info["adapter_type"] not in known:
+                generations.append((info["adapter_type"], "default", response))
+
+    for adapter_type, prompt_type, call in generations:
+        steps.append(WarmupStep(f"generate:{adapter_type}:{prompt_type}", call(prompt_type, adapter_type), required=True))
+    return steps
+
+
+def create_warmup(app) -> Warmup:
+    """
+    환경변수로 warmup 단계를 구성 (WARMUP=false이면 단계 없이 바로 ready)
+    - WARMUP_GENERATE: 합성 생성 실행 여부 (기본값: 로컬 엔진인 gcp/remote/cpu 모드만 true, API 모드는 비용 때문에 false)
+    - WARMUP_STEP_TIMEOUT: 단계별 최대 시간(초)
+    """
+    step_timeout = float(os.getenv("WARMUP_STEP_TIMEOUT", "120"))
+    if os.getenv("WARMUP", "true").lower() != "true":
+        return Warmup([], step_timeout)
+    mode = app.state.model.mode
+    default_generate = "true" if mode.startswith("gcp") or mode in ("remote", "cpu") else "false"
+    generate = os.getenv("WARMUP_GENERATE", default_generate).lower() == "true"
+    n_candidates = max(int(os.getenv("BOT_NBEST_CANDIDATES", "1")), 1)
+    return Warmup(_build_steps(app, generate, n_candidates), step_timeout)
@@ -0,0 +1,222 @@
+"""
+stream_id / video_id 기반 affinity 게이트웨이
+
+여러 replica 앞에서 같은 stream_id(채팅) / video_id(YouTube 요약) 요청을 항상 같은 replica로 보내
+해당 replica의 prefix cache와 로컬 대화 메모리를 재사용하도록 한다.
+- consistent hashing(가상 노드) + bounded load
+- 주기적인 health check로 ring 구성원을 갱신
+
+실행 예시:
+    python gateway.py --backends http://10.0.0.2:8000,http://10.0.0.3:8000 --port 8080
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from core.hash_ring import ConsistentHashRing
+
+logger = logging.getLogger(__name__)
+
+# hop-by-hop 헤더는 프록시에서 전달하지 않음
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length"
+}
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """YouTube URL에서 video_id를 추출 (YouTubeSummaryService._extract_video_id와 동일한 규칙)"""
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    parsed_url = urlparse(url)
+    if parsed_url.hostname in ['www.youtube.com', 'youtube.com']:
+        if parsed_url.path.startswith('/shorts/'):
+            return parsed_url.path.split('/')[2]
+        return parse_qs(parsed_url.query).get('v', [None])[0]
+    elif parsed_url.hostname == 'youtu.be':
+        return parsed_url.path[1:]
+    return None
+
+
+def extract_routing_key(request: Request, body: bytes) -> str:
+    """
+    요청에서 라우팅 key를 추출
+    - DELETE /chat/stream/{streamId}: streamId
+    - JSON body의 stream_id (POST /chat)
+    - JSON body의 YouTube url -> video_id
+    - 그 외: 클라이언트 주소
+    """
+    path = request.url.path
+    if path.startswith("/chat/stream/"):
+        return f"stream:{path.rsplit('/', 1)[-1]}"
+
+    if body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            if payload.get("stream_id"):
+                return f"stream:{payload['stream_id']}"
+            if payload.get("url"):
+                video_id = extract_video_id(str(payload["url"]))
+                if video_id:
+                    return f"video:{video_id}"
+
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
+class Gateway:
+    def __init__(self, backends, health_path: str, health_interval: float, load_factor: float):
+        self.backends = backends
+        self.health_path = health_path
+        self.health_interval = health_interval
+        self.ring = ConsistentHashRing(backends, load_factor=load_factor)
+        self.loads: Dict[str, int] = {backend: 0 for backend in backends}
+        self.client = httpx.AsyncClient(timeout=httpx.Timeout(connect=5, read=None, write=30, pool=5))
+        self._health_task = None
+
+    async def _check_health(self):
+        while True:
+            for backend in self.backends:
+                try:
+                    response = await self.client.get(f"{backend}{self.health_path}", timeout=3)
+                    healthy = response.status_code == 200
+                except httpx.HTTPError:
+                    healthy = False
+
+                if healthy and backend not in self.ring.nodes:
+                    logger.info(f"[gateway] ring에 추가: {backend}")
+                    self.ring.add_node(backend)
+                elif not healthy and backend in self.ring.nodes:
+                    logger.warning(f"[gateway] ring에서 제외: {backend}")
+                    self.ring.remove_node(backend)
+            await asyncio.sleep(self.health_interval)
+
+    async def start(self):
+        self._health_task = asyncio.create_task(self._check_health())
+
+    async def stop(self):
+        if self._health_task:
+            self._health_task.cancel()
+        await self.client.aclose()
+
+    async def proxy(self, request: Request):
+        body = await request.body()
+        key = extract_routing_key(request, body)
+        backend = self.ring.get_node(key, self.loads)
+        if backend is None:
+            return JSONResponse(status_code=503, content={
+                "error": "no_backend_available",
+                "message": "사용 가능한 AI 서버가 없습니다."
+            })
+
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        headers["x-routing-key"] = key
+        upstream = self.client.build_request(
+            request.method,
+            f"{backend}{request.url.path}",
+            params=request.query_params,
+            headers=headers,
+            content=body
+        )
+
+        self.loads[backend] = self.loads.get(backend, 0) + 1
+        try:
+            response = await self.client.send(upstream, stream=True)
+        except httpx.HTTPError as e:
+            self.loads[backend] -= 1
+            logger.error(f"[gateway] {backend} 요청 실패: {e}")
+            return JSONResponse(status_code=502, content={
+                "error": "bad_gateway",
+                "message": "AI 서버에 연결하지 못했습니다."
+            })
+
+        response_headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+
+        released = False
+
+        async def release():
+            # 부하 반환과 upstream 응답 정리는 한 번만 (스트림 종료와 background task 중 먼저 실행되는 쪽)
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.loads[backend] -= 1
+            await response.aclose()
+
+        async def body_iterator():
+            # SSE 등 스트리밍 응답도 그대로 전달하고, 스트림이 끝나면 부하를 반환
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await release()
+
+        if "text/event-stream" in response.headers.get("content-type", ""):
+            # 본문 전송을 시작하기 전에 클라이언트가 끊겨 body_iterator가 실행되지 않아도 background task로 반환
+            return StreamingResponse(
+                body_iterator(), status_code=response.status_code, headers=response_headers,
+                background=BackgroundTask(release)
+            )
+
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+            self.loads[backend] -= 1
+        return Response(content=content, status_code=response.status_code, headers=response_headers)
+
+
+def create_app(gateway: Gateway) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await gateway.start()
+        yield
+        await gateway.stop()
+
+    app = FastAPI(title="텐텐 AI Gateway", lifespan=lifespan)
+
+    @app.get("/gateway/status")
+    async def status():
+        return {
+            "ring": sorted(gateway.ring.nodes),
+            "loads": gateway.loads
+        }
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def proxy(request: Request, path: str):
+        return await gateway.proxy(request)
+
+    return app
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="텐텐 AI stream affinity 게이트웨이")
+    parser.add_argument("--backends", default=os.getenv("GATEWAY_BACKENDS", ""), help="콤마로 구분한 replica 주소 목록")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--health-path", default=os.getenv("GATEWAY_HEALTH_PATH", "/health/ready"))
+    parser.add_argument("--health-interval", type=float, default=5.0)
+    parser.add_argument("--load-factor", type=float, default=1.25, help="bounded load 계수 (평균 부하 대비 허용 배수)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    backends = [backend.strip().rstrip("/") for backend in args.backends.split(",") if backend.strip()]
+    if not backends:
+        raise SystemExit("--backends 또는 GATEWAY_BACKENDS를 지정하세요.")
+
+    gateway = Gateway(backends, args.health_path, args.health_interval, args.load_factor)
+    uvicorn.run(create_app(gateway), host="0.0.0.0", port=args.port)
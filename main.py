@@ -1,5 +1,7 @@
 import argparse
+import asyncio
 import os
+from utils.startup_profiler import startup_profiler # 시작 단계별 시간/RSS 측정 (가장 먼저 import)
 from dotenv import load_dotenv # dotenv 임포트
 
 # [FIX] 애플리케이션 시작 시점에 환경 변수를 가장 먼저 로드
@@ -15,22 +17,46 @@ from api.endpoints.bot_chats_router import router as bot_chat_router
 from models.model_loader import ModelLoader 
 
 from api.endpoints.discord_webhook_router import router as discord_router ## for Discord Webhook
+from api.endpoints.lora_admin_router import router as lora_admin_router
+from api.endpoints.health_router import router as health_router
 from utils.logger_discord import setup_logging
 from utils.exception_handler import register_exception_handlers
 import json
 from datetime import datetime
 from contextlib import asynccontextmanager
 from core.sse_manager import sse_manager
+from core.pubsub import create_broker
 from services.bot_chats_service import BotChatsService # BotChatsService 임포트
+from prometheus_client import make_asgi_app
+from core.cache import create_chunk_summary_store
+from core.simhash_index import create_simhash_index
+from core.transcript_fetcher import create_transcript_fetcher
+from core.job_queue import create_job_queue
+from core.pregen_pool import create_pregen_pool
+from core.scheduler import create_scheduler
+from core.request_context import DeadlineMiddleware, create_deadline_defaults
+from core.warmup import create_warmup
+from core.drain import DrainMiddleware, DrainingServer, drain_controller
+from utils.logger import langfuse
+from services.bot_posts_service import BotPostsService
+from api.endpoints.controllers.youtube_summary_controller import YouTubeSummaryController
+
+startup_profiler.mark("imports")
 
 # CLI 인자 파싱 함수 추가
 def parse_args():
     parser = argparse.ArgumentParser(description="텐텐 GPU 사용 모드 선택")
     parser.add_argument(
         "--mode",
-        choices=["colab", "gcp-dev", "gcp-prod", "api-dev", "api-prod"],
+        choices=["colab", "gcp-dev", "gcp-prod", "api-dev", "api-prod", "remote", "cpu"],
         default="colab",
-        help="LLM inference 모드 선택 (colab: Ngrok/Colab, gcp-dev: 배포용 GCP 서버, gcp-prod: 개발용 GCP 서버, api-dev: gemini 2.0 flash api 사용 및 로컬 환경변수 사용, api-prod: gemini 2.0 flash api 사용 및 GCP 환경변수 사용)"
+        help="LLM inference 모드 선택 (colab: Ngrok/Colab, gcp-dev: 배포용 GCP 서버, gcp-prod: 개발용 GCP 서버, api-dev: gemini 2.0 flash api 사용 및 로컬 환경변수 사용, api-prod: gemini 2.0 flash api 사용 및 GCP 환경변수 사용, remote: 별도 엔진 워커(models/engine_server.py)에 ZeroMQ로 접속, cpu: GPU 없이 transformers로 CPU 추론)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="uvicorn 워커 수 (2 이상이면 대화 메모리/SSE/작업 레지스트리를 STATE_BACKEND=sqlite로 공유)"
     )
     return parser.parse_args()
 
@@ -40,12 +66,61 @@ async def lifespan(app: FastAPI):
     # 서버 시작 시 실행
     print("서버 시작: 모델, SSEManager, BotChatsService 로딩을 시작합니다.")
     llm_mode = os.environ.get("LLM_MODE", "colab")
-    app.state.model = ModelLoader(mode=llm_mode)
-    app.state.sse_manager = sse_manager
-    app.state.bot_chats_service = BotChatsService(app) # BotChatsService 인스턴스 생성 및 상태 저장
+    with startup_profiler.phase("model"):
+        # 모드별로 필요한 라이브러리(vLLM/torch, openai, zmq)는 loader 생성 시점에 import
+        app.state.model = ModelLoader(mode=llm_mode)
+    # 모델 호출 우선순위/공정성 스케줄러 (chat > recomments > posts > summary > batch)
+    app.state.model.scheduler = create_scheduler()
+    if app.state.model.scheduler:
+        app.state.model.scheduler.attach(asyncio.get_running_loop())
+    with startup_profiler.phase("sse_broker"):
+        # SSE_BROKER(memory / sqlite / redis)에 따라 워커/replica 간 SSE 전달 브로커 설정
+        await sse_manager.start(create_broker())
+        app.state.sse_manager = sse_manager
+    with startup_profiler.phase("stores"):
+        app.state.chunk_summary_store = create_chunk_summary_store() # 요청 간 공유되는 청크 요약 저장소
+        app.state.simhash_index = create_simhash_index() # 요약한 자막의 근사 중복 인덱스
+        app.state.transcript_fetcher = create_transcript_fetcher() # YouTube 자막 추출기 (스레드 풀 + rate limit)
+    with startup_profiler.phase("services"):
+        app.state.bot_chats_service = BotChatsService(app) # BotChatsService 인스턴스 생성 및 상태 저장
+        await app.state.bot_chats_service.task_registry.start()
+        # YouTube 요약 비동기 작업 큐 (재시작 시 미완료 작업을 이어서 처리)
+        app.state.summary_jobs = create_job_queue("youtube_summary", YouTubeSummaryController(app).run_summary_job)
+        await app.state.summary_jobs.start()
+        # 유휴 시간에 board_type별 소셜봇 게시글을 미리 생성 (BOT_PREGEN_POOL_SIZE=0이면 비활성화)
+        app.state.pregen_pool = create_pregen_pool(BotPostsService(app).pregenerate, app.state.model)
+        if app.state.pregen_pool:
+            await app.state.pregen_pool.start()
+    app.state.startup_profile = startup_profiler.summary()
+    print(startup_profiler.report())
     print("서버 시작: 모델, SSEManager, BotChatsService 로딩 완료.")
+    # 합성 요청으로 프롬프트/페르소나/tokenizer/adapter를 예열 (끝나기 전까지 /health/ready는 503)
+    app.state.warmup = create_warmup(app)
+    await app.state.warmup.start()
+
+    # 종료 시 drain: 새 작업 중단 -> 진행 중인 작업 대기 -> SSE reconnect 안내 -> Langfuse flush
+    drain_controller.register("chat", app.state.bot_chats_service.task_registry.in_flight_count)
+    drain_controller.register("summary_jobs", app.state.summary_jobs.in_flight_count)
+    drain_controller.register("model", app.state.model.in_flight_count)
+    drain_controller.on_start(app.state.warmup.stop)
+    drain_controller.on_start(app.state.summary_jobs.pause)
+    if app.state.pregen_pool:
+        drain_controller.on_start(app.state.pregen_pool.stop)
+    drain_controller.on_drained(sse_manager.close_connections)
+    drain_controller.on_drained(lambda: asyncio.to_thread(langfuse.flush))
+    drain_controller.on_drained(lambda: asyncio.to_thread(app.state.bot_chats_service.prompt_client.langfuse.flush))
     yield
-    # 서버 종료 시 실행 (필요 시 리소스 정리)
+    # 서버 종료 시 실행 (DrainingServer가 이미 drain 했으면 바로 반환)
+    await drain_controller.drain()
+    await app.state.warmup.stop()
+    if app.state.pregen_pool:
+        await app.state.pregen_pool.stop()
+    await app.state.summary_jobs.stop()
+    await app.state.bot_chats_service.task_registry.stop()
+    await sse_manager.stop()
+    if app.state.simhash_index:
+        app.state.simhash_index.save(force=True)
+    app.state.transcript_fetcher.close()
     print("서버 종료.")
 
 
@@ -73,6 +148,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 요청 마감 시각(X-Request-Deadline / X-Request-Timeout-Ms 헤더 또는 경로별 기본값)을 요청 컨텍스트에 설정
+app.add_middleware(DeadlineMiddleware, defaults=create_deadline_defaults())
+# 종료(drain) 중 새 작업 요청 거절 및 진행 중인 요청 수 집계
+app.add_middleware(DrainMiddleware, controller=drain_controller)
 # 디스코드 웹훅 로깅 설정: 파일 + 콘솔 + Discord
 setup_logging("ai-log.log")
 # 디스코드 웹훅 예외 핸들러 등록
@@ -86,6 +165,11 @@ app.include_router(bot_recomment_router, prefix="/recomments/bot", tags=["bot-re
 # [REFACTOR] API 명세에 맞게 prefix 제거, 태그 수정
 app.include_router(bot_chat_router, prefix="", tags=["Bot Chats (Streaming)"])
 app.include_router(discord_router, prefix="/error_log", tags=["discord-webhook"]) # Discord Webhook router
+app.include_router(lora_admin_router, prefix="/admin/lora", tags=["admin"]) # LoRA adapter 관리 (ADMIN_TOKEN 필요)
+app.include_router(health_router, prefix="/health", tags=["health"]) # liveness / readiness (warmup 완료 여부)
+
+# Prometheus 메트릭 (completion 캐시 hit/miss 등)
+app.mount("/metrics", make_asgi_app())
 
 # 서버 구동을 위한 설정
 if __name__ == "__main__":
@@ -93,15 +177,33 @@ if __name__ == "__main__":
     os.environ["LLM_MODE"] = args.mode
 
     reload_flag = True
-    if os.environ["LLM_MODE"] in ["gcp-dev", "gcp-prod", "api-dev", "api-prod"]:
+    if os.environ["LLM_MODE"] in ["gcp-dev", "gcp-prod", "api-dev", "api-prod", "remote", "cpu"]:
+        reload_flag = False
+
+    if args.workers > 1:
+        # 멀티 워커 모드: 워커마다 GPU 모델을 올릴 수 없으므로 엔진 워커(remote) 또는 API 모드만 허용
+        if args.mode in ["gcp-dev", "gcp-prod", "cpu"]:
+            raise SystemExit(f"{args.mode} 모드는 멀티 워커를 지원하지 않습니다. models/engine_server.py를 띄우고 --mode remote를 사용하세요.")
+        os.environ.setdefault("STATE_BACKEND", "sqlite")
+        if os.environ["STATE_BACKEND"] == "memory":
+            raise SystemExit("멀티 워커 모드에서는 STATE_BACKEND=memory를 사용할 수 없습니다.")
         reload_flag = False
 
-    print(f"실행 모드: {args.mode}, reload : {reload_flag}")
+    print(f"실행 모드: {args.mode}, reload : {reload_flag}, workers : {args.workers}")
     
 
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=reload_flag   # 개발 환경에서만 사용
-    )
\ No newline at end of file
+    grace_seconds = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+    if reload_flag or args.workers > 1:
+        # reload/멀티 워커는 uvicorn이 프로세스를 관리하므로 연결 종료 대기 시간만 제한 (drain은 lifespan 종료 시 실행)
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=reload_flag,   # 개발 환경에서만 사용
+            workers=args.workers,
+            timeout_graceful_shutdown=grace_seconds
+        )
+    else:
+        # 종료 신호를 받으면 listen socket을 닫기 전에 drain (drain 중에도 health check 응답)
+        config = uvicorn.Config("main:app", host="0.0.0.0", port=8000, timeout_graceful_shutdown=grace_seconds)
+        DrainingServer(config).run()
\ No newline at end of file
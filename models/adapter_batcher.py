@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from core.metrics import LORA_BATCH_SIZE, LORA_SLOT_OCCUPANCY, LORA_SWAPS
+from core.request_context import get_deadline, reset_deadline, set_deadline
+from utils.error_handler import DeadlineExceededError
+
+
+class LoRASlotTracker:
+    """
+    엔진의 LoRA slot(max_loras) 점유 상태를 LRU로 추적
+    - slot에 없는 adapter를 사용하면 가장 오래 사용하지 않은 adapter를 내리고 올리는 것으로 보고 swap으로 기록
+    """
+    def __init__(self, max_loras: int):
+        self.max_loras = max_loras
+        self.resident: "OrderedDict[object, None]" = OrderedDict()
+        self.swaps = 0
+
+    def is_resident(self, key) -> bool:
+        return key in self.resident
+
+    def use(self, key, adapter: Optional[str] = None) -> bool:
+        """adapter(key: lora_int_id 등)를 사용 처리하고 swap 발생 여부를 반환"""
+        if key in self.resident:
+            self.resident.move_to_end(key)
+            return False
+        swapped = len(self.resident) >= self.max_loras
+        if swapped:
+            self.resident.popitem(last=False)
+            self.swaps += 1
+            LORA_SWAPS.labels(adapter=adapter or str(key)).inc()
+        self.resident[key] = None
+        LORA_SLOT_OCCUPANCY.set(len(self.resident))
+        return swapped
+
+
+class _Item:
+    __slots__ = ("prompt", "sampling_params", "lora_request", "adapter", "key", "deadline", "enqueued_at", "future")
+
+    def __init__(self, prompt, sampling_params, lora_request, deadline: Optional[float]):
+        self.prompt = prompt
+        self.sampling_params = sampling_params
+        self.lora_request = lora_request
+        self.adapter = getattr(lora_request, "lora_name", None) or "base"
+        # 같은 adapter라도 버전(lora_int_id)이 다르면 다른 slot을 사용
+        self.key = getattr(lora_request, "lora_int_id", None) or self.adapter
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+        self.future: Future = Future()
+
+
+class AdapterBatcher:
+    """
+    LoRA adapter를 고려한 generate 요청 묶음 실행기 (multi-LoRA 서빙용)
+    - 여러 워커 스레드의 generate 요청을 window_ms 동안 모아 adapter별로 그룹화
+    - 같은 adapter 요청은 한 번의 generate 호출(같은 엔진 step)로 실행
+    - 그룹 실행 순서: 이미 slot에 올라간 adapter를 먼저 실행해 swap을 줄이고, 나머지는 오래 기다린 순
+    - 마감 시각(deadline)이 지난 요청은 엔진에 보내지 않음
+    """
+    def __init__(self, generate_fn: Callable, max_loras: int = 2, window_ms: float = 10, max_batch_size: int = 32):
+        self.generate_fn = generate_fn
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.slots = LoRASlotTracker(max_loras)
+        self._pending: List[_Item] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="adapter-batcher", daemon=True)
+        self._thread.start()
+
+    def submit_many(self, prompts: list, sampling_params, lora_request) -> list:
+        """
+        프롬프트들을 대기열에 넣고 생성 결과(RequestOutput)를 입력 순서대로 반환 (호출 스레드는 완료까지 대기)
+        Raises:
+            DeadlineExceededError: 실행 전에 요청 마감 시각이 지난 경우
+        """
+        deadline = get_deadline()
+        items = [_Item(prompt, sampling_params, lora_request, deadline) for prompt in prompts]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AdapterBatcher is closed")
+            self._pending.extend(items)
+            self._cond.notify()
+        return [item.future.result() for item in items]
+
+    def submit(self, prompt, sampling_params, lora_request):
+        return self.submit_many([prompt], sampling_params, lora_request)[0]
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+    def _collect(self) -> List[_Item]:
+        """첫 요청이 들어오면 window 동안 더 모은 뒤 대기열 전체를 가져옴"""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if self._closed and not self._pending:
+                return []
+            window_end = time.monotonic() + self.window
+            while not self._closed:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            items, self._pending = self._pending, []
+            return items
+
+    def _order_groups(self, items: List[_Item]) -> List[List[_Item]]:
+        groups: "OrderedDict[object, List[_Item]]" = OrderedDict()
+        for item in items:
+            groups.setdefault(item.key, []).append(item)
+        # slot에 있는 adapter 먼저(최근 사용 순), 이후 가장 오래 기다린 요청이 있는 adapter 순
+        resident_order = {adapter: idx for idx, adapter in enumerate(reversed(self.slots.resident))}
+        return sorted(
+            groups.values(),
+            key=lambda group: (
+                0 if self.slots.is_resident(group[0].key) else 1,
+                resident_order.get(group[0].key, 0),
+                group[0].enqueued_at
+            )
+        )
+
+    def _run_group(self, group: List[_Item]):
+        now = time.time()
+        live = []
+        for item in group:
+            if item.deadline is not None and item.deadline <= now:
+                item.future.set_exception(DeadlineExceededError("deadline exceeded while waiting for adapter batch"))
+            else:
+                live.append(item)
+
+        for start in range(0, len(live), self.max_batch_size):
+            batch = live[start:start + self.max_batch_size]
+            self.slots.use(batch[0].key, batch[0].adapter)
+            LORA_BATCH_SIZE.labels(adapter=batch[0].adapter).observe(len(batch))
+            params = [item.sampling_params for item in batch]
+            if all(p is params[0] for p in params):
+                params = params[0]
+            # contextvar는 이 스레드로 전달되지 않으므로 묶음의 마감 시각(가장 늦은 값)을 설정해 엔진에 전달
+            # (마감이 없는 요청이 섞여 있으면 마감 없음: 모든 요청의 마감이 지나야 생성을 중단)
+            deadlines = [item.deadline for item in batch]
+            token = set_deadline(None if None in deadlines else max(deadlines))
+            try:
+                outputs = self.generate_fn(
+                    [item.prompt for item in batch], params, lora_request=batch[0].lora_request
+                )
+            except Exception as e:
+                for item in batch:
+                    item.future.set_exception(e)
+                continue
+            finally:
+                reset_deadline(token)
+            for item, output in zip(batch, outputs):
+                item.future.set_result(output)
+
+    def _loop(self):
+        while True:
+            items = self._collect()
+            if not items:
+                return
+            for group in self._order_groups(items):
+                self._run_group(group)
+
+
+def create_adapter_batcher(generate_fn: Callable, max_loras: int) -> Optional[AdapterBatcher]:
+    """
+    환경변수로 adapter 묶음 실행기를 생성 (LORA_BATCHING=false이면 비활성화)
+    - LORA_BATCH_WINDOW_MS: 요청을 모으는 최대 대기 시간(ms)
+    - LORA_BATCH_MAX_SIZE: 한 번의 generate 호출에 넣는 최대 요청 수
+    """
+    if os.getenv("LORA_BATCHING", "true").lower() != "true":
+        return None
+    return AdapterBatcher(
+        generate_fn,
+        max_loras=max_loras,
+        window_ms=float(os.getenv("LORA_BATCH_WINDOW_MS", "10")),
+        max_batch_size=int(os.getenv("LORA_BATCH_MAX_SIZE", "32"))
+    )
@@ -0,0 +1,176 @@
+"""
+모델 artifact(base 모델, tokenizer, LoRA adapter) 로컬 캐시
+
+Hub에서 받은 파일을 MODEL_CACHE_DIR 아래 artifact별 디렉터리에 저장하고, 파일 크기/sha256 manifest로 검증한다.
+모든 artifact가 캐시에 있으면 HF offline 모드로 전환하여 재시작 시 Hub 지연/장애의 영향을 받지 않는다.
+
+캐시를 미리 채우는 예시 (이미지 빌드, init container 등):
+    MODEL_CACHE_DIR=/models python -m models.artifacts
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+MANIFEST_NAME = "artifact_manifest.json"
+_SKIP_DIRS = {".cache", ".git"}
+
+# gcp 모드에서 사용하는 base 모델 (tokenizer 포함)
+BASE_MODEL = "naver-hyperclovax/HyperCLOVAX-SEED-Text-Instruct-1.5B"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _list_files(root: str) -> List[str]:
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in _SKIP_DIRS]
+        for filename in filenames:
+            if filename == MANIFEST_NAME:
+                continue
+            files.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    return sorted(files)
+
+
+def hub_download(repo_id: str, revision: Optional[str], local_dir: str) -> str:
+    from huggingface_hub import snapshot_download
+    return snapshot_download(repo_id=repo_id, revision=revision, local_dir=local_dir, token=os.getenv("HF_TOKEN"))
+
+
+class ArtifactManager:
+    """
+    artifact를 병렬로 받아 로컬 캐시에 저장하고 manifest로 검증
+    - verify="size": 파일 목록/크기만 확인 (빠름), "sha256": 전체 해시 확인
+    - 이미 검증된 artifact는 다시 받지 않음
+    """
+    def __init__(self, cache_dir: str, max_workers: int = 4, verify: str = "size",
+                 download_fn: Callable[[str, Optional[str], str], str] = hub_download):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.verify = verify
+        self.download_fn = download_fn
+        self.timings: Dict[str, dict] = {}  # repo_id -> {"seconds", "source"}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def local_dir(self, repo_id: str, revision: Optional[str] = None) -> str:
+        name = re.sub(r"[^\w.-]", "--", repo_id)
+        return os.path.join(self.cache_dir, f"{name}@{revision or 'main'}")
+
+    def _lock(self, local_dir: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(local_dir, threading.Lock())
+
+    def write_manifest(self, local_dir: str, repo_id: str, revision: Optional[str]):
+        files = {
+            path: {"size": os.path.getsize(os.path.join(local_dir, path)), "sha256": _sha256(os.path.join(local_dir, path))}
+            for path in _list_files(local_dir)
+        }
+        tmp_path = os.path.join(local_dir, f"{MANIFEST_NAME}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"repo_id": repo_id, "revision": revision, "created_at": time.time(), "files": files}, f, indent=1)
+        os.replace(tmp_path, os.path.join(local_dir, MANIFEST_NAME))
+
+    def is_valid(self, local_dir: str) -> bool:
+        """manifest의 파일이 모두 있고 크기(verify=sha256이면 해시까지)가 같은지"""
+        manifest_path = os.path.join(local_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return False
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                files = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return False
+        if not files:
+            return False
+        for path, expected in files.items():
+            full_path = os.path.join(local_dir, path)
+            if not os.path.exists(full_path) or os.path.getsize(full_path) != expected["size"]:
+                return False
+            if self.verify == "sha256" and _sha256(full_path) != expected["sha256"]:
+                return False
+        return True
+
+    def fetch(self, repo_id: str, revision: Optional[str] = None) -> str:
+        """
+        검증된 캐시가 있으면 그 경로를, 없으면 받아서 manifest를 만든 뒤 경로를 반환
+        - repo_id가 로컬 디렉터리면 그대로 사용
+        """
+        if os.path.isdir(repo_id):
+            return repo_id
+        local_dir = self.local_dir(repo_id, revision)
+        with self._lock(local_dir):
+            start = time.perf_counter()
+            if self.is_valid(local_dir):
+                self.timings[repo_id] = {"seconds": round(time.perf_counter() - start, 3), "source": "cache"}
+                return local_dir
+            if os.getenv("HF_HUB_OFFLINE") == "1":
+                raise ValueError(f"artifact not in cache (HF offline mode): {repo_id}@{revision or 'main'}")
+            os.makedirs(local_dir, exist_ok=True)
+            manifest_path = os.path.join(local_dir, MANIFEST_NAME)
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            self.download_fn(repo_id, revision, local_dir)
+            self.write_manifest(local_dir, repo_id, revision)
+            self.timings[repo_id] = {"seconds": round(time.perf_counter() - start, 3), "source": "hub"}
+            print(f"artifact 다운로드 완료: {repo_id}@{revision or 'main'} ({self.timings[repo_id]['seconds']}s)")
+            return local_dir
+
+    def prefetch(self, artifacts: List[dict]) -> Dict[str, str]:
+        """
+        artifact({"repo_id", "revision"}) 목록을 병렬로 받아 {repo_id: 로컬 경로} 반환
+        Raises:
+            하나라도 실패하면 첫 번째 예외
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(artifacts)))) as executor:
+            paths = list(executor.map(lambda artifact: self.fetch(artifact["repo_id"], artifact.get("revision")), artifacts))
+        return {artifact["repo_id"]: path for artifact, path in zip(artifacts, paths)}
+
+
+def enable_offline_mode():
+    """
+    이후 transformers/vLLM/huggingface_hub가 Hub에 접속하지 않도록 설정
+    - 실행 중 추가하는 adapter도 캐시(python -m models.artifacts) 또는 로컬 경로에 있어야 함
+    """
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def create_artifact_manager() -> Optional[ArtifactManager]:
+    """
+    환경변수로 artifact 캐시를 생성 (MODEL_CACHE_DIR가 없으면 비활성화, 기존처럼 Hub에서 로딩)
+    - MODEL_CACHE_VERIFY: size / sha256
+    - MODEL_PREFETCH_WORKERS: 병렬 다운로드 수
+    - MODEL_CACHE_OFFLINE: 캐시를 채운 뒤 HF offline 모드로 전환할지 여부 (기본값 true)
+    """
+    cache_dir = os.getenv("MODEL_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return ArtifactManager(
+        cache_dir,
+        max_workers=int(os.getenv("MODEL_PREFETCH_WORKERS", "4")),
+        verify=os.getenv("MODEL_CACHE_VERIFY", "size")
+    )
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from models.lora_registry import load_adapter_specs
+
+    load_dotenv(override=True)
+    manager = create_artifact_manager()
+    if manager is None:
+        raise SystemExit("MODEL_CACHE_DIR를 지정하세요.")
+    artifacts = [{"repo_id": BASE_MODEL}] + [{"repo_id": spec["path"], "revision": spec.get("revision")} for spec in load_adapter_specs()]
+    for repo_id, path in manager.prefetch(artifacts).items():
+        print(f"{repo_id} -> {path} ({manager.timings[repo_id]['source']})")
@@ -0,0 +1,340 @@
+"""
+transformers 기반 CPU 생성 엔진 (GPU/vLLM 없이 base 모델 + PEFT LoRA adapter 실행)
+
+- 여러 adapter를 PeftModel 하나에 올려 두고 요청마다 set_adapter로 전환 (한 번의 generate는 한 adapter)
+- 같은 adapter의 동시 요청은 AdapterBatcher가 모아 left padding 배치로 한 번에 generate
+- 시스템 프롬프트(페르소나 등) 같은 공통 prefix의 KV cache를 LRU로 보관해 prefill을 건너뜀
+- CPU_QUANTIZATION: none(float32) / bf16 / int8(nn.Linear dynamic quantization)
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, List, Optional
+
+from core.request_context import get_deadline
+from utils.error_handler import DeadlineExceededError
+
+
+class CPULoRARequest:
+    """vLLM LoRARequest와 같은 필드를 가진 adapter 요청 (LoRARegistry/AdapterBatcher에서 그대로 사용)"""
+    __slots__ = ("lora_name", "lora_int_id", "lora_path")
+
+    def __init__(self, lora_name: str, lora_int_id: int, lora_path: str):
+        self.lora_name = lora_name
+        self.lora_int_id = lora_int_id
+        self.lora_path = lora_path
+
+    @property
+    def adapter_name(self) -> str:
+        # 같은 adapter라도 버전마다 PEFT adapter 이름을 다르게 하여 교체 중 이전 버전과 섞이지 않게 함
+        return f"{self.lora_name}-{self.lora_int_id}"
+
+
+class CPUSamplingParams:
+    __slots__ = ("n", "temperature", "top_p", "max_tokens", "stop")
+
+    def __init__(self, n: int = 1, temperature: float = 1.0, top_p: float = 1.0, max_tokens: int = 256, stop: Optional[List[str]] = None):
+        self.n = n
+        self.temperature = temperature
+        self.top_p = top_p
+        self.max_tokens = max_tokens
+        self.stop = stop or []
+
+
+class CompletionOutput:
+    __slots__ = ("text", "token_ids")
+
+    def __init__(self, text: str, token_ids: list):
+        self.text = text
+        self.token_ids = token_ids
+
+
+class RequestOutput:
+    """vLLM RequestOutput처럼 outputs에 n개의 CompletionOutput을 담음"""
+    __slots__ = ("outputs",)
+
+    def __init__(self, outputs: List[CompletionOutput]):
+        self.outputs = outputs
+
+
+def truncate_at_stop(text: str, stop: List[str]) -> str:
+    """생성 텍스트를 가장 먼저 나오는 stop 문자열 앞에서 자름"""
+    cut = len(text)
+    for token in stop:
+        idx = text.find(token)
+        if idx != -1:
+            cut = min(cut, idx)
+    return text[:cut]
+
+
+class PrefixKVCache:
+    """
+    (adapter, prefix token ids) -> prefill한 KV cache LRU
+    - 꺼낼 때는 복사본을 반환 (generate가 cache를 이어 쓰므로 원본은 보존)
+    """
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        cache = self.entries.get(key)
+        if cache is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return copy.deepcopy(cache)
+
+    def put(self, key: tuple, cache):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = cache
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def drop_adapter(self, adapter_name: str):
+        for key in [key for key in self.entries if key[0] == adapter_name]:
+            del self.entries[key]
+
+
+class CPUEngine:
+    """
+    CPU 생성 엔진
+    - generate(): AdapterBatcher의 generate_fn, prompts는 프롬프트 문자열 또는 (프롬프트, 공통 prefix) 튜플
+    - stream(): TextIteratorStreamer로 생성되는 대로 텍스트 조각을 yield
+    - torch 모델 호출은 한 번에 하나씩 (adapter 전환이 모델 전역 상태이므로 락으로 직렬화)
+    """
+    def __init__(self, model_path: str, quantization: str = "none", num_threads: Optional[int] = None,
+                 prefix_cache_size: int = 8, min_prefix_tokens: int = 32):
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        self.torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.quantization = quantization
+        self.min_prefix_tokens = min_prefix_tokens
+        self.prefix_cache = PrefixKVCache(prefix_cache_size)
+        self._lock = threading.Lock()
+        self._loaded = set()  # PEFT에 올린 adapter 이름
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+        # 배치 생성 시 프롬프트 끝이 맞도록 왼쪽에 padding
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        dtype = torch.bfloat16 if quantization == "bf16" else torch.float32
+        self.model = AutoModelForCausalLM.from_pretrained(
+            model_path, torch_dtype=dtype, low_cpu_mem_usage=True, trust_remote_code=True
+        )
+        self.model.eval()
+        self.quantized = False
+
+    def load_adapters(self, lora_requests: List[CPULoRARequest]):
+        """adapter를 PEFT 모델에 올림 (int8 모드는 이후 양자화하므로 시작 시 모두 올려야 함)"""
+        with self._lock:
+            for lora_request in lora_requests:
+                self._ensure_adapter(lora_request)
+
+    def quantize(self):
+        """nn.Linear를 int8 dynamic quantization (adapter를 모두 올린 뒤 호출)"""
+        with self._lock:
+            self.model = self.torch.ao.quantization.quantize_dynamic(
+                self.model, {self.torch.nn.Linear}, dtype=self.torch.qint8
+            )
+            self.quantized = True
+
+    def _ensure_adapter(self, lora_request: Optional[CPULoRARequest]):
+        if lora_request is None:
+            return
+        name = lora_request.adapter_name
+        if name in self._loaded:
+            return
+        if self.quantized:
+            raise ValueError(f"int8 양자화 모델에는 실행 중 adapter를 추가할 수 없습니다: {name}")
+        if not self._loaded:
+            from peft import PeftModel
+            self.model = PeftModel.from_pretrained(self.model, lora_request.lora_path, adapter_name=name)
+            self.model.eval()
+        else:
+            self.model.load_adapter(lora_request.lora_path, adapter_name=name)
+        self._loaded.add(name)
+
+    def _activate(self, lora_request: Optional[CPULoRARequest]):
+        self._ensure_adapter(lora_request)
+        if lora_request is not None:
+            self.model.set_adapter(lora_request.adapter_name)
+
+    def remove_adapter(self, lora_int_id: int):
+        """교체/제거된 adapter 버전을 PEFT 모델과 prefix cache에서 내림"""
+        with self._lock:
+            for name in [name for name in self._loaded if name.endswith(f"-{lora_int_id}")]:
+                if not self.quantized and len(self._loaded) > 1:
+                    self.model.delete_adapter(name)
+                    self._loaded.discard(name)
+                self.prefix_cache.drop_adapter(name)
+
+    def _generate_kwargs(self, sampling_params: CPUSamplingParams, deadline: Optional[float],
+                         cancel: Optional[threading.Event] = None) -> dict:
+        from transformers import StoppingCriteria, StoppingCriteriaList
+
+        kwargs = {
+            "max_new_tokens": sampling_params.max_tokens,
+            "num_return_sequences": sampling_params.n,
+            "pad_token_id": self.tokenizer.pad_token_id,
+        }
+        if sampling_params.temperature and sampling_params.temperature > 0:
+            kwargs.update(do_sample=True, temperature=sampling_params.temperature, top_p=sampling_params.top_p)
+        else:
+            kwargs.update(do_sample=False)
+        if sampling_params.stop:
+            kwargs.update(stop_strings=sampling_params.stop, tokenizer=self.tokenizer)
+        criteria = []
+        if deadline is not None:
+            class _DeadlineCriteria(StoppingCriteria):
+                # 마감 시각이 지나면 다음 토큰부터 생성 중단 (중단 여부는 fired로 확인)
+                fired = False
+
+                def __call__(self, input_ids, scores, **_):
+                    self.fired = self.fired or time.time() >= deadline
+                    return self.fired
+            criteria.append(_DeadlineCriteria())
+        if cancel is not None:
+            class _CancelCriteria(StoppingCriteria):
+                # 스트림 소비자가 떠나면 다음 토큰부터 생성 중단
+                def __call__(self, input_ids, scores, **_):
+                    return cancel.is_set()
+            criteria.append(_CancelCriteria())
+        if criteria:
+            kwargs["stopping_criteria"] = StoppingCriteriaList(criteria)
+        return kwargs
+
+    @staticmethod
+    def _check_deadline_stop(kwargs: dict, message: str):
+        """마감 시각 때문에 생성이 중간에 멈췄으면 잘린 결과 대신 DeadlineExceededError"""
+        if any(getattr(criteria, "fired", False) for criteria in kwargs.get("stopping_criteria", [])):
+            raise DeadlineExceededError(message)
+
+    def _prefix_cache_for(self, adapter_name: str, input_ids, prefix: Optional[str]):
+        """프롬프트가 공통 prefix로 시작하면 prefix까지 prefill한 KV cache(복사본)를 반환"""
+        if not prefix or self.prefix_cache.max_entries <= 0:
+            return None
+        prefix_ids = self.tokenizer(prefix, add_special_tokens=False, return_tensors="pt")["input_ids"]
+        length = prefix_ids.shape[1]
+        # 전체 프롬프트보다 짧아야 generate가 나머지 토큰을 이어서 prefill 할 수 있음
+        if length < self.min_prefix_tokens or length >= input_ids.shape[1]:
+            return None
+        if not self.torch.equal(input_ids[0, :length], prefix_ids[0]):
+            return None  # 토큰 경계가 달라 prefix로 재사용할 수 없음
+        key = (adapter_name, tuple(prefix_ids[0].tolist()))
+        cache = self.prefix_cache.get(key)
+        if cache is None:
+            from transformers import DynamicCache
+            cache = DynamicCache()
+            self.model(input_ids=prefix_ids, past_key_values=cache, use_cache=True)
+            self.prefix_cache.put(key, cache)
+            cache = copy.deepcopy(cache)
+        return cache
+
+    def generate(self, prompts, sampling_params: CPUSamplingParams, lora_request: Optional[CPULoRARequest] = None) -> List[RequestOutput]:
+        """
+        프롬프트들을 한 번의 generate로 생성
+        - 마감 시각은 contextvar에서 읽음 (AdapterBatcher 스레드에서는 묶음의 마감 시각이 설정됨)
+        Raises:
+            DeadlineExceededError: 생성 도중 마감 시각이 지나 결과가 잘린 경우
+        """
+        if not isinstance(prompts, list):
+            prompts = [prompts]
+        items = [prompt if isinstance(prompt, tuple) else (prompt, None) for prompt in prompts]
+        deadline = get_deadline()
+        with self._lock, self.torch.inference_mode():
+            self._activate(lora_request)
+            inputs = self.tokenizer([text for text, _ in items], return_tensors="pt", padding=True, add_special_tokens=False)
+            kwargs = self._generate_kwargs(sampling_params, deadline)
+            # prefix cache는 padding이 없는 단일 프롬프트에만 적용
+            if len(items) == 1 and sampling_params.n == 1:
+                adapter_name = lora_request.adapter_name if lora_request else "base"
+                cache = self._prefix_cache_for(adapter_name, inputs["input_ids"], items[0][1])
+                if cache is not None:
+                    kwargs["past_key_values"] = cache
+            sequences = self.model.generate(**inputs, **kwargs)
+        self._check_deadline_stop(kwargs, "deadline exceeded during generation")
+
+        prompt_length = inputs["input_ids"].shape[1]
+        outputs = []
+        for idx in range(len(items)):
+            completions = []
+            for seq in sequences[idx * sampling_params.n:(idx + 1) * sampling_params.n]:
+                token_ids = [t for t in seq[prompt_length:].tolist() if t != self.tokenizer.pad_token_id]
+                text = self.tokenizer.decode(token_ids, skip_special_tokens=True)
+                completions.append(CompletionOutput(truncate_at_stop(text, sampling_params.stop), token_ids))
+            outputs.append(RequestOutput(completions))
+        return outputs
+
+    def stream(self, prompt: str, sampling_params: CPUSamplingParams, lora_request: Optional[CPULoRARequest] = None) -> Iterator[str]:
+        """
+        생성되는 대로 텍스트 조각을 yield (stop 문자열이 나오면 그 앞까지만)
+        Raises:
+            DeadlineExceededError: 생성 도중 요청 마감 시각이 지난 경우
+        """
+        from transformers import TextIteratorStreamer
+
+        deadline = get_deadline()
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+        cancel = threading.Event()
+        kwargs = self._generate_kwargs(sampling_params, deadline, cancel)
+
+        def run():
+            try:
+                with self._lock, self.torch.inference_mode():
+                    self._activate(lora_request)
+                    inputs = self.tokenizer(prompt, return_tensors="pt", add_special_tokens=False)
+                    self.model.generate(**inputs, streamer=streamer, **kwargs)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=run, name="cpu-stream", daemon=True)
+        thread.start()
+        text = ""
+        try:
+            for chunk in streamer:
+                emitted = len(truncate_at_stop(text, sampling_params.stop))
+                text += chunk
+                visible = truncate_at_stop(text, sampling_params.stop)
+                if len(visible) > emitted:
+                    yield visible[emitted:]
+                if len(visible) < len(text):
+                    break  # stop 문자열이 나옴
+        finally:
+            # 정상 종료 외에 소비자가 close()한 경우(GeneratorExit)에도 generate를 멈춰 락을 놓게 함
+            cancel.set()
+        thread.join()
+        if errors:
+            raise errors[0]
+        self._check_deadline_stop(kwargs, "deadline exceeded during streaming")
+
+
+def create_cpu_engine(model_path: str) -> CPUEngine:
+    """
+    환경변수로 CPU 엔진 생성
+    - CPU_NUM_THREADS: torch intra-op 스레드 수 (기본값: torch 기본값)
+    - CPU_QUANTIZATION: none / bf16 / int8
+    - CPU_PREFIX_CACHE_SIZE: 보관할 공통 prefix KV cache 수 (0이면 비활성화)
+    - CPU_PREFIX_MIN_TOKENS: prefix cache를 적용할 최소 prefix 길이(토큰)
+    """
+    num_threads = os.getenv("CPU_NUM_THREADS")
+    return CPUEngine(
+        model_path,
+        quantization=os.getenv("CPU_QUANTIZATION", "none").lower(),
+        num_threads=int(num_threads) if num_threads else None,
+        prefix_cache_size=int(os.getenv("CPU_PREFIX_CACHE_SIZE", "8")),
+        min_prefix_tokens=int(os.getenv("CPU_PREFIX_MIN_TOKENS", "32"))
+    )
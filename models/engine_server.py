@@ -0,0 +1,294 @@
+"""
+모델 엔진 워커 프로세스
+
+하나의 프로세스가 ModelLoader(GCP vLLM 엔진 등)를 소유하고, ZeroMQ ROUTER 소켓으로
+generate / candidates / batch / stream / abort 요청을 받는다.
+여러 uvicorn 워커가 `--mode remote`(RemoteModelLoader)로 이 워커에 접속하여 하나의 엔진을 공유한다.
+
+실행 예시:
+    python -m models.engine_server --mode gcp-prod --address ipc:///tmp/tenten-engine.sock
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+import msgspec
+import zmq
+import zmq.asyncio
+
+from core.request_context import reset_deadline, set_deadline
+from models.model_loader import ModelLoader
+
+
+class EngineServer:
+    def __init__(self, model: ModelLoader, address: str, batch_window_ms: int = 10, max_batch_size: int = 16, max_streams: int = 8):
+        self.model = model
+        self.address = address
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.encoder = msgspec.msgpack.Encoder()
+        self.decoder = msgspec.msgpack.Decoder()
+        self.context = zmq.asyncio.Context.instance()
+        self.socket = None
+        # 엔진 호출은 단일 스레드에서 직렬로 실행 (vLLM LLM 객체는 스레드 안전하지 않음)
+        self.engine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+        # stream은 끝날 때까지 스레드를 점유하므로 별도 풀에서 실행해 batch 실행을 막지 않음
+        # (stream 안의 엔진 호출은 loader의 generate lock / AdapterBatcher가 직렬화)
+        self.stream_executor = ThreadPoolExecutor(max_workers=max_streams, thread_name_prefix="engine-stream")
+        self.pending: asyncio.Queue = None
+        self.pending_ids = set()  # 대기 중이거나 batch로 실행 중인 generate request id
+        self.aborted = set()  # 중단 요청된 request id (pending_ids에 있는 요청만 기록)
+        self.stream_cancel_events = {}  # stream request id -> threading.Event
+
+    async def _reply(self, identity, request_id, reply_type, data=None, error=None):
+        await self.socket.send_multipart([identity, self.encoder.encode({
+            "id": request_id,
+            "type": reply_type,
+            "data": data,
+            "error": error
+        })])
+
+    def _info(self):
+        loader = self.model.loader
+        return {
+            "mode": self.model.mode,
+            "model_path": loader.model_path,
+            "temperature": loader.temperature,
+            "top_p": loader.top_p,
+            "max_tokens": loader.max_tokens,
+            "stop": loader.stop
+        }
+
+    async def _batch_loop(self):
+        """
+        대기 중인 generate 요청을 batch_window 동안 모아 adapter 별로 한 번에 엔진에 전달
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.pending.get()]
+            deadline = loop.time() + self.batch_window
+            while len(items) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.pending.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # 대기 중에 중단되었거나 마감 시각이 지난 요청은 엔진에 보내지 않음
+            live_items = []
+            for identity, request in items:
+                if request["id"] in self.aborted:
+                    self._finish(request["id"])
+                    await self._reply(identity, request["id"], "error", error="aborted")
+                elif self._expired(request):
+                    self._finish(request["id"])
+                    await self._reply(identity, request["id"], "error", error="deadline exceeded")
+                else:
+                    live_items.append((identity, request))
+
+            groups = {}
+            for identity, request in live_items:
+                groups.setdefault(request.get("adapter_type", "youtube_summary"), []).append((identity, request))
+
+            for adapter_type, group in groups.items():
+                started = time.time()
+                # 묶음의 마감 시각은 가장 늦은 요청 기준 (마감 없는 요청이 있으면 없음, AdapterBatcher와 동일)
+                deadlines = [request.get("deadline") for _, request in group]
+                responses = await loop.run_in_executor(
+                    self.engine_executor,
+                    self._with_deadline,
+                    None if None in deadlines else max(deadlines),
+                    self.model.get_batch_responses,
+                    [request["messages"] for _, request in group],
+                    None,
+                    "engine-batch",
+                    adapter_type
+                )
+                print(f"[engine] batch adapter={adapter_type} size={len(group)} time={time.time() - started:.3f}s")
+                for (identity, request), response in zip(group, responses):
+                    aborted = request["id"] in self.aborted
+                    self._finish(request["id"])
+                    if not aborted:
+                        await self._reply(identity, request["id"], "result", data=response)
+
+    def _finish(self, request_id):
+        """generate 요청 처리가 끝나면 추적 중인 id 정리"""
+        self.pending_ids.discard(request_id)
+        self.aborted.discard(request_id)
+
+    @staticmethod
+    def _with_deadline(deadline, fn, *args, **kwargs):
+        """
+        요청의 마감 시각을 contextvar에 설정한 채로 fn 실행
+        - run_in_executor는 contextvar를 복사하지 않으므로 executor 스레드 안에서 설정해야 함
+        """
+        token = set_deadline(deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            reset_deadline(token)
+
+    async def _handle_candidates(self, identity, request):
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.engine_executor,
+            lambda: self._with_deadline(
+                request.get("deadline"),
+                self.model.get_candidates,
+                request["messages"], None, n=request.get("n", 1),
+                name=request.get("name", "engine-inference"),
+                adapter_type=request.get("adapter_type", "youtube_summary")
+            )
+        )
+        await self._reply(identity, request["id"], "result", data=response)
+
+    async def _handle_batch(self, identity, request):
+        loop = asyncio.get_running_loop()
+        responses = await loop.run_in_executor(
+            self.engine_executor,
+            self._with_deadline,
+            request.get("deadline"),
+            self.model.get_batch_responses,
+            request["messages_list"],
+            None,
+            request.get("name", "engine-inference"),
+            request.get("adapter_type", "youtube_summary")
+        )
+        await self._reply(identity, request["id"], "result", data=responses)
+
+    async def _handle_stream(self, identity, request):
+        loop = asyncio.get_running_loop()
+        request_id = request["id"]
+        queue: asyncio.Queue = asyncio.Queue()
+        cancel_event = threading.Event()
+        self.stream_cancel_events[request_id] = cancel_event
+
+        def run():
+            token = set_deadline(request.get("deadline"))
+            try:
+                for chunk in self.model.stream_response(
+                    request["messages"], None,
+                    name=request.get("name", "engine-inference"),
+                    adapter_type=request.get("adapter_type", "youtube_summary")
+                ):
+                    if cancel_event.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, ("chunk", chunk))
+                loop.call_soon_threadsafe(queue.put_nowait, ("end", None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, ("error", str(e)))
+            finally:
+                reset_deadline(token)
+
+        future = loop.run_in_executor(self.stream_executor, run)
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if cancel_event.is_set():
+                    break
+                if kind == "chunk":
+                    await self._reply(identity, request_id, "chunk", data=payload)
+                elif kind == "end":
+                    await self._reply(identity, request_id, "end")
+                    break
+                else:
+                    await self._reply(identity, request_id, "error", error=payload)
+                    break
+            await future
+        finally:
+            self.stream_cancel_events.pop(request_id, None)
+
+    @staticmethod
+    def _expired(request) -> bool:
+        deadline = request.get("deadline")
+        return deadline is not None and deadline <= time.time()
+
+    async def _dispatch(self, identity, request):
+        op = request.get("op")
+        try:
+            if op in ("generate", "candidates", "batch", "stream") and self._expired(request):
+                await self._reply(identity, request["id"], "error", error="deadline exceeded")
+            elif op == "info":
+                await self._reply(identity, request["id"], "result", data=self._info())
+            elif op == "generate":
+                self.pending_ids.add(request["id"])
+                await self.pending.put((identity, request))
+            elif op == "candidates":
+                await self._handle_candidates(identity, request)
+            elif op == "batch":
+                await self._handle_batch(identity, request)
+            elif op == "stream":
+                await self._handle_stream(identity, request)
+            elif op == "abort":
+                target = request.get("target")
+                cancel_event = self.stream_cancel_events.get(target)
+                if cancel_event:
+                    cancel_event.set()
+                elif target in self.pending_ids:
+                    self.aborted.add(target)
+                # 이미 끝났거나 모르는 요청의 abort는 무시 (기록해 두면 지워지지 않고 쌓임)
+            else:
+                await self._reply(identity, request.get("id"), "error", error=f"Unknown op: {op}")
+        except Exception as e:
+            print(f"[engine] {op} 처리 실패: {e}")
+            await self._reply(identity, request.get("id"), "error", error=str(e))
+
+    async def serve(self):
+        self.pending = asyncio.Queue()
+        self.socket = self.context.socket(zmq.ROUTER)
+        self.socket.bind(self.address)
+        print(f"엔진 워커 대기 중: {self.address}")
+
+        batch_task = asyncio.create_task(self._batch_loop())
+        tasks = set()
+        try:
+            while True:
+                identity, payload = await self.socket.recv_multipart()
+                request = self.decoder.decode(payload)
+                task = asyncio.create_task(self._dispatch(identity, request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            batch_task.cancel()
+            self.socket.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="텐텐 모델 엔진 워커")
+    parser.add_argument(
+        "--mode",
+        choices=["colab", "gcp-dev", "gcp-prod", "api-dev", "api-prod", "cpu"],
+        default="gcp-prod",
+        help="엔진 워커가 소유할 ModelLoader 모드"
+    )
+    parser.add_argument(
+        "--address",
+        default=os.getenv("ENGINE_ADDRESS", "ipc:///tmp/tenten-engine.sock"),
+        help="ZeroMQ bind 주소 (예: ipc:///tmp/tenten-engine.sock, tcp://0.0.0.0:5555)"
+    )
+    parser.add_argument("--batch-window-ms", type=int, default=10, help="generate 요청을 모으는 대기 시간(ms)")
+    parser.add_argument("--max-batch-size", type=int, default=16, help="한 번에 엔진에 전달할 최대 요청 수")
+    parser.add_argument("--max-streams", type=int, default=8, help="동시에 처리할 최대 stream 요청 수")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ["LLM_MODE"] = args.mode
+    server = EngineServer(
+        ModelLoader(mode=args.mode),
+        args.address,
+        batch_window_ms=args.batch_window_ms,
+        max_batch_size=args.max_batch_size,
+        max_streams=args.max_streams
+    )
+    asyncio.run(server.serve())
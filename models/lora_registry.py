@@ -0,0 +1,250 @@
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from core.metrics import LORA_ADAPTER_LOAD_SECONDS, LORA_ADAPTER_REQUESTS
+
+# LORA_ADAPTERS_CONFIG가 없을 때 사용하는 기본 adapter 정의
+DEFAULT_ADAPTERS = [
+    {"adapter_type": "youtube_summary", "lora_name": "article_summary", "path": "KakaoBase/HyperCLOVAX-SEED-article-summary-LoRA-v1.0"},
+    {"adapter_type": "social_bot", "lora_name": "sns_chat", "path": "KakaoBase/HyperCLOVAX-SEED-SNS-chat-LoRA-v1.0"},
+]
+
+_WEIGHT_FILES = ("adapter_model.safetensors", "adapter_model.bin")
+
+
+def download_adapter(path: str, revision: Optional[str] = None) -> str:
+    """로컬 디렉터리면 그대로, 아니면 Hub에서 받아 로컬 경로를 반환"""
+    if os.path.isdir(path):
+        return path
+    from huggingface_hub import snapshot_download
+    return snapshot_download(repo_id=path, revision=revision, token=os.getenv("HF_TOKEN"))
+
+
+def validate_adapter(local_path: str):
+    """adapter_config.json과 가중치 파일이 있는지 확인 (없으면 ValueError)"""
+    config_path = os.path.join(local_path, "adapter_config.json")
+    if not os.path.exists(config_path):
+        raise ValueError(f"adapter_config.json not found: {local_path}")
+    with open(config_path, "r", encoding="utf-8") as f:
+        json.load(f)
+    if not any(os.path.exists(os.path.join(local_path, name)) for name in _WEIGHT_FILES):
+        raise ValueError(f"adapter weights not found: {local_path}")
+
+
+class _AdapterVersion:
+    __slots__ = ("adapter_type", "spec", "lora_request", "local_path", "load_seconds", "loaded_at", "in_flight", "requests")
+
+    def __init__(self, adapter_type: str, spec: dict, lora_request, local_path: str, load_seconds: float):
+        self.adapter_type = adapter_type
+        self.spec = spec
+        self.lora_request = lora_request
+        self.local_path = local_path
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.in_flight = 0
+        self.requests = 0
+
+    def info(self) -> dict:
+        return {
+            "adapter_type": self.adapter_type,
+            "lora_name": self.spec["lora_name"],
+            "lora_int_id": self.lora_request.lora_int_id,
+            "path": self.spec["path"],
+            "revision": self.spec.get("revision"),
+            "local_path": self.local_path,
+            "load_seconds": round(self.load_seconds, 3),
+            "loaded_at": self.loaded_at,
+            "in_flight": self.in_flight,
+            "requests": self.requests
+        }
+
+
+class LoRARegistry:
+    """
+    런타임 LoRA adapter 레지스트리
+    - adapter 정의(adapter_type -> lora_name/path/revision)를 설정에서 읽고, 시작 시 가중치를 병렬로 받아 검증
+    - 실행 중 추가/제거/버전 교체 지원 (교체 시 새 버전에 새 lora_int_id를 부여해 엔진 캐시와 섞이지 않게 함)
+    - 제거/교체된 버전은 진행 중인 요청이 끝날 때까지 기다린 뒤(draining) 엔진에서 내림
+    """
+    def __init__(self, request_factory: Callable, unload_fn: Optional[Callable[[int], None]] = None,
+                 download_fn: Callable = download_adapter, validate_fn: Callable = validate_adapter,
+                 max_workers: int = 4, drain_timeout: float = 60):
+        self.request_factory = request_factory  # (lora_name, lora_int_id, lora_path) -> LoRARequest
+        self.unload_fn = unload_fn
+        self.download_fn = download_fn
+        self.validate_fn = validate_fn
+        self.max_workers = max_workers
+        self.drain_timeout = drain_timeout
+        self.adapters: Dict[str, _AdapterVersion] = {}
+        self.draining: List[_AdapterVersion] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Condition()
+        self._admin_lock = threading.Lock()  # 추가/제거/교체는 한 번에 하나씩
+
+    def _prepare(self, spec: dict) -> _AdapterVersion:
+        """가중치를 받아 검증하고 새 lora_int_id로 버전을 생성"""
+        adapter_type = spec["adapter_type"]
+        start = time.perf_counter()
+        try:
+            local_path = self.download_fn(spec["path"], spec.get("revision"))
+            self.validate_fn(local_path)
+        except Exception:
+            LORA_ADAPTER_LOAD_SECONDS.labels(adapter=adapter_type, result="error").observe(time.perf_counter() - start)
+            raise
+        load_seconds = time.perf_counter() - start
+        LORA_ADAPTER_LOAD_SECONDS.labels(adapter=adapter_type, result="success").observe(load_seconds)
+        with self._lock:
+            lora_int_id = next(self._ids)
+        lora_request = self.request_factory(spec["lora_name"], lora_int_id, local_path)
+        return _AdapterVersion(adapter_type, spec, lora_request, local_path, load_seconds)
+
+    def preload(self, specs: List[dict]):
+        """
+        adapter 정의들을 병렬로 받아 검증한 뒤 등록
+        Raises:
+            하나라도 실패하면 첫 번째 예외 (서버 시작 시 잘못된 설정을 바로 드러내기 위함)
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(specs)))) as executor:
+            versions = list(executor.map(self._prepare, specs))
+        with self._lock:
+            for version in versions:
+                self.adapters[version.adapter_type] = version
+        print("🔧 사용 가능한 LoRA 어댑터:")
+        for version in versions:
+            print(f"  - {version.adapter_type}: {version.spec['lora_name']} (ID: {version.lora_request.lora_int_id}, {version.load_seconds:.2f}s)")
+
+    def get(self, adapter_type: str):
+        version = self.adapters.get(adapter_type)
+        return version.lora_request if version else None
+
+    def version_key(self, adapter_type: str) -> Optional[str]:
+        """
+        adapter_type의 현재 버전 식별자 (응답 캐시 key용, 등록되지 않았으면 None)
+        - 재시작해도 같은 값이 되도록 프로세스마다 달라지는 lora_int_id 대신 adapter 정의(이름/경로/revision)를 사용
+        """
+        version = self.adapters.get(adapter_type)
+        if version is None:
+            return None
+        return f"{version.spec['lora_name']}:{version.spec['path']}@{version.spec.get('revision') or 'main'}"
+
+    @contextmanager
+    def use(self, adapter_type: str):
+        """
+        adapter_type의 현재 버전 LoRARequest를 사용 (사용 중에는 교체/제거되어도 엔진에서 내리지 않음)
+        Raises:
+            ValueError: 등록되지 않은 adapter_type
+        """
+        with self._lock:
+            version = self.adapters.get(adapter_type)
+            if version is None:
+                raise ValueError(f"Unknown adapter type: {adapter_type}")
+            version.in_flight += 1
+            version.requests += 1
+        LORA_ADAPTER_REQUESTS.labels(adapter=adapter_type).inc()
+        try:
+            yield version.lora_request
+        finally:
+            with self._lock:
+                version.in_flight -= 1
+                self._lock.notify_all()
+
+    def _retire(self, version: _AdapterVersion, drain_timeout: Optional[float]) -> bool:
+        """진행 중인 요청이 끝나길 기다린 뒤 엔진에서 내림, 시간 안에 끝나면 True"""
+        timeout = self.drain_timeout if drain_timeout is None else drain_timeout
+        with self._lock:
+            self.draining.append(version)
+            drained = self._lock.wait_for(lambda: version.in_flight == 0, timeout=timeout)
+            self.draining.remove(version)
+        if self.unload_fn:
+            try:
+                self.unload_fn(version.lora_request.lora_int_id)
+            except Exception as e:
+                print(f"LoRA adapter unload 실패 ({version.adapter_type}, ID: {version.lora_request.lora_int_id}): {e}")
+        return drained
+
+    def add(self, spec: dict) -> dict:
+        """
+        새 adapter_type 등록
+        Raises:
+            ValueError: 이미 등록된 adapter_type이거나 가중치 검증 실패
+        """
+        with self._admin_lock:
+            if spec["adapter_type"] in self.adapters:
+                raise ValueError(f"Adapter already registered: {spec['adapter_type']}")
+            version = self._prepare(spec)
+            with self._lock:
+                self.adapters[version.adapter_type] = version
+            return version.info()
+
+    def swap(self, spec: dict, drain_timeout: Optional[float] = None) -> dict:
+        """
+        새 버전을 받아 검증한 뒤 교체하고, 이전 버전은 draining 후 내림
+        Raises:
+            ValueError: 등록되지 않은 adapter_type이거나 가중치 검증 실패 (이 경우 이전 버전 유지)
+        """
+        with self._admin_lock:
+            if spec["adapter_type"] not in self.adapters:
+                raise ValueError(f"Unknown adapter type: {spec['adapter_type']}")
+            version = self._prepare(spec)
+            with self._lock:
+                previous = self.adapters[version.adapter_type]
+                self.adapters[version.adapter_type] = version
+            drained = self._retire(previous, drain_timeout)
+            return {**version.info(), "previous": previous.info(), "drained": drained}
+
+    def remove(self, adapter_type: str, drain_timeout: Optional[float] = None) -> dict:
+        """
+        adapter_type 등록 해제 (새 요청은 바로 거절, 진행 중인 요청은 draining 후 내림)
+        Raises:
+            ValueError: 등록되지 않은 adapter_type
+        """
+        with self._admin_lock:
+            with self._lock:
+                previous = self.adapters.pop(adapter_type, None)
+            if previous is None:
+                raise ValueError(f"Unknown adapter type: {adapter_type}")
+            drained = self._retire(previous, drain_timeout)
+            return {**previous.info(), "drained": drained}
+
+    def list_adapters(self) -> dict:
+        with self._lock:
+            return {
+                "adapters": [version.info() for version in self.adapters.values()],
+                "draining": [version.info() for version in self.draining]
+            }
+
+
+def load_adapter_specs() -> List[dict]:
+    """
+    LORA_ADAPTERS_CONFIG(JSON 파일)의 adapter 정의 목록, 지정하지 않으면 기본 adapter
+    - 형식: {"adapters": [{"adapter_type": ..., "lora_name": ..., "path": ..., "revision": ...}]}
+    """
+    config_path = os.getenv("LORA_ADAPTERS_CONFIG")
+    if not config_path:
+        return [dict(spec) for spec in DEFAULT_ADAPTERS]
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)["adapters"]
+
+
+def create_lora_registry(request_factory: Callable, unload_fn: Optional[Callable[[int], None]] = None,
+                         download_fn: Callable = download_adapter) -> LoRARegistry:
+    """
+    adapter 정의를 읽어 가중치를 미리 받은 레지스트리를 생성
+    - LORA_PREFETCH_WORKERS: 병렬 다운로드 수
+    - LORA_DRAIN_TIMEOUT: 교체/제거 시 진행 중인 요청을 기다리는 최대 시간(초)
+    """
+    registry = LoRARegistry(
+        request_factory,
+        unload_fn=unload_fn,
+        download_fn=download_fn,
+        max_workers=int(os.getenv("LORA_PREFETCH_WORKERS", "4")),
+        drain_timeout=float(os.getenv("LORA_DRAIN_TIMEOUT", "60"))
+    )
+    registry.preload(load_adapter_specs())
+    return registry
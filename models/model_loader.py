@@ -1,16 +1,73 @@
 import requests
-import os, time
+import os, time, uuid, threading, asyncio, contextvars
 from dotenv import load_dotenv
 from utils.logger import log_inference_to_langfuse
-from vllm.lora.request import LoRARequest
-from openai import OpenAI
+from core.cache import create_completion_cache
+from models.adapter_batcher import create_adapter_batcher
+from models.lora_registry import create_lora_registry, download_adapter, load_adapter_specs
+from models.artifacts import create_artifact_manager, enable_offline_mode
+from core.request_context import get_deadline, is_expired, min_timeout
+from utils.error_handler import DeadlineExceededError
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 
 class BaseModelLoader(ABC):
     @abstractmethod
     def get_response(self, messages, trace, start_time=None, prompt=None, name="vllm-inference", adapter_type="youtube_summary"):
         pass
 
+    def get_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="vllm-inference", adapter_type="youtube_summary"):
+        """
+        동일한 messages로 n개의 후보 응답을 생성
+        - 기본 구현은 get_response를 n번 동시에 호출 (API 백엔드용)
+        Returns:
+            {"status_code": ..., "url": ..., "contents": [후보1, 후보2, ...]}
+        """
+        with ThreadPoolExecutor(max_workers=max(n, 1)) as executor:
+            # 요청 마감 시각(contextvar)이 워커 스레드에도 전달되도록 컨텍스트를 복사해 실행
+            futures = [
+                executor.submit(contextvars.copy_context().run, self.get_response, messages, trace, start_time, prompt, name, adapter_type)
+                for _ in range(n)
+            ]
+            responses = [future.result() for future in futures]
+
+        contents = [r["content"] for r in responses if r.get("status_code") == 200 and r.get("content") is not None]
+        if not contents:
+            # 모든 호출이 실패한 경우 첫 번째 에러 응답을 그대로 전달
+            return {**responses[0], "contents": []}
+        return {
+            "status_code": 200,
+            "url": responses[0].get("url"),
+            "contents": contents
+        }
+
+    def get_batch_responses(self, messages_list, trace, name="vllm-inference", adapter_type="youtube_summary"):
+        """
+        여러 요청의 messages를 한 번에 처리
+        - 기본 구현은 get_response를 동시에 호출 (API 백엔드용)
+        Returns:
+            messages_list와 같은 순서의 응답 dict 리스트
+        """
+        if not messages_list:
+            return []
+        with ThreadPoolExecutor(max_workers=len(messages_list)) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self.get_response, messages, trace, None, None, name, adapter_type)
+                for messages in messages_list
+            ]
+            return [future.result() for future in futures]
+
+    def stream_response(self, messages, trace, name="vllm-inference", adapter_type="youtube_summary"):
+        """
+        응답을 조각 단위로 yield
+        - 기본 구현은 토큰 스트리밍을 지원하지 않는 백엔드용으로, 전체 응답을 한 번에 yield
+        """
+        response = self.get_response(messages, trace, None, None, name, adapter_type)
+        if response.get("status_code") != 200:
+            raise RuntimeError(response.get("error", "inference failed"))
+        yield response.get("content", "")
+
 class ColabModelLoader(BaseModelLoader):
     def __init__(self, model_path, temperature, top_p, max_tokens, stop, headers):
         self.model_path = model_path
@@ -32,11 +89,15 @@ class ColabModelLoader(BaseModelLoader):
         load_dotenv(override=True)
         base_url = os.getenv('MODEL_NGROK_URL')
 
-        self.data["messages"] = messages
+        # 동시 호출(get_candidates) 시 공유 payload가 덮어써지지 않도록 복사본 사용
+        data = {**self.data, "messages": messages}
         url = f"{base_url}/v1/chat/completions"
 
         start_time = time.time()
-        response = requests.post(url, headers=self.headers, json=self.data)
+        try:
+            response = requests.post(url, headers=self.headers, json=data, timeout=min_timeout(None))
+        except requests.Timeout:
+            return {"status_code": 504, "url": url, "error": "deadline exceeded"}
         end_time = time.time()
         print(f"response time : {(end_time - start_time):.3f}")
 
@@ -59,10 +120,29 @@ class ColabModelLoader(BaseModelLoader):
         }
 
 
+def prepare_artifacts(model_path):
+    """
+    MODEL_CACHE_DIR가 있으면 base 모델과 설정된 LoRA adapter를 로컬 캐시에 병렬로 받아 검증
+    Returns:
+        (ArtifactManager 또는 None, 엔진에 넘길 base 모델 경로, adapter 다운로드 함수)
+    """
+    artifacts = create_artifact_manager()
+    if not artifacts:
+        return None, model_path, download_adapter
+    specs = [{"repo_id": model_path}] + [
+        {"repo_id": spec["path"], "revision": spec.get("revision")} for spec in load_adapter_specs()
+    ]
+    model_source = artifacts.prefetch(specs)[model_path]
+    if os.getenv("MODEL_CACHE_OFFLINE", "true").lower() == "true":
+        enable_offline_mode()
+    return artifacts, model_source, artifacts.fetch
+
+
 class GCPModelLoader(BaseModelLoader):
     def __init__(self, mode, model_path, temperature, top_p, max_tokens, stop, tensor_parallel_size, max_model_len, gpu_memory_utilization, max_num_seqs, max_num_batched_tokens):
+        # GPU 라이브러리(torch/vLLM)는 gcp 모드에서만 import
         from vllm import LLM, SamplingParams
-        from transformers import AutoTokenizer
+        from vllm.lora.request import LoRARequest
 
         self.mode = mode
         self.model_path = model_path
@@ -81,10 +161,18 @@ class GCPModelLoader(BaseModelLoader):
             os.environ['HF_TOKEN'] = hf_token
             os.environ['HUGGING_FACE_HUB_TOKEN'] = hf_token
 
+        # MODEL_CACHE_DIR가 있으면 base 모델/tokenizer와 LoRA adapter를 로컬 캐시에 병렬로 받아 검증한 뒤 offline으로 로딩
+        self.artifacts, model_source, adapter_download = prepare_artifacts(self.model_path)
+
+        # 설정(LORA_ADAPTERS_CONFIG)의 LoRA adapter 가중치를 엔진 로딩과 동시에 병렬로 받아 검증 (실행 중 추가/제거/교체 지원)
+        lora_prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lora-prefetch")
+        lora_registry_future = lora_prefetch.submit(create_lora_registry, LoRARequest, self._remove_lora, adapter_download)
+
+        self.max_loras = 2
         self.model_vllm = LLM(
-            model=self.model_path,
+            model=model_source,
             enable_lora=True,
-            max_loras=2,
+            max_loras=self.max_loras,
             dtype="half",
             trust_remote_code=True,
             tensor_parallel_size=tensor_parallel_size,
@@ -94,33 +182,47 @@ class GCPModelLoader(BaseModelLoader):
             max_num_batched_tokens=max_num_batched_tokens
         )
 
+        # vLLM LLM 객체는 스레드 안전하지 않으므로 여러 스레드의 generate 호출을 직렬화
+        self._generate_lock = threading.Lock()
+        # 여러 스레드의 요청을 짧게 모아 LoRA adapter별로 묶어 실행 (LORA_BATCHING=false이면 바로 실행)
+        self.batcher = create_adapter_batcher(self._generate, self.max_loras)
+
+        self.sampling_params_cls = SamplingParams
         self.sampling_params = SamplingParams(
             temperature=self.temperature,
             top_p=self.top_p,
             max_tokens=self.max_tokens,
             stop=self.stop
         )
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.model_path,
-            token=hf_token
-        )
+        # 엔진이 로딩한 tokenizer를 그대로 사용 (같은 tokenizer를 두 번 로딩하지 않음)
+        self.tokenizer = self.model_vllm.get_tokenizer()
         
-        self.lora_adapters = {
-            "youtube_summary" : LoRARequest(
-                "article_summary", 
-                1, 
-                "KakaoBase/HyperCLOVAX-SEED-article-summary-LoRA-v1.0"
-            ),
-            "social_bot" : LoRARequest(
-                "sns_chat",
-                2,
-                "KakaoBase/HyperCLOVAX-SEED-SNS-chat-LoRA-v1.0"
-            )
-        }
+        self.lora_registry = lora_registry_future.result()
+        lora_prefetch.shutdown()
 
-        print("🔧 사용 가능한 LoRA 어댑터:")
-        for adapter_name, adapter in self.lora_adapters.items():
-            print(f"  - {adapter_name}: {adapter.lora_name} (ID: {adapter.lora_int_id})")
+    def _generate(self, *args, **kwargs):
+        with self._generate_lock:
+            # 오프라인 엔진은 생성 도중 중단할 수 없으므로, 락을 기다리는 동안 마감이 지난 요청은 생성하지 않음
+            if is_expired():
+                raise DeadlineExceededError("deadline exceeded before generation")
+            return self.model_vllm.generate(*args, **kwargs)
+
+    def _submit(self, prompts, sampling_params, adapter_type):
+        """
+        adapter 묶음 실행기를 거쳐 generate (prompts가 문자열 하나면 길이 1 리스트를 반환)
+        - 생성하는 동안 adapter 버전을 사용 중으로 표시해 교체/제거 시 draining 되도록 함
+        """
+        with self.lora_registry.use(adapter_type) as lora_request:
+            if self.batcher is None:
+                return self._generate(prompts, sampling_params, lora_request=lora_request)
+            if isinstance(prompts, str):
+                return [self.batcher.submit(prompts, sampling_params, lora_request)]
+            return self.batcher.submit_many(prompts, sampling_params, lora_request)
+
+    def _remove_lora(self, lora_int_id):
+        """교체/제거된 adapter 버전을 엔진 LoRA 캐시에서 내림"""
+        with self._generate_lock:
+            self.model_vllm.llm_engine.remove_lora(lora_int_id)
 
     def get_response(self, messages, trace, start_time=None, prompt=None, name="vllm-inference", adapter_type="youtube_summary"):
         """
@@ -136,32 +238,14 @@ class GCPModelLoader(BaseModelLoader):
 
         try:
             # 🎯 어댑터 타입에 따라 선택
-            selected_lora = self.lora_adapters.get(adapter_type)
+            selected_lora = self.lora_registry.get(adapter_type)
             if not selected_lora:
                 raise ValueError(f"Unknown adapter type: {adapter_type}")
             
-            print(f"사용 중인 LoRA 어댑터: {adapter_type} ({selected_lora.lora_name})")
-
-            if adapter_type == "youtube_summary":
-                print(f"DEBUG: Youtube summary lora_request: {selected_lora.lora_name}, ID: {selected_lora.lora_int_id}")
-                outputs = self.model_vllm.generate(
-                prompt, 
-                self.sampling_params, 
-                lora_request=selected_lora
-            )
-            elif adapter_type == "social_bot":
+            print(f"사용 중인 LoRA 어댑터: {adapter_type} ({selected_lora.lora_name}, ID: {selected_lora.lora_int_id})")
 
-                print(f"DEBUG: Social bot lora_request: {selected_lora.lora_name}, ID: {selected_lora.lora_int_id}")
-
-                try:
-                    outputs = self.model_vllm.generate(
-                        prompt, 
-                        self.sampling_params, 
-                        lora_request=selected_lora,
-                    )
-                except Exception as gen_e:
-                    print(f"ERROR: vllm generate call failed: {gen_e}")
-                    raise # 다시 예외를 발생시켜 상위 except 블록에서 처리하도록 함
+            # 레지스트리에 등록된 모든 adapter(설정/관리 API로 추가된 adapter 포함)를 같은 경로로 실행
+            outputs = self._submit(prompt, self.sampling_params, adapter_type=adapter_type)
 
             # outputs 객체 유효성 검사 및 디버그 출력 추가
             if not outputs or len(outputs) == 0 or not hasattr(outputs[0], 'outputs') or len(outputs[0].outputs) == 0:
@@ -210,6 +294,226 @@ class GCPModelLoader(BaseModelLoader):
             "adapter_used": adapter_type
         }
 
+    def get_batch_responses(self, messages_list, trace, name="vllm-inference", adapter_type="youtube_summary"):
+        """
+        여러 요청의 프롬프트를 한 번의 generate 호출로 묶어 처리 (엔진 내부에서 배치 실행)
+        """
+        if not messages_list:
+            return []
+
+        prompts = [
+            self.tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=False)
+            for messages in messages_list
+        ]
+
+        try:
+            selected_lora = self.lora_registry.get(adapter_type)
+            if not selected_lora:
+                raise ValueError(f"Unknown adapter type: {adapter_type}")
+
+            start_time = time.time()
+            outputs = self._submit(
+                prompts,
+                self.sampling_params,
+                adapter_type=adapter_type
+            )
+            print(f"response time (batch={len(prompts)}) : {time.time() - start_time:.3f} sec")
+
+            responses = []
+            for output in outputs:
+                if not output.outputs:
+                    responses.append({"status_code": 500, "url": "local_vllm", "error": "Model did not generate any output."})
+                else:
+                    responses.append({
+                        "status_code": 200,
+                        "url": "local_vllm",
+                        "content": output.outputs[0].text,
+                        "adapter_used": adapter_type
+                    })
+            return responses
+
+        except Exception as e:
+            print(f"ChatCompletion error: {e}")
+            return [{"status_code": 500, "url": "local_vllm", "error": str(e)} for _ in prompts]
+
+    def get_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="vllm-inference", adapter_type="youtube_summary"):
+        """
+        SamplingParams(n=n)로 한 번의 generate 호출에서 n개의 후보를 생성
+        - 프롬프트 prefill은 한 번만 수행되고 후보들이 이를 공유함
+        """
+        prompt = self.tokenizer.apply_chat_template(
+            messages,
+            add_generation_prompt=True,
+            tokenize=False
+        )
+
+        try:
+            selected_lora = self.lora_registry.get(adapter_type)
+            if not selected_lora:
+                raise ValueError(f"Unknown adapter type: {adapter_type}")
+
+            sampling_params = self.sampling_params_cls(
+                n=n,
+                temperature=self.temperature,
+                top_p=self.top_p,
+                max_tokens=self.max_tokens,
+                stop=self.stop
+            )
+
+            start_time = time.time()
+            outputs = self._submit(
+                prompt,
+                sampling_params,
+                adapter_type=adapter_type
+            )
+            print(f"response time (n={n}) : {time.time() - start_time:.3f} sec")
+
+            if not outputs or len(outputs) == 0 or not hasattr(outputs[0], 'outputs') or len(outputs[0].outputs) == 0:
+                raise ValueError("Model did not generate any output or output structure is invalid.")
+
+            return {
+                "status_code": 200,
+                "url": "local_vllm",
+                "contents": [completion.text for completion in outputs[0].outputs],
+                "adapter_used": adapter_type
+            }
+
+        except Exception as e:
+            print(f"ChatCompletion error: {e}")
+            return {
+                "status_code": 500,
+                "url": "local_vllm",
+                "error": str(e),
+                "contents": []
+            }
+
+
+class CPUModelLoader(BaseModelLoader):
+    """
+    GPU 없이 transformers + PEFT로 base 모델과 LoRA adapter를 CPU에서 실행 (models/cpu_engine.py)
+    - 동시 요청은 AdapterBatcher가 adapter별로 묶어 한 번에 generate
+    - 시스템 프롬프트를 공통 prefix로 넘겨 KV cache를 재사용
+    """
+    def __init__(self, mode, model_path, temperature, top_p, max_tokens, stop):
+        # torch/transformers/peft는 cpu 모드에서만 import
+        from models.cpu_engine import CPULoRARequest, CPUSamplingParams, create_cpu_engine
+
+        self.mode = mode
+        self.model_path = model_path
+        self.temperature = temperature
+        self.top_p = top_p
+        self.max_tokens = max_tokens
+        self.stop = stop
+
+        load_dotenv(override=True)
+        hf_token = os.getenv('HF_TOKEN')
+        if hf_token:
+            os.environ['HF_TOKEN'] = hf_token
+            os.environ['HUGGING_FACE_HUB_TOKEN'] = hf_token
+
+        self.artifacts, model_source, adapter_download = prepare_artifacts(self.model_path)
+        self.engine = create_cpu_engine(model_source)
+        self.tokenizer = self.engine.tokenizer
+        self.lora_registry = create_lora_registry(CPULoRARequest, self.engine.remove_adapter, adapter_download)
+        # int8은 adapter를 올린 뒤 양자화해야 하므로 설정된 adapter를 시작 시 모두 올림
+        self.engine.load_adapters([version.lora_request for version in self.lora_registry.adapters.values()])
+        if self.engine.quantization == "int8":
+            self.engine.quantize()
+
+        # PEFT 모델은 한 번에 하나의 adapter만 활성화하므로 slot 1개로 보고 같은 adapter 요청을 먼저 실행
+        self.max_loras = 1
+        self.batcher = create_adapter_batcher(self.engine.generate, self.max_loras)
+        self.sampling_params_cls = CPUSamplingParams
+        self.sampling_params = CPUSamplingParams(
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+            stop=self.stop
+        )
+
+    def _prompt(self, messages):
+        """(프롬프트, 공통 prefix) - 앞쪽 system 메시지만 렌더링한 결과가 프롬프트의 prefix이면 KV cache 재사용 대상"""
+        prompt = self.tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=False)
+        system_count = 0
+        while system_count < len(messages) and messages[system_count]["role"] == "system":
+            system_count += 1
+        if system_count == 0 or system_count == len(messages):
+            return prompt, None
+        prefix = self.tokenizer.apply_chat_template(messages[:system_count], tokenize=False)
+        return prompt, (prefix if prompt.startswith(prefix) else None)
+
+    def _submit(self, prompts, sampling_params, adapter_type):
+        with self.lora_registry.use(adapter_type) as lora_request:
+            if self.batcher is None:
+                return self.engine.generate(prompts, sampling_params, lora_request=lora_request)
+            if not isinstance(prompts, list):
+                return [self.batcher.submit(prompts, sampling_params, lora_request)]
+            return self.batcher.submit_many(prompts, sampling_params, lora_request)
+
+    def get_response(self, messages, trace, start_time=None, prompt=None, name="cpu-inference", adapter_type="youtube_summary"):
+        start_time = time.time()
+        try:
+            outputs = self._submit(self._prompt(messages), self.sampling_params, adapter_type)
+            if not outputs or not outputs[0].outputs:
+                raise ValueError("Model did not generate any output.")
+            print(f"response time : {time.time() - start_time:.3f} sec")
+            return {
+                "status_code": 200,
+                "url": "local_cpu",
+                "content": outputs[0].outputs[0].text,
+                "adapter_used": adapter_type
+            }
+        except Exception as e:
+            print(f"ChatCompletion error: {e}")
+            return {"status_code": 500, "url": "local_cpu", "error": str(e)}
+
+    def get_batch_responses(self, messages_list, trace, name="cpu-inference", adapter_type="youtube_summary"):
+        if not messages_list:
+            return []
+        try:
+            start_time = time.time()
+            outputs = self._submit([self._prompt(messages) for messages in messages_list], self.sampling_params, adapter_type)
+            print(f"response time (batch={len(messages_list)}) : {time.time() - start_time:.3f} sec")
+            return [
+                {"status_code": 200, "url": "local_cpu", "content": output.outputs[0].text, "adapter_used": adapter_type}
+                if output.outputs else {"status_code": 500, "url": "local_cpu", "error": "Model did not generate any output."}
+                for output in outputs
+            ]
+        except Exception as e:
+            print(f"ChatCompletion error: {e}")
+            return [{"status_code": 500, "url": "local_cpu", "error": str(e)} for _ in messages_list]
+
+    def get_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="cpu-inference", adapter_type="youtube_summary"):
+        """num_return_sequences=n으로 한 번의 generate에서 n개의 후보를 생성 (prefill 공유)"""
+        sampling_params = self.sampling_params_cls(
+            n=n,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+            stop=self.stop
+        )
+        try:
+            start_time = time.time()
+            outputs = self._submit(self._prompt(messages), sampling_params, adapter_type)
+            if not outputs or not outputs[0].outputs:
+                raise ValueError("Model did not generate any output.")
+            print(f"response time (n={n}) : {time.time() - start_time:.3f} sec")
+            return {
+                "status_code": 200,
+                "url": "local_cpu",
+                "contents": [completion.text for completion in outputs[0].outputs],
+                "adapter_used": adapter_type
+            }
+        except Exception as e:
+            print(f"ChatCompletion error: {e}")
+            return {"status_code": 500, "url": "local_cpu", "error": str(e), "contents": []}
+
+    def stream_response(self, messages, trace, name="cpu-inference", adapter_type="youtube_summary"):
+        """TextIteratorStreamer로 생성되는 대로 텍스트 조각을 yield"""
+        prompt, _ = self._prompt(messages)
+        with self.lora_registry.use(adapter_type) as lora_request:
+            yield from self.engine.stream(prompt, self.sampling_params, lora_request)
+
 
 class GeminiAPILoader(BaseModelLoader):
     def __init__(self, mode, model_path, temperature, top_p, max_tokens, stop, base_url):
@@ -225,11 +529,18 @@ class GeminiAPILoader(BaseModelLoader):
         else:
             load_dotenv(override=True)
 
+        from openai import OpenAI
+
         self.client = OpenAI(
             api_key= os.getenv("GEMINI_API_KEY"),
             base_url=base_url
         )
 
+    def _timeout_kwargs(self):
+        """요청 마감 시각이 있으면 남은 시간을 API 호출 timeout으로 사용"""
+        timeout = min_timeout(None)
+        return {"timeout": max(timeout, 0.001)} if timeout is not None else {}
+
     def get_response(self, messages, trace, start_time=None, prompt=None, name="api-inference", adapter_type="youtube_summary"):
         start_time = time.time()
 
@@ -239,7 +550,8 @@ class GeminiAPILoader(BaseModelLoader):
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                stop=self.stop
+                stop=self.stop,
+                **self._timeout_kwargs()
             )
 
             print(f"DEBUG: response: {response}")
@@ -283,6 +595,141 @@ class GeminiAPILoader(BaseModelLoader):
             "content": content
         }
 
+    def stream_response(self, messages, trace, name="api-inference", adapter_type="youtube_summary"):
+        """OpenAI 호환 API의 stream 옵션으로 생성되는 대로 토큰 조각을 yield"""
+        stream = self.client.chat.completions.create(
+            model=self.model_path,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stop=self.stop,
+            stream=True,
+            **self._timeout_kwargs()
+        )
+        for chunk in stream:
+            if is_expired():
+                # 마감이 지나면 연결을 끊어 생성을 중단
+                stream.close()
+                raise DeadlineExceededError("deadline exceeded during streaming")
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class RemoteModelLoader(BaseModelLoader):
+    """
+    별도 프로세스의 엔진 워커(models/engine_server.py)에 ZeroMQ로 요청을 전달하는 클라이언트
+    - 여러 uvicorn 워커가 하나의 GPU 엔진을 공유할 수 있도록 함
+    - 메시지는 msgpack(msgspec)으로 직렬화
+    """
+    ABORT_LINGER_MS = 1000
+
+    def __init__(self, address, timeout):
+        import zmq
+        import msgspec
+
+        self.zmq = zmq
+        self.address = address
+        self.timeout = timeout
+        self.encoder = msgspec.msgpack.Encoder()
+        self.decoder = msgspec.msgpack.Decoder()
+        self.context = zmq.Context.instance()
+        # zmq 소켓은 스레드 안전하지 않으므로 스레드별로 소켓을 생성
+        self._local = threading.local()
+
+        info = self._request({"op": "info"})
+        if info.get("type") != "result":
+            raise RuntimeError(f"엔진 워커 연결 실패 ({self.address}): {info.get('error')}")
+        self.mode = info["data"]["mode"]
+        self.model_path = info["data"]["model_path"]
+        self.temperature = info["data"]["temperature"]
+        self.top_p = info["data"]["top_p"]
+        self.max_tokens = info["data"]["max_tokens"]
+        self.stop = info["data"]["stop"]
+        print(f"엔진 워커 연결 완료: {self.address} (mode: {self.mode}, model: {self.model_path})")
+
+    def _socket(self):
+        sock = getattr(self._local, "socket", None)
+        if sock is None:
+            sock = self.context.socket(self.zmq.DEALER)
+            sock.setsockopt(self.zmq.LINGER, 0)
+            sock.connect(self.address)
+            self._local.socket = sock
+        return sock
+
+    def _reset_socket(self):
+        # 타임아웃 이후 늦게 도착한 응답이 다음 요청과 섞이지 않도록 소켓을 새로 만듦
+        # 직전에 보낸 abort가 버려지지 않도록 LINGER를 두고 닫음 (close는 바로 반환되고 전송은 zmq I/O 스레드가 마무리)
+        sock = getattr(self._local, "socket", None)
+        if sock is not None:
+            sock.close(linger=self.ABORT_LINGER_MS)
+            self._local.socket = None
+
+    def _recv(self, request_id):
+        sock = self._socket()
+        # 요청 마감 시각이 엔진 timeout보다 빠르면 마감 시각에 맞춰 중단
+        deadline = time.time() + min_timeout(self.timeout)
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not sock.poll(int(remaining * 1000)):
+                self.abort(request_id)
+                self._reset_socket()
+                error = "deadline exceeded" if is_expired() else "engine worker timeout"
+                return {"id": request_id, "type": "error", "error": error}
+            reply = self.decoder.decode(sock.recv())
+            if reply.get("id") == request_id:
+                return reply
+
+    def _request(self, payload):
+        request_id = uuid.uuid4().hex
+        # 엔진 워커가 대기열에서 마감이 지난 요청을 버릴 수 있도록 마감 시각 전달
+        self._socket().send(self.encoder.encode({**payload, "id": request_id, "deadline": get_deadline()}))
+        return self._recv(request_id)
+
+    def abort(self, request_id):
+        """엔진 워커에 대기/진행 중인 요청의 중단을 요청"""
+        self._socket().send(self.encoder.encode({"op": "abort", "id": uuid.uuid4().hex, "target": request_id}))
+
+    def get_response(self, messages, trace, start_time=None, prompt=None, name="remote-inference", adapter_type="youtube_summary"):
+        reply = self._request({"op": "generate", "messages": messages, "name": name, "adapter_type": adapter_type})
+        if reply.get("type") != "result":
+            return {"status_code": 500, "url": self.address, "error": reply.get("error")}
+        return reply["data"]
+
+    def get_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="remote-inference", adapter_type="youtube_summary"):
+        reply = self._request({"op": "candidates", "messages": messages, "n": n, "name": name, "adapter_type": adapter_type})
+        if reply.get("type") != "result":
+            return {"status_code": 500, "url": self.address, "error": reply.get("error"), "contents": []}
+        return reply["data"]
+
+    def get_batch_responses(self, messages_list, trace, name="remote-inference", adapter_type="youtube_summary"):
+        reply = self._request({"op": "batch", "messages_list": messages_list, "name": name, "adapter_type": adapter_type})
+        if reply.get("type") != "result":
+            return [{"status_code": 500, "url": self.address, "error": reply.get("error")} for _ in messages_list]
+        return reply["data"]
+
+    def stream_response(self, messages, trace, name="remote-inference", adapter_type="youtube_summary"):
+        request_id = uuid.uuid4().hex
+        self._socket().send(self.encoder.encode({
+            "op": "stream", "id": request_id, "messages": messages, "name": name, "adapter_type": adapter_type,
+            "deadline": get_deadline()
+        }))
+        finished = False
+        try:
+            while True:
+                reply = self._recv(request_id)
+                if reply["type"] == "chunk":
+                    yield reply["data"]
+                elif reply["type"] == "end":
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise RuntimeError(reply.get("error", "stream failed"))
+        finally:
+            # 소비자가 중간에 스트림을 닫은 경우 엔진 측 생성도 중단
+            if not finished:
+                self.abort(request_id)
+
 
 class ModelLoader:
     def __init__(self, mode="colab"):
@@ -314,6 +761,22 @@ class ModelLoader:
                 max_num_seqs=5,
                 max_num_batched_tokens=2048
             )
+        elif mode == "cpu":
+            # GPU 없이 CPU에서 같은 base 모델과 LoRA adapter 실행 (개발/통합 테스트/오프라인 배치용)
+            self.loader = CPUModelLoader(
+                mode=mode,
+                model_path=os.getenv("CPU_MODEL_PATH", "naver-hyperclovax/HyperCLOVAX-SEED-Text-Instruct-1.5B"),
+                temperature=0.5,
+                top_p=0.5,
+                max_tokens=256,
+                stop=["\n\n", "</s>", "\n"]
+            )
+        elif mode == "remote":
+            # 별도 프로세스의 엔진 워커(models/engine_server.py)를 사용
+            self.loader = RemoteModelLoader(
+                address=os.getenv("ENGINE_ADDRESS", "ipc:///tmp/tenten-engine.sock"),
+                timeout=float(os.getenv("ENGINE_TIMEOUT", "120"))
+            )
         elif mode == "api-dev" or mode == "api-prod":
             print("ModelLoader init")
             self.loader = GeminiAPILoader(
@@ -328,8 +791,142 @@ class ModelLoader:
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
+        # endpoint/temperature 정책에 따라 opt-in 되는 completion 캐시 (비활성화 시 None)
+        self.completion_cache = create_completion_cache()
+        # 진행 중인 모델 호출 수 (백그라운드 작업이 유휴 시간을 판단하는 데 사용)
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        # 우선순위/공정성 스케줄러 (main.py lifespan에서 설정, 없으면 바로 실행)
+        self.scheduler = None
+
+    @contextmanager
+    def _track_in_flight(self):
+        with self._in_flight_lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._in_flight_lock:
+                self.in_flight -= 1
+
+    def in_flight_count(self) -> int:
+        return self.in_flight
+
+    def slot(self, request_class, key=None):
+        """이벤트 루프에서 사용하는 스케줄러 슬롯 (async with)"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(request_class, key)
+
+    def scheduled(self, request_class, key=None):
+        """워커 스레드에서 사용하는 스케줄러 슬롯 (with)"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot_sync(request_class, key)
+
+    async def aget_response(self, messages, trace, start_time=None, prompt=None, name="inference", adapter_type="youtube_summary", request_class="posts", key=None):
+        """스케줄러 슬롯을 받은 뒤 워커 스레드에서 get_response 실행"""
+        try:
+            async with self.slot(request_class, key):
+                return await asyncio.to_thread(self.get_response, messages, trace, start_time, prompt, name, adapter_type)
+        except DeadlineExceededError:
+            return self._deadline_response()
+
+    async def aget_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="inference", adapter_type="youtube_summary", request_class="posts", key=None):
+        try:
+            async with self.slot(request_class, key):
+                return await asyncio.to_thread(self.get_candidates, messages, trace, n, start_time, prompt, name, adapter_type)
+        except DeadlineExceededError:
+            return {**self._deadline_response(), "contents": []}
+
+    def _deadline_response(self):
+        """요청 마감 시각이 지나 호출하지 않았거나 중단된 경우의 응답"""
+        return {"status_code": 504, "url": self.mode, "error": "deadline exceeded"}
+
+    def _with_deadline_status(self, response):
+        # 마감 시각 때문에 실패한 호출은 504로 구분 (서비스에서 재시도하지 않도록)
+        if response.get("status_code") != 200 and is_expired():
+            return {**response, "status_code": 504}
+        return response
+
+    def _cache_key(self, messages, name, adapter_type):
+        """캐시 대상 호출이면 캐시 key를, 아니면 None을 반환"""
+        if not self.completion_cache or not self.completion_cache.is_cacheable(name, self.loader.temperature):
+            return None
+        sampling_params = {
+            "temperature": self.loader.temperature,
+            "top_p": self.loader.top_p,
+            "max_tokens": self.loader.max_tokens,
+            "stop": self.loader.stop
+        }
+        return self.completion_cache.make_key(
+            messages, sampling_params, adapter_type, self.loader.model_path, self.adapter_version(adapter_type)
+        )
+
+    def adapter_version(self, adapter_type):
+        """adapter_type의 현재 LoRA 버전 식별자 (LoRA 레지스트리가 없는 모드는 None)"""
+        registry = getattr(self.loader, "lora_registry", None)
+        return registry.version_key(adapter_type) if registry else None
+
     def get_response(self, messages, trace, start_time=None, prompt=None, name="inference", adapter_type="youtube_summary"):
         if self.loader:
-            return self.loader.get_response(messages, trace, start_time, prompt, name, adapter_type)
+            cache_key = self._cache_key(messages, name, adapter_type)
+            if cache_key:
+                cached = self.completion_cache.get(cache_key, name)
+                if cached is not None:
+                    return {**cached, "cached": True}
+
+            if is_expired():
+                return self._deadline_response()
+            with self._track_in_flight():
+                response = self._with_deadline_status(self.loader.get_response(messages, trace, start_time, prompt, name, adapter_type))
+            if cache_key and response.get("status_code") == 200:
+                self.completion_cache.set(cache_key, response)
+            return response
+        else:
+            raise RuntimeError("Model loader not initialized.")
+
+    def get_candidates(self, messages, trace, n=1, start_time=None, prompt=None, name="inference", adapter_type="youtube_summary"):
+        if self.loader:
+            if is_expired():
+                return {**self._deadline_response(), "contents": []}
+            with self._track_in_flight():
+                return self._with_deadline_status(self.loader.get_candidates(messages, trace, n, start_time, prompt, name, adapter_type))
+        else:
+            raise RuntimeError("Model loader not initialized.")
+
+    def get_batch_responses(self, messages_list, trace, name="inference", adapter_type="youtube_summary"):
+        if self.loader:
+            cache_keys = [self._cache_key(messages, name, adapter_type) for messages in messages_list]
+            responses = [None] * len(messages_list)
+            for idx, cache_key in enumerate(cache_keys):
+                if cache_key:
+                    cached = self.completion_cache.get(cache_key, name)
+                    if cached is not None:
+                        responses[idx] = {**cached, "cached": True}
+
+            # 캐시에 없는 요청만 엔진에 전달
+            miss_indices = [idx for idx, response in enumerate(responses) if response is None]
+            if miss_indices:
+                if is_expired():
+                    fresh = [self._deadline_response() for _ in miss_indices]
+                else:
+                    with self._track_in_flight():
+                        fresh = self.loader.get_batch_responses([messages_list[idx] for idx in miss_indices], trace, name, adapter_type)
+                    fresh = [self._with_deadline_status(response) for response in fresh]
+                for idx, response in zip(miss_indices, fresh):
+                    responses[idx] = response
+                    if cache_keys[idx] and response.get("status_code") == 200:
+                        self.completion_cache.set(cache_keys[idx], response)
+            return responses
+        else:
+            raise RuntimeError("Model loader not initialized.")
+
+    def stream_response(self, messages, trace, name="inference", adapter_type="youtube_summary"):
+        if self.loader:
+            if is_expired():
+                raise DeadlineExceededError("deadline exceeded before streaming")
+            with self._track_in_flight():
+                yield from self.loader.stream_response(messages, trace, name, adapter_type)
         else:
-            raise RuntimeError("Model loader not initialized.")
\ No newline at end of file
+            raise RuntimeError("Model loader not initialized.")
@@ -1,7 +1,11 @@
+import os
 from pydantic import BaseModel
 
 #bot 관련 schema가 공통으로 사용하는 클래스 분리
 
+# 배치 API 한 번에 받을 수 있는 최대 요청 수 (한 번의 배치 호출로 생성하므로 상한을 둠)
+BOT_BATCH_MAX_REQUESTS = int(os.getenv("BOT_BATCH_MAX_REQUESTS", "64"))
+
 class UserInfoRequest(BaseModel):
     nickname : str
     class_name : str
@@ -18,4 +22,9 @@ class BaseMessageRequest(BaseModel):
 
 class ErrorResponse(BaseModel):
     error : str
-    message : str
\ No newline at end of file
+    message : str
+
+class BatchItemError(BaseModel):
+    error : str
+    message : str
+    attempts : int = 0
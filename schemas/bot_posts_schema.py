@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import List
-from schemas.bot_common_schema import UserInfoResponse, BaseMessageRequest
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from schemas.bot_common_schema import UserInfoResponse, BaseMessageRequest, BatchItemError, BOT_BATCH_MAX_REQUESTS
 
 # Request Schemas
 class PostRequest(BaseMessageRequest):
@@ -24,3 +24,17 @@ class BotPostResponseData(BaseModel):
 class BotPostsResponse(BaseModel):
     message: str
     data: BotPostResponseData
+
+# Batch Schemas
+class BotPostsBatchRequest(BaseModel):
+    requests: List[BotPostsRequest] = Field(..., min_length=1, max_length=BOT_BATCH_MAX_REQUESTS)
+
+class BotPostsBatchItem(BaseModel):
+    index: int
+    status: Literal["success", "failed"]
+    data: Optional[BotPostResponseData] = None
+    error: Optional[BatchItemError] = None
+
+class BotPostsBatchResponse(BaseModel):
+    message: str
+    data: List[BotPostsBatchItem]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional
-from schemas.bot_common_schema import UserInfoResponse, BaseMessageRequest
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from schemas.bot_common_schema import UserInfoResponse, BaseMessageRequest, BatchItemError, BOT_BATCH_MAX_REQUESTS
 
 class PostRequest(BaseMessageRequest):
     id: int
@@ -24,4 +24,17 @@ class BotRecommentResponseData(BaseModel):
 
 class BotRecommentsResponse(BaseModel):
     message: str
-    data: BotRecommentResponseData
\ No newline at end of file
+    data: BotRecommentResponseData
+
+class BotRecommentsBatchRequest(BaseModel):
+    requests: List[BotRecommentsRequest] = Field(..., min_length=1, max_length=BOT_BATCH_MAX_REQUESTS)
+
+class BotRecommentsBatchItem(BaseModel):
+    index: int
+    status: Literal["success", "failed"]
+    data: Optional[BotRecommentResponseData] = None
+    error: Optional[BatchItemError] = None
+
+class BotRecommentsBatchResponse(BaseModel):
+    message: str
+    data: List[BotRecommentsBatchItem]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class LoRAAdapterSpec(BaseModel):
+    adapter_type: str  # 서비스에서 사용하는 adapter 이름 (예: youtube_summary, social_bot)
+    lora_name: str
+    path: str  # Hugging Face Hub repo id 또는 로컬 디렉터리
+    revision: Optional[str] = None  # Hub 브랜치/태그/커밋 (버전 교체 시 사용)
+
+class LoRAAdapterSwapRequest(BaseModel):
+    lora_name: str
+    path: str
+    revision: Optional[str] = None
+    drain_timeout: Optional[float] = None  # 이전 버전의 진행 중인 요청을 기다릴 최대 시간(초)
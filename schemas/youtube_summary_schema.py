@@ -9,4 +9,11 @@ class YouTubeSummaryData(BaseModel):
 
 class YouTubeSummaryResponse(BaseModel):
     message: str
-    data: YouTubeSummaryData 
\ No newline at end of file
+    data: YouTubeSummaryData 
+class YouTubeSummaryStreamRequest(BaseModel):
+    url: str
+    include_chunk_summaries: bool = False  # chunk 이벤트에 청크 요약 포함 여부
+
+class YouTubeSummaryJobRequest(BaseModel):
+    url: str
+    callback_url: Optional[str] = None  # 완료 시 결과를 batch로 전달받을 webhook URL
@@ -3,7 +3,8 @@ import logging
 from schemas.bot_chats_schema import BotChatsRequest, BotChatsResponse, BotChatResponseData, UserInfoResponse, BotChatQueueRequest
 import os
 from models.model_loader import ModelLoader
-from langchain.memory import ConversationBufferWindowMemory # ConversationBufferWindowMemory로 변경
+from core.chat_memory_store import create_chat_memory_store
+from core.task_registry import create_task_registry
 import json
 from datetime import datetime
 from core.sse_manager import sse_manager
@@ -16,13 +17,15 @@ class BotChatsService:
         """
         BotChatsService 생성자
         - FastAPI app의 state에서 모델 싱글턴 인스턴스를 받아옴
-        - stream_id별 대화 메모리(ConversationBufferWindowMemory) 딕셔너리 초기화
+        - stream_id별 대화 메모리 저장소 초기화 (STATE_BACKEND: memory / sqlite)
+        - stream_id별 진행 중인 작업 레지스트리 초기화
         - 채팅 프롬프트 클라이언트 초기화
         """
         self.logger = logging.getLogger(__name__)
         self.model = app.state.model
-        self.memory_dict = {}  # key: stream_id, value: ConversationBufferWindowMemory
         self.memory_k = 5  # 최근 5개 메시지만 유지
+        self.memory_dict = create_chat_memory_store(self.memory_k)  # key: stream_id, value: 대화 메모리
+        self.task_registry = create_task_registry()
         self.prompt_client = BotChatsPrompt() # 프롬프트 클라이언트 인스턴스 생성
 
     def get_memory(self, stream_id: str):
@@ -33,10 +36,7 @@ class BotChatsService:
         Returns:
             ConversationBufferWindowMemory: 해당 stream_id의 메모리 인스턴스
         """
-        if stream_id not in self.memory_dict:
-            # ConversationBufferWindowMemory를 사용하도록 수정
-            self.memory_dict[stream_id] = ConversationBufferWindowMemory(k=self.memory_k, return_messages=True)
-        return self.memory_dict[stream_id]
+        return self.memory_dict.get_memory(stream_id)
 
     def add_message_to_memory(self, stream_id: str, role: str, content: str):
         """
@@ -46,11 +46,7 @@ class BotChatsService:
             role (str): 'user' 또는 'ai' 등 역할
             content (str): 메시지 내용
         """
-        memory = self.get_memory(stream_id)
-        if role == 'user':
-            memory.chat_memory.add_user_message(content)
-        elif role == 'ai':
-            memory.chat_memory.add_ai_message(content)
+        self.memory_dict.add_message(stream_id, role, content)
 
     def get_recent_messages(self, stream_id: str):
         """
@@ -58,8 +54,7 @@ class BotChatsService:
         Returns:
             List[dict]: [{"role": ..., "content": ...}]
         """
-        memory = self.get_memory(stream_id)
-        retained_messages = memory.buffer_as_messages
+        retained_messages = self.memory_dict.get_messages(stream_id)
 
         # [REFACTOR] Langchain의 role(human, ai)을 모델 표준(user, assistant)으로 변환
         role_map = {"human": "user", "ai": "assistant"}
@@ -74,16 +69,25 @@ class BotChatsService:
         Args:
             stream_id (str): 대화 스트림 ID
         """
-        if stream_id in self.memory_dict:
-            del self.memory_dict[stream_id]
+        self.memory_dict.delete(stream_id)
+        sse_manager.forget_stream(stream_id)
 
+    def cancel_stream(self, stream_id: str):
+        """
+        stream_id의 진행 중인 채팅 작업을 취소 (다른 워커에서 진행 중인 작업 포함)
+        Args:
+            stream_id (str): 대화 스트림 ID
+        """
+        self.task_registry.cancel(stream_id)
 
     async def process_chat_and_broadcast(self, request: BotChatQueueRequest):
         """
         채팅을 처리하고, 생성된 응답을 SSEManager를 통해 브로드캐스트
         """
         stream_id = request.stream_id
-        
+        current_task = asyncio.current_task()
+        self.task_registry.register(stream_id, current_task)
+
         try:
             # [REFACTOR] User 메시지 형식을 다른 기능과 통일
             user_message_content = f"[{request.nickname} from {request.class_name}] {request.message}"
@@ -107,10 +111,14 @@ class BotChatsService:
             # Generation 시작 시간 기록
             start_time = datetime.now()
             
-            model_response = self.model.get_response(
+            # 스케줄러에서 가장 높은 우선순위(chat)로, 사용자별 공정 큐잉을 거쳐 실행
+            model_response = await self.model.aget_response(
                 messages=messages_with_persona, 
                 trace=trace, # model_loader.get_response 시그니처에 맞게 trace 전달
-                adapter_type="social_bot"
+                name="bot_chat",
+                adapter_type="social_bot",
+                request_class="chat",
+                key=f"user:{request.user_id}"
             )
             ai_content = model_response.get("content", "")
 
@@ -133,6 +141,7 @@ class BotChatsService:
             )
 
             # 단어 단위 스트리밍으로 변경
+            stream_events = []
             for token in ai_content.split(' '):
                 # 단어가 비어있지 않은 경우에만 전송
                 if not token:
@@ -143,8 +152,9 @@ class BotChatsService:
                     "message": token + " ", # 각 단어 뒤에 공백을 붙여서 전송
                     "timestamp": datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
                 }
-                await sse_manager.broadcast(f"event: stream\ndata: {json.dumps(stream_data, ensure_ascii=False)}\n\n")
-                # await asyncio.sleep(0.1) # [TEST] 스트리밍 효과를 확인하기 위한 0.1초 지연
+                stream_events.append(f"event: stream\ndata: {json.dumps(stream_data, ensure_ascii=False)}\n\n")
+            # 토큰 이벤트는 묶어서 발행하여 브로커 왕복 횟수를 줄임
+            await sse_manager.broadcast_batch(stream_events, stream_id=stream_id)
 
             self.add_message_to_memory(stream_id, "ai", ai_content)
             
@@ -153,7 +163,7 @@ class BotChatsService:
                 "message": None,
                 "timestamp": datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
             }
-            await sse_manager.broadcast(f"event: done\ndata: {json.dumps(done_data, ensure_ascii=False)}\n\n")
+            await sse_manager.broadcast(f"event: done\ndata: {json.dumps(done_data, ensure_ascii=False)}\n\n", stream_id=stream_id)
 
             # Langfuse 트레이스 업데이트 (성공)
             trace.update(output={"full_response": ai_content, "status": "success"})
@@ -166,8 +176,10 @@ class BotChatsService:
                 "message": str(e),
                 "timestamp": datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
             }
-            await sse_manager.broadcast(f"event: error\ndata: {json.dumps(error_data, ensure_ascii=False)}\n\n")
+            await sse_manager.broadcast(f"event: error\ndata: {json.dumps(error_data, ensure_ascii=False)}\n\n", stream_id=stream_id)
             
             # Langfuse 트레이스 업데이트 (실패)
             if 'trace' in locals():
                 trace.update(output={"error": str(e), "status": "error"})
+        finally:
+            self.task_registry.unregister(stream_id, current_task)
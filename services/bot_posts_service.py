@@ -1,9 +1,12 @@
+import asyncio
 import logging
 import os
 from datetime import datetime
-from schemas.bot_posts_schema import BotPostsRequest, BotPostsResponse, BotPostResponseData, UserInfoResponse
+from schemas.bot_posts_schema import BotPostsRequest, BotPostsResponse, BotPostResponseData, UserInfoResponse, BotPostsBatchItem, BotPostsBatchResponse
+from schemas.bot_common_schema import BatchItemError
 from core.prompt_templates.bot_posts_prompt import BotPostsPrompt
-from utils.error_handler import InvalidQueryParameterError, InternalServerError
+from utils.error_handler import InvalidQueryParameterError, InternalServerError, DeadlineExceededError
+from core.request_context import has_retry_budget
 
 from dotenv import load_dotenv
 from langfuse import Langfuse
@@ -12,6 +15,8 @@ from langgraph.graph import StateGraph, END
 
 import re
 from utils.logger import log_inference_to_langfuse
+from core.candidate_selector import select_best_candidate
+from core.batch_generation import generate_with_retries
 from typing import Literal, TypedDict, Any
 
 class GraphState(TypedDict):
@@ -22,6 +27,7 @@ class GraphState(TypedDict):
         posts: The initial posts request data.
         retry_count: How many times we've retried.
         original_content: The content generated by the AI model.
+        candidates: All candidate contents generated in the last attempt (N-best mode).
         cleaned_content: The content after cleaning.
         evaluation_status: The evaluation status of the cleaned content (e.g., "success", "empty", "low_quality").
         error: Any error encountered during the process.
@@ -32,6 +38,7 @@ class GraphState(TypedDict):
     posts: BotPostsRequest
     retry_count: int
     original_content: str
+    candidates: list[str]
     cleaned_content: str
     evaluation_status: Literal["success", "empty", "low_quality"]
     error: str
@@ -46,6 +53,10 @@ class BotPostsService:
         self.model = app.state.model
         self.mode = self.model.mode
         print(f"MODE : {self.mode}")
+        # N-best 모드: 한 번의 호출로 생성할 후보 개수 (1이면 기존처럼 단일 생성)
+        self.n_candidates = max(int(os.getenv("BOT_NBEST_CANDIDATES", "1")), 1)
+        # 유휴 시간에 미리 생성해 둔 게시글 pool (없으면 비활성화)
+        self.pregen_pool = getattr(app.state, "pregen_pool", None)
         
         # Langfuse 초기화
         self.langfuse = Langfuse(
@@ -101,7 +112,8 @@ class BotPostsService:
             return "continue"
 
     def _should_continue_retry(self, state: GraphState) -> Literal["retry", "end_failure"]:
-        if state["retry_count"] < 3:
+        # 요청 마감까지 남은 시간이 한 번의 생성에도 부족하면 재시도하지 않음
+        if state["retry_count"] < 3 and has_retry_budget():
             return "retry"
         else:
             return "end_failure"
@@ -137,12 +149,21 @@ class BotPostsService:
             
             # Generation 시작 시간
             start_time = datetime.now()
-            model_response = self.model.get_response(
-                messages, trace=node_span, start_time=start_time, prompt=prompt_client, name="generate_bot_post", adapter_type="social_bot"
-            )
+            if self.n_candidates > 1:
+                model_response = await self.model.aget_candidates(
+                    messages, trace=node_span, n=self.n_candidates, start_time=start_time, prompt=prompt_client, name="generate_bot_post", adapter_type="social_bot",
+                    request_class="posts", key=current_posts.board_type
+                )
+                candidates = model_response.get("contents", [])
+            else:
+                model_response = await self.model.aget_response(
+                    messages, trace=node_span, start_time=start_time, prompt=prompt_client, name="generate_bot_post", adapter_type="social_bot",
+                    request_class="posts", key=current_posts.board_type
+                )
+                candidates = [model_response.get("content", "")]
             end_time = datetime.now()
 
-            original_content = model_response.get("content", "")
+            original_content = candidates[0] if candidates else ""
 
             log_inference_to_langfuse(
                 trace=node_span,
@@ -163,6 +184,7 @@ class BotPostsService:
             print(f"inference_time : {(end_time - start_time).total_seconds()}")
 
             state["original_content"] = original_content
+            state["candidates"] = candidates
             state["error"] = ""
 
         except Exception as e:
@@ -174,6 +196,7 @@ class BotPostsService:
                 metadata={"error_type": type(e).__name__}
             )
             state["original_content"] = ""
+            state["candidates"] = []
         finally:
             node_span.end()
 
@@ -195,9 +218,13 @@ class BotPostsService:
                 "stop": self.model.loader.stop,
             }
 
+            # 모든 후보를 한 번에 정제/평가하여 가장 좋은 유효 후보를 선택
             start_time = datetime.now()
-            content = self.clean_response(original_content)
+            candidates = state.get("candidates") or [original_content]
+            best_idx, content, scores = select_best_candidate(candidates, self.clean_response, messages)
             end_time = datetime.now()
+            if len(candidates) > 1:
+                print(f"candidate scores : {scores}, selected : {best_idx}")
 
             log_inference_to_langfuse(
                 trace=node_span,
@@ -268,10 +295,27 @@ class BotPostsService:
             environment=self.mode
         )
 
+        # context가 비슷한 사전 생성 게시글이 있으면 바로 반환
+        if self.pregen_pool:
+            self.pregen_pool.observe(request)
+            pooled_content = self.pregen_pool.take(request)
+            if pooled_content:
+                main_trace.update(output=pooled_content, status="success", metadata={"pregen_pool": "hit"})
+                bot_user = BotPostsPrompt().get_bot_user_info()
+                return BotPostsResponse(
+                    message="소셜봇이 게시물을 작성했습니다.",
+                    data=BotPostResponseData(
+                        board_type=request.board_type,
+                        user=UserInfoResponse(**bot_user),
+                        content=pooled_content
+                    )
+                )
+
         initial_state: GraphState = {
             "posts": request,
             "retry_count": 0,
             "original_content": "",
+            "candidates": [],
             "cleaned_content": "",
             "evaluation_status": "empty",
             "error": "",
@@ -310,6 +354,8 @@ class BotPostsService:
                     data=data
                 )
             else:
+                if not has_retry_budget():
+                    raise DeadlineExceededError("Deadline exceeded while generating bot post.")
                 self.logger.error(f"Failed to generate valid bot post after multiple retries. Last error: {final_state['error']}", exc_info=True)
                 raise InternalServerError(
                     detail="Failed to generate bot post after multiple retries."
@@ -325,6 +371,16 @@ class BotPostsService:
                 )
             raise
 
+        except DeadlineExceededError:
+            # 504 에러는 그대로 상위로 전달 (전역 예외 핸들러에서 처리)
+            if main_trace:
+                main_trace.update(
+                    status="error",
+                    error="DeadlineExceededError",
+                    metadata={"error_type": "DeadlineExceededError"}
+                )
+            raise
+
         except Exception as e:
             self.logger.error(f"Error during Langgraph execution: {e}", exc_info=True)
             # 예외 발생 시 메인 트레이스 업데이트
@@ -334,4 +390,109 @@ class BotPostsService:
                     error=str(e),
                     metadata={"error_type": type(e).__name__}
                 )
-            raise InternalServerError()
\ No newline at end of file
+            raise InternalServerError()
+
+    def pregenerate(self, request: BotPostsRequest):
+        """
+        사전 생성 pool용 게시글 생성 (정제 결과가 비어 있으면 None)
+        """
+        trace = self.langfuse.trace(
+            name="bot_posts_pregeneration",
+            metadata={"board_type": request.board_type},
+            environment=self.mode
+        )
+        prompt_client, messages = BotPostsPrompt().json_to_messages(request.posts, self.mode)
+        # 워커 스레드에서 실행되므로 스케줄러의 동기 슬롯(가장 낮은 batch 클래스) 사용
+        with self.model.scheduled("batch", "pregen"):
+            response = self.model.get_response(
+                messages, trace=trace, start_time=datetime.now(), prompt=prompt_client, name="pregen_bot_post", adapter_type="social_bot"
+            )
+        if response.get("status_code") != 200:
+            return None
+        _, content, _ = select_best_candidate([response.get("content") or ""], self.clean_response, messages)
+        trace.update(output=content)
+        return content or None
+
+    async def generate_bot_posts_batch(self, requests: list) -> BotPostsBatchResponse:
+        """
+        여러 게시판의 소셜봇 게시글을 한 번의 배치 호출로 생성하는 서비스
+        - 프롬프트를 모두 만든 뒤 모델에 한 번에 전달하고, 정제 결과가 비어 있는 항목만 모아 재시도
+        Args:
+            requests: BotPostsRequest 리스트
+        Returns:
+            요청 순서대로 항목별 성공/실패 결과
+        Raises:
+            InternalServerError: 프롬프트 생성 실패 등 배치 전체가 실패한 경우
+            DeadlineExceededError: 요청 마감 시각이 지나 배치를 실행하지 못한 경우
+        """
+        main_trace = self.langfuse.trace(
+            name="bot_posts_batch_generation",
+            metadata={"batch_size": len(requests)},
+            environment=self.mode
+        )
+
+        try:
+            items = [None] * len(requests)
+            bot_post_prompt = BotPostsPrompt()
+            valid_indices, messages_list = [], []
+            for idx, request in enumerate(requests):
+                # 400 error : 게시글 개수 검증 (해당 항목만 실패 처리)
+                if len(request.posts) < 5:
+                    items[idx] = BotPostsBatchItem(index=idx, status="failed", error=BatchItemError(
+                        error="invalid_query_parameter",
+                        message="전달받은 게시글이 5개 미만입니다."
+                    ))
+                    continue
+                _, messages = bot_post_prompt.json_to_messages(request.posts, self.mode)
+                valid_indices.append(idx)
+                messages_list.append(messages)
+
+            start_time = datetime.now()
+            async with self.model.slot("batch", "generate_bot_post_batch"):
+                results = await asyncio.to_thread(
+                    generate_with_retries, self.model, messages_list, self.clean_response, main_trace, "generate_bot_post", "social_bot"
+                )
+            print(f"batch inference_time : {(datetime.now() - start_time).total_seconds()} ({len(messages_list)}건)")
+
+            user = UserInfoResponse(**bot_post_prompt.get_bot_user_info())
+            for idx, result in zip(valid_indices, results):
+                if result["content"] is not None:
+                    items[idx] = BotPostsBatchItem(index=idx, status="success", data=BotPostResponseData(
+                        board_type=requests[idx].board_type,
+                        user=user,
+                        content=result["content"]
+                    ))
+                else:
+                    items[idx] = BotPostsBatchItem(index=idx, status="failed", error=BatchItemError(
+                        error="internal_server_error",
+                        message=f"Failed to generate bot post after multiple retries. Last error: {result['error']}",
+                        attempts=result["attempts"]
+                    ))
+
+            success_count = sum(item.status == "success" for item in items)
+            main_trace.update(
+                output=[item.model_dump() for item in items],
+                metadata={"batch_size": len(requests), "success_count": success_count}
+            )
+            return BotPostsBatchResponse(
+                message=f"소셜봇이 게시물 {success_count}/{len(requests)}개를 작성했습니다.",
+                data=items
+            )
+
+        except DeadlineExceededError:
+            # 504 에러는 그대로 상위로 전달 (전역 예외 핸들러에서 처리)
+            main_trace.update(
+                status="error",
+                error="DeadlineExceededError",
+                metadata={"error_type": "DeadlineExceededError"}
+            )
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Error during batch generation: {e}", exc_info=True)
+            main_trace.update(
+                status="error",
+                error=str(e),
+                metadata={"error_type": type(e).__name__}
+            )
+            raise InternalServerError()
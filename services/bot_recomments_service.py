@@ -1,8 +1,11 @@
+import asyncio
 import logging
 import os
-from schemas.bot_recomments_schema import BotRecommentsRequest, BotRecommentsResponse, BotRecommentResponseData, UserInfoResponse
+from schemas.bot_recomments_schema import BotRecommentsRequest, BotRecommentsResponse, BotRecommentResponseData, UserInfoResponse, BotRecommentsBatchItem, BotRecommentsBatchResponse
+from schemas.bot_common_schema import BatchItemError
 from core.prompt_templates.bot_recomments_prompt import BotRecommentsPrompt
-from utils.error_handler import InvalidQueryParameterError, InternalServerError
+from utils.error_handler import InvalidQueryParameterError, InternalServerError, DeadlineExceededError
+from core.request_context import has_retry_budget
 
 from datetime import datetime
 from dotenv import load_dotenv
@@ -10,6 +13,8 @@ from langfuse import Langfuse
 
 import re
 from utils.logger import log_inference_to_langfuse
+from core.candidate_selector import select_best_candidate
+from core.batch_generation import generate_with_retries
 from typing import Literal, TypedDict, Any
 from langchain_core.messages import BaseMessage
 from langgraph.graph import StateGraph, END
@@ -23,6 +28,7 @@ class GraphState(TypedDict):
         request: The initial BotRecommentsRequest data.
         retry_count: How many times we've retried.
         original_content: The content generated by the AI model.
+        candidates: All candidate contents generated in the last attempt (N-best mode).
         cleaned_content: The content after cleaning.
         evaluation_status: The evaluation status of the cleaned content (e.g., "success", "empty", "low_quality").
         error: Any error encountered during the process.
@@ -33,6 +39,7 @@ class GraphState(TypedDict):
     request: BotRecommentsRequest
     retry_count: int
     original_content: str
+    candidates: list[str]
     cleaned_content: str
     evaluation_status: Literal["success", "empty", "low_quality"]
     error: str
@@ -48,6 +55,8 @@ class BotRecommentsService:
         self.model = app.state.model
         self.mode = self.model.mode
         print(f"MODE : {self.mode}")
+        # N-best 모드: 한 번의 호출로 생성할 후보 개수 (1이면 기존처럼 단일 생성)
+        self.n_candidates = max(int(os.getenv("BOT_NBEST_CANDIDATES", "1")), 1)
 
         if os.environ.get("LLM_MODE") == "api-prod" or os.environ.get("LLM_MODE") == "gcp-prod":
             load_dotenv(dotenv_path='/secrets/env')
@@ -108,7 +117,8 @@ class BotRecommentsService:
             return "continue"
 
     def _should_continue_retry(self, state: GraphState) -> Literal["retry", "end_failure"]:
-        if state["retry_count"] < 3:
+        # 요청 마감까지 남은 시간이 한 번의 생성에도 부족하면 재시도하지 않음
+        if state["retry_count"] < 3 and has_retry_budget():
             return "retry"
         else:
             return "end_failure"
@@ -145,12 +155,21 @@ class BotRecommentsService:
             
             # Generation 시작 시간
             start_time = datetime.now()
-            model_response = self.model.get_response(
-                messages, trace=node_span, start_time=start_time, prompt=prompt_client, name="generate_bot_recomment", adapter_type="social_bot"
-            )
+            if self.n_candidates > 1:
+                model_response = await self.model.aget_candidates(
+                    messages, trace=node_span, n=self.n_candidates, start_time=start_time, prompt=prompt_client, name="generate_bot_recomment", adapter_type="social_bot",
+                    request_class="recomments", key=f"post:{current_request.post.id}"
+                )
+                candidates = model_response.get("contents", [])
+            else:
+                model_response = await self.model.aget_response(
+                    messages, trace=node_span, start_time=start_time, prompt=prompt_client, name="generate_bot_recomment", adapter_type="social_bot",
+                    request_class="recomments", key=f"post:{current_request.post.id}"
+                )
+                candidates = [model_response.get("content", "")]
             end_time = datetime.now()
 
-            original_content = model_response.get("content", "")
+            original_content = candidates[0] if candidates else ""
 
             log_inference_to_langfuse(
                 trace=node_span,
@@ -172,6 +191,7 @@ class BotRecommentsService:
             print(f"inference_time : {(end_time - start_time).total_seconds()}")
 
             state["original_content"] = original_content
+            state["candidates"] = candidates
             state["error"] = ""
 
         except Exception as e:
@@ -183,6 +203,7 @@ class BotRecommentsService:
                 metadata={"error_type": type(e).__name__}
             )
             state["original_content"] = ""
+            state["candidates"] = []
         finally:
             node_span.end()
 
@@ -204,9 +225,13 @@ class BotRecommentsService:
                 "stop": self.model.loader.stop,
             }
 
+            # 모든 후보를 한 번에 정제/평가하여 가장 좋은 유효 후보를 선택
             start_time = datetime.now()
-            content = self.clean_response(original_content)
+            candidates = state.get("candidates") or [original_content]
+            best_idx, content, scores = select_best_candidate(candidates, self.clean_response, messages)
             end_time = datetime.now()
+            if len(candidates) > 1:
+                print(f"candidate scores : {scores}, selected : {best_idx}")
 
             log_inference_to_langfuse(
                 trace=node_span,
@@ -285,6 +310,7 @@ class BotRecommentsService:
             "request": request,
             "retry_count": 0,
             "original_content": "",
+            "candidates": [],
             "cleaned_content": "",
             "evaluation_status": "empty",
             "error": "",
@@ -327,6 +353,8 @@ class BotRecommentsService:
                     data=data
                 )
             else:
+                if not has_retry_budget():
+                    raise DeadlineExceededError("Deadline exceeded while generating bot recomment.")
                 self.logger.error(f"Failed to generate valid bot recomment after multiple retries. Last error: {final_state['error']}", exc_info=True)
                 raise InternalServerError(
                     detail="Failed to generate bot recomment after multiple retries."
@@ -341,6 +369,16 @@ class BotRecommentsService:
                     metadata={"error_type": "InvalidQueryParameterError"}
                 )
             raise
+
+        except DeadlineExceededError:
+            # 504 에러는 그대로 상위로 전달 (전역 예외 핸들러에서 처리)
+            if main_trace:
+                main_trace.update(
+                    status="error",
+                    error="DeadlineExceededError",
+                    metadata={"error_type": "DeadlineExceededError"}
+                )
+            raise
         
         except Exception as e:
             self.logger.error(f"Error during Langgraph execution: {e}", exc_info=True)
@@ -351,3 +389,89 @@ class BotRecommentsService:
                     metadata={"error_type": type(e).__name__}
                 )
             raise InternalServerError()
+
+    async def generate_bot_recomments_batch(self, requests: list) -> BotRecommentsBatchResponse:
+        """
+        여러 댓글의 소셜봇 대댓글을 한 번의 배치 호출로 생성하는 서비스
+        - 프롬프트를 모두 만든 뒤 모델에 한 번에 전달하고, 정제 결과가 비어 있는 항목만 모아 재시도
+        Args:
+            requests: BotRecommentsRequest 리스트
+        Returns:
+            요청 순서대로 항목별 성공/실패 결과
+        Raises:
+            InternalServerError: 프롬프트 생성 실패 등 배치 전체가 실패한 경우
+            DeadlineExceededError: 요청 마감 시각이 지나 배치를 실행하지 못한 경우
+        """
+        main_trace = self.langfuse.trace(
+            name="bot_recomments_batch_generation",
+            metadata={"batch_size": len(requests)},
+            environment=self.mode
+        )
+
+        try:
+            items = [None] * len(requests)
+            prompt = BotRecommentsPrompt()
+            valid_indices, messages_list = [], []
+            for idx, request in enumerate(requests):
+                # 필수 필드 검증 (해당 항목만 실패 처리)
+                if not request.board_type or not request.post or not request.comment:
+                    items[idx] = BotRecommentsBatchItem(index=idx, status="failed", error=BatchItemError(
+                        error="missing_required_field",
+                        message="필수 필드가 누락되었습니다."
+                    ))
+                    continue
+                _, messages = prompt.json_to_messages(request, self.mode)
+                valid_indices.append(idx)
+                messages_list.append(messages)
+
+            start_time = datetime.now()
+            async with self.model.slot("batch", "generate_bot_recomment_batch"):
+                results = await asyncio.to_thread(
+                    generate_with_retries, self.model, messages_list, self.clean_response, main_trace, "generate_bot_recomment", "social_bot"
+                )
+            print(f"batch inference_time : {(datetime.now() - start_time).total_seconds()} ({len(messages_list)}건)")
+
+            user = UserInfoResponse(**prompt.get_bot_user_info())
+            for idx, result in zip(valid_indices, results):
+                if result["content"] is not None:
+                    items[idx] = BotRecommentsBatchItem(index=idx, status="success", data=BotRecommentResponseData(
+                        board_type=requests[idx].board_type,
+                        post_id=requests[idx].post.id,
+                        comment_id=requests[idx].comment.id,
+                        user=user,
+                        content=result["content"]
+                    ))
+                else:
+                    items[idx] = BotRecommentsBatchItem(index=idx, status="failed", error=BatchItemError(
+                        error="internal_server_error",
+                        message=f"Failed to generate bot recomment after multiple retries. Last error: {result['error']}",
+                        attempts=result["attempts"]
+                    ))
+
+            success_count = sum(item.status == "success" for item in items)
+            main_trace.update(
+                output=[item.model_dump() for item in items],
+                metadata={"batch_size": len(requests), "success_count": success_count}
+            )
+            return BotRecommentsBatchResponse(
+                message=f"소셜봇이 대댓글 {success_count}/{len(requests)}개를 작성했습니다.",
+                data=items
+            )
+
+        except DeadlineExceededError:
+            # 504 에러는 그대로 상위로 전달 (전역 예외 핸들러에서 처리)
+            main_trace.update(
+                status="error",
+                error="DeadlineExceededError",
+                metadata={"error_type": "DeadlineExceededError"}
+            )
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Error during batch generation: {e}", exc_info=True)
+            main_trace.update(
+                status="error",
+                error=str(e),
+                metadata={"error_type": type(e).__name__}
+            )
+            raise InternalServerError()
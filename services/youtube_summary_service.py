@@ -6,12 +6,13 @@
 # project_root = os.path.dirname(current_dir)  # 프로젝트 루트는 한 단계 위
 # sys.path.append(project_root)
 
+import asyncio
 import logging
-from youtube_transcript_api import YouTubeTranscriptApi
+import threading
 from urllib.parse import urlparse, parse_qs
 from schemas.youtube_summary_schema import YouTubeSummaryData, YouTubeSummaryResponse
 from core.prompt_templates.youtube_summary_prompt import YoutubeSummaryPrompt
-from utils.error_handler import InvalidYouTubeUrlError, SubtitlesNotFoundError, UnsupportedSubtitleLanguageError, VideoPrivateError, VideoNotFoundError
+from utils.error_handler import InvalidYouTubeUrlError, SubtitlesNotFoundError, UnsupportedSubtitleLanguageError, VideoPrivateError, VideoNotFoundError, DeadlineExceededError
 import os
 from dotenv import load_dotenv
 from langfuse import Langfuse
@@ -19,15 +20,31 @@ from datetime import datetime
 import traceback
 from fastapi import HTTPException
 from utils.logger import log_inference_to_langfuse # Langfuse 로깅 함수 임포트
+from core.chunking import content_defined_chunks, chunk_content_hash
+from core.cache import ChunkSummaryStore, create_chunk_summary_store
+from core.transcript_fetcher import create_transcript_fetcher
+from core.transcript_cleaner import create_transcript_cleaner
+from core.request_context import check_deadline, is_expired
 
 class YouTubeSummaryService:
     def __init__(self, app):
         self.logger = logging.getLogger(__name__)
-        self.transcript_api = YouTubeTranscriptApi()
         # FastAPI app의 state에서 model 싱글턴 인스턴스를 받아옴
         self.model = app.state.model
         self.mode = self.model.mode
         print(f"MODE : {self.mode}")
+        # 청크 분할 방식: fixed(고정 길이 + 이전 청크 요약 연결) / cdc(내용 기반 경계 + 청크 요약 재사용)
+        self.chunking = os.getenv("YOUTUBE_CHUNKING", "fixed")
+        self.chunk_summary_store = getattr(app.state, "chunk_summary_store", None) or create_chunk_summary_store()
+        # 이미 요약한 자막의 SimHash 인덱스 (없으면 근사 중복 재사용 비활성화)
+        self.simhash_index = getattr(app.state, "simhash_index", None)
+        # 요청 간 공유되는 자막 추출기 (스레드 풀 + deadline + rate limit)
+        self.transcript_fetcher = getattr(app.state, "transcript_fetcher", None) or create_transcript_fetcher()
+        # 청크 분할 전 자막 정제 파이프라인 (주석/겹침/반복/추임새 제거)
+        self.transcript_cleaner = create_transcript_cleaner()
+        # 자막이 threshold(글자 수)보다 길면 TextRank로 budget만큼 문장을 골라 LLM 호출 수 상한을 둠 (0이면 비활성화)
+        self.extractive_threshold = int(os.getenv("YOUTUBE_EXTRACTIVE_THRESHOLD_CHARS", "0"))
+        self.extractive_budget = int(os.getenv("YOUTUBE_EXTRACTIVE_BUDGET_CHARS", "26000"))
 
         # Langfuse 초기화
         if os.environ.get("LLM_MODE") == "api-prod" or os.environ.get("LLM_MODE") == "gcp-prod":
@@ -61,50 +78,20 @@ class YouTubeSummaryService:
 
         try : 
 
-            # 1. URL 프로토콜 확인 및 보정
-            url = self._ensure_url_scheme(url)
-
-            # 2. video_id 추출
-            video_id = self._extract_video_id(url)
-
-            # 3. 자막 추출 및 예외 처리
-            try:
-                transcript = self.transcript_api.fetch(video_id, languages=['ko', 'en'])
-                if not transcript:
-                    # 자막이 아예 없는 경우
-                    raise SubtitlesNotFoundError()
-            except SubtitlesNotFoundError:
-                raise
-            except Exception as e:
-                error_msg = str(e)
-                print(f"[DEBUG][youtube_transcript_api Exception] error_msg: {error_msg}")  # 개발/테스트용 에러 메시지 출력
-                if 'Subtitles are disabled' in error_msg:
-                    # 유튜브 동영상에 자막이 없는 경우
-                    raise SubtitlesNotFoundError()
-                elif """No transcripts were found for any of the requested language codes: ['ko', 'en']""" in error_msg:
-                    # 지원하지 않는 언어(한국어/영어가 아닌 자막)인 경우
-                    raise UnsupportedSubtitleLanguageError()
-                elif 'The video is unplayable for the following reason: No reason specified!' in error_msg:
-                    # 비공개 동영상인 경우
-                    raise VideoPrivateError()
-                elif 'The video is no longer available' in error_msg:
-                    # 존재하지 않는 동영상인 경우
-                    raise VideoNotFoundError()
-                else:
-                    print(f"[ERROR] transcript 추출 실패: {e}")
-                    raise Exception(f"transcript 추출 실패: {e}")
-
-            # 4. 자막 텍스트 전처리
-            try:
-                transcript_text = self._process_transcript(transcript)
-                trace.update(input={"transcript_text": transcript_text})
-                print(f"[DEBUG] transcript_text: {transcript_text}")
-            except Exception as e:
-                print(f"[ERROR] transcript 처리 실패: {e}")
-                raise Exception(f"transcript 처리 실패: {e}")
-
-            # 5. LLM을 통한 요약 생성
-            summary = self._create_summary(transcript_text, trace)
+            # 1~4. URL 검증, 자막 추출 및 전처리
+            video_id, transcript_units, transcript_text, trace_metadata = await self._prepare_transcript(url, trace)
+
+            # 5. 근사 중복 자막(미러/재업로드)이면 저장된 요약 재사용, 아니면 LLM을 통한 요약 생성
+            duplicate = await asyncio.to_thread(self._lookup_duplicate, transcript_text, trace, trace_metadata)
+            if duplicate:
+                summary = duplicate["summary"]
+            else:
+                summary_units = self._summary_units(transcript_units, transcript_text, trace, trace_metadata)
+                # 블로킹 LLM 호출이 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+                summary = await asyncio.to_thread(self._create_summary, ' '.join(summary_units), trace, summary_units, video_id)
+                if self.simhash_index and summary:
+                    # 인덱스 저장(JSON 파일 쓰기)이 이벤트 루프를 막지 않도록 워커 스레드에서 실행
+                    await asyncio.to_thread(self.simhash_index.add, video_id, transcript_text, summary, self._summary_version())
 
             # 4) 최종 결과 기록 및 종료
             trace.update(output={"summary": summary})
@@ -133,6 +120,94 @@ class YouTubeSummaryService:
             # 그대로 에러를 올려 FastAPI가 500을 반환하도록 둡니다
             raise
     
+    async def _prepare_transcript(self, url: str, trace):
+        """
+        URL 검증, 자막 추출, 자막 정제
+        Returns:
+            (video_id, 정제된 자막 조각 리스트, 자막 텍스트, trace metadata)
+        """
+        # 1. URL 프로토콜 확인 및 보정
+        url = self._ensure_url_scheme(url)
+
+        # 2. video_id 추출
+        video_id = self._extract_video_id(url)
+
+        # 3. 자막 추출 및 예외 처리
+        try:
+            transcript = await self.transcript_fetcher.fetch(video_id, languages=['ko', 'en'])
+            if not transcript:
+                # 자막이 아예 없는 경우
+                raise SubtitlesNotFoundError()
+        except SubtitlesNotFoundError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"[ERROR] transcript 추출 시간 초과: {video_id}")
+            if is_expired():
+                raise DeadlineExceededError(f"transcript 추출 중 요청 마감 시각 초과: {video_id}")
+            raise Exception(f"transcript 추출 시간 초과: {video_id}")
+        except Exception as e:
+            error_msg = str(e)
+            print(f"[DEBUG][youtube_transcript_api Exception] error_msg: {error_msg}")  # 개발/테스트용 에러 메시지 출력
+            if 'Subtitles are disabled' in error_msg:
+                # 유튜브 동영상에 자막이 없는 경우
+                raise SubtitlesNotFoundError()
+            elif """No transcripts were found for any of the requested language codes: ['ko', 'en']""" in error_msg:
+                # 지원하지 않는 언어(한국어/영어가 아닌 자막)인 경우
+                raise UnsupportedSubtitleLanguageError()
+            elif 'The video is unplayable for the following reason: No reason specified!' in error_msg:
+                # 비공개 동영상인 경우
+                raise VideoPrivateError()
+            elif 'The video is no longer available' in error_msg:
+                # 존재하지 않는 동영상인 경우
+                raise VideoNotFoundError()
+            else:
+                print(f"[ERROR] transcript 추출 실패: {e}")
+                raise Exception(f"transcript 추출 실패: {e}")
+
+        # 4. 자막 텍스트 전처리
+        try:
+            transcript_units, cleaning_stats = self.transcript_cleaner.clean(self._transcript_units(transcript))
+            transcript_text = ' '.join(transcript_units)
+            print(f"[DEBUG] 자막 정제: {cleaning_stats['original_chars']}자 -> {cleaning_stats['cleaned_chars']}자 "
+                  f"(감소율 {cleaning_stats['reduction_ratio']:.1%})")
+            trace_metadata = {"transcript_cleaning": cleaning_stats}
+            trace.update(input={"transcript_text": transcript_text}, metadata=trace_metadata)
+            print(f"[DEBUG] transcript_text: {transcript_text}")
+        except Exception as e:
+            print(f"[ERROR] transcript 처리 실패: {e}")
+            raise Exception(f"transcript 처리 실패: {e}")
+        if not transcript_units:
+            # 정제 후 남은 자막이 없는 경우 ([음악], [박수] 같은 주석만 있는 자막 등)
+            raise SubtitlesNotFoundError()
+
+        return video_id, transcript_units, transcript_text, trace_metadata
+
+    def _summary_version(self) -> str:
+        """SimHash 인덱스 항목에 함께 저장할 요약 모델/LoRA 버전"""
+        return f"{self.model.loader.model_path}|{self.model.adapter_version('youtube_summary')}"
+
+    def _lookup_duplicate(self, transcript_text: str, trace, trace_metadata: dict):
+        """SimHash 인덱스에서 근사 중복 자막의 요약을 조회 (없으면 None)"""
+        duplicate = self.simhash_index.lookup(transcript_text, self._summary_version()) if self.simhash_index else None
+        if duplicate:
+            print(f"[DEBUG] 근사 중복 자막 감지: {duplicate['video_id']} (similarity: {duplicate['similarity']:.3f})")
+            trace.update(metadata={
+                **trace_metadata,
+                "reused_summary_from": duplicate["video_id"],
+                "similarity": duplicate["similarity"]
+            })
+        return duplicate
+
+    def _summary_units(self, transcript_units: list, transcript_text: str, trace, trace_metadata: dict) -> list:
+        """요약에 사용할 자막 조각 (긴 자막은 추출 압축)"""
+        if self.extractive_threshold and len(transcript_text) > self.extractive_threshold:
+            # scipy는 추출 압축을 사용할 때만 import
+            from core.extractive import extractive_compress
+            transcript_units, extractive_stats = extractive_compress(transcript_units, self.extractive_budget)
+            print(f"[DEBUG] 추출 압축: {extractive_stats['original_chars']}자 -> {extractive_stats['compressed_chars']}자")
+            trace.update(metadata={**trace_metadata, "extractive_compression": extractive_stats})
+        return transcript_units
+
     def _ensure_url_scheme(self, url: str) -> str:
         """
         유튜브 URL에서 프로토콜 확인 및 보정
@@ -165,15 +240,11 @@ class YouTubeSummaryService:
         else:
             raise InvalidYouTubeUrlError()
 
-    def _process_transcript(self, transcript) -> str:
+    def _transcript_units(self, transcript) -> list:
         """
-        자막 리스트를 하나의 텍스트로 합침
-        Args:
-            transcript: FetchedTranscript 객체(리스트)
-        Returns:
-            처리된 자막 텍스트
+        자막 리스트를 조각(snippet) 텍스트 리스트로 변환 (내용 기반 청크 분할의 단위)
         """
-        return ' '.join([snippet.text for snippet in transcript])
+        return [snippet.text for snippet in transcript]
 
     def _split_transcript(self, transcript_text: str, chunk_size: int = 6500, overlap: int = 500) -> list:
         """
@@ -201,83 +272,123 @@ class YouTubeSummaryService:
         else:
             return "전체 텍스트의 중간 부분"
 
-    def _create_summary(self, transcript_text: str, trace) -> str:
+    def _split_chunks(self, transcript_text: str, transcript_units: list = None):
+        """
+        자막을 청크로 분할
+        Returns:
+            (청크 리스트, cdc 분할 여부)
+        """
+        chunk_size = 6500
+        overlap = 500
+        use_cdc = self.chunking == "cdc" and transcript_units is not None
+        if use_cdc:
+            return content_defined_chunks(transcript_units, max_chars=chunk_size), True
+        return self._split_transcript(transcript_text, chunk_size, overlap), False
+
+    def _model_parameters(self) -> dict:
+        return {
+            "temperature": self.model.loader.temperature,
+            "top_p": self.model.loader.top_p,
+            "max_tokens": self.model.loader.max_tokens,
+            "stop": self.model.loader.stop,
+        }
+
+    def _summarize_chunk(self, chunk: str, idx: int, total: int, prev_summary, use_cdc: bool, prompt_builder, trace, key: str = None) -> str:
+        """
+        청크 하나를 요약 (cdc면 청크 내용 해시로 저장된 요약을 재사용)
+        - 워커 스레드에서 호출되며, 모델 호출은 스케줄러의 summary 클래스 슬롯에서 실행
+        - 요청 마감 시각이 지났으면 모델을 호출하지 않고 DeadlineExceededError
+        """
+        check_deadline()
+        position = self._get_chunk_position(idx, total)
+        store_key = None
+        if use_cdc:
+            store_key = ChunkSummaryStore.make_key(
+                chunk_content_hash(chunk), position, "youtube_summary", self.model.loader.model_path,
+                self.model.adapter_version("youtube_summary")
+            )
+            cached_summary = self.chunk_summary_store.get(store_key)
+            if cached_summary is not None:
+                print(f"[DEBUG] 청크 {idx + 1}/{total} 요약 재사용")
+                return cached_summary
+            prompt_client, messages = prompt_builder.create_chunk_messages(chunk, position, None)
+        else:
+            prompt_client, messages = prompt_builder.create_chunk_messages(chunk, position, prev_summary)
+
+        start_time = datetime.now() # Generation 시작 시간
+        with self.model.scheduled("summary", key):
+            response = self.model.get_response(
+                messages, trace=trace, start_time=start_time, prompt=prompt_client, name="chunk_summary", adapter_type="youtube_summary"
+            )
+        end_time = datetime.now()
+        if response.get("status_code") == 504:
+            raise DeadlineExceededError(f"청크 {idx + 1}/{total} 요약 중 요청 마감 시각 초과")
+
+        content = response.get('content', None)
+
+        # Langfuse 로깅 추가
+        log_inference_to_langfuse(
+            trace=trace,
+            name="youtube_chunk_summary",
+            prompt=prompt_client,
+            messages=messages,
+            content=content,
+            model_name=self.model.loader.model_path,
+            model_parameters=self._model_parameters(),
+            input_tokens=None,
+            output_tokens=None,
+            inference_time=(end_time - start_time).total_seconds(),
+            start_time=start_time,
+            end_time=end_time,
+            error=None
+        )
+
+        if store_key and content and response.get("status_code") == 200:
+            self.chunk_summary_store.set(store_key, content)
+        return content
+
+    def _create_summary(self, transcript_text: str, trace, transcript_units: list = None, key: str = None) -> str:
         """
         긴 자막도 청크로 분할하여 순차적으로 요약, 마지막에 통합 요약
+        - fixed: 고정 길이로 분할하고 이전 청크 요약을 이어서 전달
+        - cdc: 내용 기반 경계로 분할하고, 청크 내용 해시로 이전에 만든 청크 요약을 재사용
+          (청크 요약이 청크 내용에만 의존하도록 이전 청크 요약은 전달하지 않음)
         Args:
             transcript_text: 자막 텍스트
+            transcript_units: 자막 조각 텍스트 리스트 (cdc 분할에 사용)
+            key: 스케줄러 공정 큐잉 key (video_id)
         Returns:
             요약 텍스트
         """
-        chunk_size = 6500
-        overlap = 500
-        chunks = self._split_transcript(transcript_text, chunk_size, overlap)
+        chunks, use_cdc = self._split_chunks(transcript_text, transcript_units)
         chunk_summaries = []
         prev_summary = None
         prompt_builder = YoutubeSummaryPrompt(self.mode)
 
         for idx, chunk in enumerate(chunks):
-            position = self._get_chunk_position(idx, len(chunks))
-            prompt_client, messages = prompt_builder.create_chunk_messages(chunk, position, prev_summary)
-            
-            start_time = datetime.now() # Generation 시작 시간
-            response = self.model.get_response(
-                messages, trace=trace, start_time=start_time, prompt=prompt_client, name="chunk_summary", adapter_type="youtube_summary"
-            )
-            end_time = datetime.now()
-
-            content = response.get('content', None)
-
-            # Langfuse 로깅 추가
-            log_model_parameters = {
-                "temperature": self.model.loader.temperature,
-                "top_p": self.model.loader.top_p,
-                "max_tokens": self.model.loader.max_tokens,
-                "stop": self.model.loader.stop,
-            }
-            log_inference_to_langfuse(
-                trace=trace,
-                name="youtube_chunk_summary",
-                prompt=prompt_client,
-                messages=messages,
-                content=content,
-                model_name=self.model.loader.model_path,
-                model_parameters=log_model_parameters,
-                input_tokens=None,
-                output_tokens=None,
-                inference_time=(end_time - start_time).total_seconds(),
-                start_time=start_time,
-                end_time=end_time,
-                error=None
-            )
-
+            content = self._summarize_chunk(chunk, idx, len(chunks), prev_summary, use_cdc, prompt_builder, trace, key)
             chunk_summaries.append(content)
             prev_summary = content
 
-        # Langfuse 로깅 추가 (최종 요약)
-        log_model_parameters_final = {
-            "temperature": self.model.loader.temperature,
-            "top_p": self.model.loader.top_p,
-            "max_tokens": self.model.loader.max_tokens,
-            "stop": self.model.loader.stop,
-        }
-
         # 모든 청크 요약을 다시 통합 요약
         if len(chunk_summaries) == 1:
-            final_summary = chunk_summaries[0]
+            return chunk_summaries[0]
 
-        else:
-            # 통합 프롬프트
-            prompt_client, messages = prompt_builder.create_final_messages(chunk_summaries)
+        # 통합 프롬프트
+        check_deadline()
+        prompt_client, messages = prompt_builder.create_final_messages(chunk_summaries)
 
-            start_time = datetime.now() # Generation 시작 시간
+        start_time = datetime.now() # Generation 시작 시간
+        with self.model.scheduled("summary", key):
             response = self.model.get_response(
                 messages, trace=trace, start_time=start_time, prompt=prompt_client, name="final_summary", adapter_type="youtube_summary"
             )
-            end_time = datetime.now()
-            final_summary = response.get('content', None)
+        end_time = datetime.now()
+        if response.get("status_code") == 504:
+            raise DeadlineExceededError("최종 요약 중 요청 마감 시각 초과")
+        final_summary = response.get('content', None)
 
-            
+        # Langfuse 로깅 추가 (최종 요약)
         log_inference_to_langfuse(
             trace=trace,
             name="youtube_final_summary",
@@ -285,7 +396,7 @@ class YouTubeSummaryService:
             messages=messages,
             content=final_summary,
             model_name=self.model.loader.model_path,
-            model_parameters=log_model_parameters_final,
+            model_parameters=self._model_parameters(),
             input_tokens=None,
             output_tokens=None,
             inference_time=(end_time - start_time).total_seconds(),
@@ -295,6 +406,114 @@ class YouTubeSummaryService:
         )
 
         return final_summary
+
+    async def stream_summary(self, url: str, include_chunk_summaries: bool = False):
+        """
+        요약 진행 상황을 이벤트로 yield 하는 async generator (SSE 스트리밍 엔드포인트용)
+        - transcript: 자막 추출/정제 완료 (video_id, 글자 수, 청크 수)
+        - chunk: k번째 청크 요약 완료 (include_chunk_summaries면 청크 요약 포함)
+        - token: 최종 요약 토큰
+        - done: 최종 요약
+        Yields:
+            (event 이름, data dict)
+        Raises:
+            create_summary와 동일한 커스텀 예외
+        """
+        trace = self.langfuse.trace(
+            name="posts_youtube_stream_service",
+            input={"url": url},
+            environment=self.mode
+        )
+
+        try:
+            video_id, transcript_units, transcript_text, trace_metadata = await self._prepare_transcript(url, trace)
+
+            duplicate = await asyncio.to_thread(self._lookup_duplicate, transcript_text, trace, trace_metadata)
+            if duplicate:
+                yield "transcript", {"video_id": video_id, "chars": len(transcript_text), "chunks": 0}
+                trace.update(output={"summary": duplicate["summary"]})
+                yield "done", {"summary": duplicate["summary"], "reused": True}
+                return
+
+            summary_units = self._summary_units(transcript_units, transcript_text, trace, trace_metadata)
+            chunks, use_cdc = self._split_chunks(' '.join(summary_units), summary_units)
+            yield "transcript", {"video_id": video_id, "chars": len(transcript_text), "chunks": len(chunks)}
+
+            # 블로킹 LLM 호출은 스레드에서 실행해 진행 이벤트가 바로 전송되도록 함
+            chunk_summaries = []
+            prev_summary = None
+            prompt_builder = await asyncio.to_thread(YoutubeSummaryPrompt, self.mode)
+            for idx, chunk in enumerate(chunks):
+                content = await asyncio.to_thread(
+                    self._summarize_chunk, chunk, idx, len(chunks), prev_summary, use_cdc, prompt_builder, trace, video_id
+                )
+                chunk_summaries.append(content)
+                prev_summary = content
+                event = {"index": idx, "total": len(chunks)}
+                if include_chunk_summaries:
+                    event["summary"] = content
+                yield "chunk", event
+
+            if len(chunk_summaries) == 1:
+                final_summary = chunk_summaries[0]
+                yield "token", {"text": final_summary}
+            else:
+                check_deadline()
+                prompt_client, messages = prompt_builder.create_final_messages(chunk_summaries)
+                start_time = datetime.now()
+                pieces = []
+                async with self.model.slot("summary", video_id):
+                    stream = self.model.stream_response(messages, trace, name="final_summary", adapter_type="youtube_summary")
+                    # next와 close가 서로 다른 스레드에서 동시에 실행되지 않도록 함 (취소 시 진행 중인 next를 기다린 뒤 close)
+                    stream_lock = threading.Lock()
+
+                    def next_piece():
+                        with stream_lock:
+                            return next(stream, None)
+
+                    def close_stream():
+                        with stream_lock:
+                            stream.close()
+
+                    try:
+                        while True:
+                            piece = await asyncio.to_thread(next_piece)
+                            if piece is None:
+                                break
+                            pieces.append(piece)
+                            yield "token", {"text": piece}
+                    finally:
+                        # 클라이언트가 연결을 끊어 중간에 닫혀도 진행 중 작업 집계와 LoRA 사용 표시가 정리되도록 close
+                        # (토큰 스트리밍 백엔드인 API/원격 엔진/CPU는 close 시 생성도 중단되지만,
+                        #  vLLM 등 기본 구현은 응답 전체를 만든 뒤 한 번에 yield하므로 중단할 생성이 남아 있지 않음)
+                        await asyncio.to_thread(close_stream)
+                end_time = datetime.now()
+                final_summary = "".join(pieces)
+                log_inference_to_langfuse(
+                    trace=trace,
+                    name="youtube_final_summary",
+                    prompt=prompt_client,
+                    messages=messages,
+                    content=final_summary,
+                    model_name=self.model.loader.model_path,
+                    model_parameters=self._model_parameters(),
+                    input_tokens=None,
+                    output_tokens=None,
+                    inference_time=(end_time - start_time).total_seconds(),
+                    start_time=start_time,
+                    end_time=end_time,
+                    error=None
+                )
+
+            if self.simhash_index and final_summary:
+                await asyncio.to_thread(self.simhash_index.add, video_id, transcript_text, final_summary, self._summary_version())
+            trace.update(output={"summary": final_summary})
+            yield "done", {"summary": final_summary}
+
+        except Exception as e:
+            self.logger.error("stream_summary 실행 중 에러 발생", exc_info=True)
+            trace.update(status="error", error=str(e))
+            raise
     
 # #파일을 직접 실행할 때 사용
 # async def main():
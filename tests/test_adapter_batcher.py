@@ -0,0 +1,106 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.request_context import deadline_scope, get_deadline
+from models.adapter_batcher import AdapterBatcher, LoRASlotTracker
+from utils.error_handler import DeadlineExceededError
+
+
+def _lora(name):
+    return SimpleNamespace(lora_name=name)
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompts, sampling_params, lora_request=None):
+        self.calls.append((lora_request.lora_name, list(prompts)))
+        return [f"{lora_request.lora_name}:{prompt}" for prompt in prompts]
+
+
+def test_slot_tracker_counts_swaps():
+    slots = LoRASlotTracker(max_loras=2)
+    assert not slots.use("a") and not slots.use("b") and not slots.use("a")
+    assert slots.use("c")  # b가 LRU로 내려감
+    assert slots.is_resident("a") and not slots.is_resident("b")
+    assert slots.swaps == 1
+
+
+def test_groups_requests_by_adapter():
+    engine = FakeEngine()
+    batcher = AdapterBatcher(engine.generate, max_loras=2, window_ms=100)
+    results = {}
+
+    def worker(adapter, prompt):
+        results[prompt] = batcher.submit(prompt, "params", _lora(adapter))
+
+    threads = [threading.Thread(target=worker, args=(adapter, f"{adapter}{i}"))
+               for i in range(3) for adapter in ("summary", "bot")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert results["summary0"] == "summary:summary0" and results["bot2"] == "bot:bot2"
+    # window 안에 들어온 요청은 adapter당 한 번의 generate로 실행
+    assert sorted(len(prompts) for _, prompts in engine.calls) == [3, 3]
+    assert {adapter for adapter, _ in engine.calls} == {"summary", "bot"}
+
+
+def test_resident_adapter_runs_first_and_batches_split():
+    engine = FakeEngine()
+    batcher = AdapterBatcher(engine.generate, max_loras=1, window_ms=50, max_batch_size=2)
+    batcher.slots.use("bot")
+    items = []
+
+    def worker(adapter, prompts):
+        items.append(batcher.submit_many(prompts, "params", _lora(adapter)))
+
+    threads = [threading.Thread(target=worker, args=("summary", ["s0"])),
+               threading.Thread(target=worker, args=("bot", ["b0", "b1", "b2"]))]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert engine.calls == [("bot", ["b0", "b1"]), ("bot", ["b2"]), ("summary", ["s0"])]
+    assert batcher.slots.swaps == 1
+
+
+def test_expired_requests_are_dropped():
+    engine = FakeEngine()
+    batcher = AdapterBatcher(engine.generate, window_ms=1)
+    with deadline_scope(-1):
+        with pytest.raises(DeadlineExceededError):
+            batcher.submit("late", "params", _lora("bot"))
+    assert batcher.submit("ok", "params", _lora("bot")) == "bot:ok"
+    batcher.close()
+    assert engine.calls == [("bot", ["ok"])]
+
+
+def test_engine_sees_batch_deadline_and_can_abort():
+    seen = []
+
+    def generate(prompts, sampling_params, lora_request=None):
+        seen.append(get_deadline())
+        if prompts == ["slow"]:
+            raise DeadlineExceededError("deadline exceeded during generation")
+        return list(prompts)
+
+    batcher = AdapterBatcher(generate, window_ms=1)
+    with deadline_scope(30):
+        deadline = get_deadline()
+        assert batcher.submit("ok", "params", _lora("bot")) == "ok"
+        # 엔진이 생성 도중 마감으로 중단하면 잘린 결과 대신 호출 스레드에 예외 전달
+        with pytest.raises(DeadlineExceededError):
+            batcher.submit("slow", "params", _lora("bot"))
+    assert batcher.submit("no-deadline", "params", _lora("bot")) == "no-deadline"
+    batcher.close()
+    assert seen == [deadline, deadline, None]
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from models.artifacts import MANIFEST_NAME, ArtifactManager
+
+
+def _fake_hub(calls):
+    def download(repo_id, revision, local_dir):
+        calls.append((repo_id, revision))
+        with open(os.path.join(local_dir, "config.json"), "w") as f:
+            f.write('{"model": "%s"}' % repo_id)
+        os.makedirs(os.path.join(local_dir, ".cache"), exist_ok=True)
+        with open(os.path.join(local_dir, ".cache", "lock"), "w") as f:
+            f.write("x")
+        return local_dir
+    return download
+
+
+def test_prefetch_writes_manifest_and_reuses_cache(tmp_path):
+    calls = []
+    manager = ArtifactManager(str(tmp_path), download_fn=_fake_hub(calls))
+    paths = manager.prefetch([{"repo_id": "org/base"}, {"repo_id": "org/lora", "revision": "v2"}])
+    assert paths["org/lora"].endswith("org--lora@v2")
+    assert os.path.exists(os.path.join(paths["org/base"], MANIFEST_NAME))
+    assert manager.is_valid(paths["org/base"])
+    assert manager.timings["org/base"]["source"] == "hub"
+
+    again = ArtifactManager(str(tmp_path), download_fn=_fake_hub(calls))
+    assert again.prefetch([{"repo_id": "org/base"}]) == {"org/base": paths["org/base"]}
+    assert again.timings["org/base"]["source"] == "cache"
+    assert len(calls) == 2
+
+
+def test_corrupted_file_is_downloaded_again(tmp_path):
+    calls = []
+    manager = ArtifactManager(str(tmp_path), verify="sha256", download_fn=_fake_hub(calls))
+    local_dir = manager.fetch("org/base")
+    with open(os.path.join(local_dir, "config.json"), "w") as f:
+        f.write('{"model": "org/xxxx"}')  # 크기는 같고 내용만 다름
+    assert not manager.is_valid(local_dir)
+    manager.fetch("org/base")
+    assert len(calls) == 2 and manager.is_valid(local_dir)
+
+    os.remove(os.path.join(local_dir, "config.json"))
+    assert not ArtifactManager(str(tmp_path)).is_valid(local_dir)
+
+
+def test_offline_mode_rejects_missing_artifact(tmp_path, monkeypatch):
+    calls = []
+    manager = ArtifactManager(str(tmp_path), download_fn=_fake_hub(calls))
+    manager.fetch("org/base")
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+    assert manager.fetch("org/base").endswith("org--base@main")
+    with pytest.raises(ValueError):
+        manager.fetch("org/new-lora")
+    assert os.path.isdir(str(tmp_path)) and manager.fetch(str(tmp_path)) == str(tmp_path)
+    assert len(calls) == 1
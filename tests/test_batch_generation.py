@@ -0,0 +1,36 @@
+from core.batch_generation import generate_with_retries
+
+
+class FakeModel:
+    def __init__(self, outputs):
+        # messages 내용 -> 호출마다 돌려줄 응답 리스트
+        self.outputs = outputs
+        self.batches = []
+
+    def get_batch_responses(self, messages_list, trace, name, adapter_type):
+        self.batches.append(len(messages_list))
+        responses = []
+        for messages in messages_list:
+            output = self.outputs[messages[0]["content"]].pop(0)
+            if output is None:
+                responses.append({"status_code": 500, "error": "engine error"})
+            else:
+                responses.append({"status_code": 200, "content": output})
+        return responses
+
+
+def test_only_failed_items_are_retried():
+    model = FakeModel({
+        "a": ["봇: 첫 글"],
+        "b": ["봇: ", "봇: 두 번째 글"],
+        "c": [None, None, None, None],
+    })
+    messages_list = [[{"role": "user", "content": key}] for key in ["a", "b", "c"]]
+    clean = lambda text: text.split(":", 1)[1].strip() if ":" in text else text.strip()
+
+    results = generate_with_retries(model, messages_list, clean, None, "generate_bot_post", "social_bot")
+
+    assert results[0] == {"content": "첫 글", "attempts": 1, "error": None}
+    assert results[1] == {"content": "두 번째 글", "attempts": 2, "error": None}
+    assert results[2]["content"] is None and results[2]["attempts"] == 4 and results[2]["error"] == "engine error"
+    assert model.batches == [3, 2, 1, 1]
@@ -0,0 +1,31 @@
+from core.candidate_selector import select_best_candidate, score_candidate
+
+
+def clean(text):
+    return text.strip()
+
+
+def test_empty_candidate_is_invalid():
+    assert score_candidate("") < 0
+    assert score_candidate("   ") < 0
+
+
+def test_select_best_valid_candidate():
+    candidates = ["", "짧은 글", "오늘 점심 메뉴 추천 받아요! 학식 말고 다른 거 먹고 싶네요"]
+    idx, content, scores = select_best_candidate(candidates, clean)
+    assert idx == 2
+    assert content == candidates[2]
+    assert scores[0] < 0
+
+
+def test_copied_input_is_penalized():
+    messages = [{"role": "user", "content": "[닉네임 from 반] 오늘 날씨가 너무 좋네요 산책 가실 분"}]
+    candidates = ["오늘 날씨가 너무 좋네요 산책 가실 분", "산책 좋죠 저도 끼워주세요"]
+    idx, content, _ = select_best_candidate(candidates, clean, messages)
+    assert idx == 1
+
+
+def test_all_invalid_returns_empty():
+    idx, content, _ = select_best_candidate(["", " "], clean)
+    assert idx == -1
+    assert content == ""
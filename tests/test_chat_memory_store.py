@@ -0,0 +1,33 @@
+from core.chat_memory_store import InProcessChatMemoryStore, SQLiteChatMemoryStore
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    worker_a = SQLiteChatMemoryStore(k=5, db_path=db_path)
+    worker_b = SQLiteChatMemoryStore(k=5, db_path=db_path)
+
+    worker_a.add_message("stream1", "user", "안녕")
+    worker_a.add_message("stream1", "ai", "반가워요")
+
+    messages = worker_b.get_messages("stream1")
+    assert [m.content for m in messages] == ["안녕", "반가워요"]
+    assert "stream1" in worker_b
+    assert "stream2" not in worker_b
+
+
+def test_sqlite_store_keeps_same_window_as_in_process(tmp_path):
+    in_process = InProcessChatMemoryStore(k=2)
+    sqlite_store = SQLiteChatMemoryStore(k=2, db_path=str(tmp_path / "state.db"))
+    for i in range(7):
+        in_process.add_message("s", "user", f"msg{i}")
+        sqlite_store.add_message("s", "user", f"msg{i}")
+
+    assert [m.content for m in sqlite_store.get_messages("s")] == [m.content for m in in_process.get_messages("s")]
+
+
+def test_sqlite_store_delete(tmp_path):
+    store = SQLiteChatMemoryStore(k=5, db_path=str(tmp_path / "state.db"))
+    store.add_message("s", "user", "hello")
+    store.delete("s")
+    assert "s" not in store
+    assert store.get_messages("s") == []
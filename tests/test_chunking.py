@@ -0,0 +1,30 @@
+from core.chunking import chunk_content_hash, content_defined_chunks
+
+
+def make_units(count):
+    return [f"자막 조각 번호 {i} 에 해당하는 문장입니다" for i in range(count)]
+
+
+def test_chunks_respect_max_chars_and_keep_content():
+    units = make_units(2000)
+    chunks = content_defined_chunks(units, max_chars=6500, min_chars=2000)
+    assert all(len(chunk) <= 6500 for chunk in chunks)
+    assert " ".join(chunks) == " ".join(units)
+
+
+def test_insertion_near_start_keeps_later_chunks():
+    units = make_units(2000)
+    edited = units[:10] + ["새로 삽입된 문장"] + units[10:]
+
+    original_hashes = {chunk_content_hash(c) for c in content_defined_chunks(units)}
+    edited_hashes = [chunk_content_hash(c) for c in content_defined_chunks(edited)]
+
+    # 앞부분 청크를 제외한 대부분의 청크가 그대로 재사용 가능해야 함
+    reused = sum(1 for h in edited_hashes if h in original_hashes)
+    assert reused >= len(edited_hashes) - 2
+
+
+def test_oversized_unit_is_split():
+    chunks = content_defined_chunks(["가" * 15000], max_chars=6500)
+    assert all(len(chunk) <= 6500 for chunk in chunks)
+    assert "".join(chunks) == "가" * 15000
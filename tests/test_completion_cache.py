@@ -0,0 +1,33 @@
+from core.cache import CompletionCache
+
+MESSAGES = [{"role": "system", "content": "요약해줘"}, {"role": "user", "content": "본문"}]
+PARAMS = {"temperature": 0.5, "top_p": 0.5, "max_tokens": 256, "stop": ["\n"]}
+
+
+def test_key_is_canonical():
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    key1 = CompletionCache.make_key(MESSAGES, PARAMS, "youtube_summary", "model")
+    key2 = CompletionCache.make_key(reordered, dict(reversed(list(PARAMS.items()))), "youtube_summary", "model")
+    assert key1 == key2
+    assert key1 != CompletionCache.make_key(MESSAGES, PARAMS, "social_bot", "model")
+    # adapter 버전이 바뀌면 다른 key
+    assert key1 != CompletionCache.make_key(MESSAGES, PARAMS, "youtube_summary", "model", "article_summary:org/summary@v2")
+
+
+def test_policy_by_endpoint_and_temperature():
+    cache = CompletionCache(endpoints=["final_summary"], max_temperature=0.3)
+    assert not cache.is_cacheable("final_summary", 0.5)
+    assert cache.is_cacheable("final_summary", 0.0)
+    assert not cache.is_cacheable("generate_bot_post", 0.0)
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    key = CompletionCache.make_key(MESSAGES, PARAMS, "youtube_summary", "model")
+    first = CompletionCache(endpoints=["final_summary"], disk_dir=str(tmp_path))
+    assert first.get(key) is None
+    first.set(key, {"status_code": 200, "content": "요약"})
+
+    second = CompletionCache(endpoints=["final_summary"], disk_dir=str(tmp_path))
+    assert second.get(key) == {"status_code": 200, "content": "요약"}
+    # 디스크 hit 이후에는 메모리에서 조회됨
+    assert key in second.memory
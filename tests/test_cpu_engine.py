@@ -0,0 +1,45 @@
+from models.adapter_batcher import AdapterBatcher
+from models.cpu_engine import CPULoRARequest, CPUSamplingParams, PrefixKVCache, truncate_at_stop
+
+
+def test_truncate_at_earliest_stop():
+    assert truncate_at_stop("안녕하세요\n반가워요</s>", ["</s>", "\n"]) == "안녕하세요"
+    assert truncate_at_stop("stop 없음", ["\n\n"]) == "stop 없음"
+    assert truncate_at_stop("", []) == ""
+
+
+def test_prefix_cache_returns_copies_and_evicts_lru():
+    cache = PrefixKVCache(max_entries=2)
+    cache.put(("sns-1", (1, 2)), [1, 2])
+    cache.put(("summary-2", (3,)), [3])
+    copied = cache.get(("sns-1", (1, 2)))
+    copied.append(99)  # generate가 cache를 이어 써도 원본은 그대로
+    assert cache.get(("sns-1", (1, 2))) == [1, 2]
+
+    cache.put(("sns-1", (4,)), [4])  # 가장 오래 사용하지 않은 summary-2가 빠짐
+    assert cache.get(("summary-2", (3,))) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    cache.drop_adapter("sns-1")
+    assert not cache.entries
+
+
+def test_versions_batch_separately_with_adapter_batcher():
+    calls = []
+
+    def generate(prompts, sampling_params, lora_request=None):
+        calls.append((lora_request.adapter_name, list(prompts)))
+        return [f"{lora_request.adapter_name}:{prompt}" for prompt in prompts]
+
+    batcher = AdapterBatcher(generate, max_loras=1, window_ms=20)
+    params = CPUSamplingParams(temperature=0.5, top_p=0.5, max_tokens=16, stop=["\n"])
+    old, new = CPULoRARequest("sns_chat", 1, "/a"), CPULoRARequest("sns_chat", 2, "/b")
+    try:
+        assert batcher.submit_many([("p1", "prefix"), ("p2", "prefix")], params, old) == [
+            "sns_chat-1:('p1', 'prefix')", "sns_chat-1:('p2', 'prefix')"
+        ]
+        assert batcher.submit("p3", params, new) == "sns_chat-2:p3"
+    finally:
+        batcher.close()
+    assert [name for name, _ in calls] == ["sns_chat-1", "sns_chat-2"]
+    assert batcher.slots.swaps == 1
@@ -0,0 +1,92 @@
+import asyncio
+
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+
+from core.drain import DrainController, DrainMiddleware
+from core.sse_manager import SSEManager
+
+
+def test_waits_for_in_flight_work_then_runs_hooks():
+    events = []
+
+    async def run():
+        controller = DrainController(grace_seconds=5, poll_interval=0.01)
+        jobs = {"count": 2}
+        controller.register("summary_jobs", lambda: jobs["count"])
+        controller.on_start(lambda: events.append("start"))
+
+        async def drained_hook():
+            events.append(("drained", jobs["count"]))
+        controller.on_drained(drained_hook)
+
+        async def finish_jobs():
+            for _ in range(2):
+                await asyncio.sleep(0.05)
+                jobs["count"] -= 1
+        asyncio.create_task(finish_jobs())
+        # 여러 곳에서 호출해도 한 번만 실행
+        results = await asyncio.gather(controller.drain(), controller.drain())
+        return controller, results
+
+    controller, results = asyncio.run(run())
+    assert results == [True, True]
+    assert events == ["start", ("drained", 0)]
+    assert controller.status()["drained"] is True
+
+
+def test_gives_up_after_grace_period():
+    async def run():
+        controller = DrainController(grace_seconds=0.1, poll_interval=0.01)
+        controller.register("model", lambda: 1)
+        return controller, await controller.drain()
+
+    controller, drained = asyncio.run(run())
+    assert drained is False
+    assert controller.status()["in_flight"]["model"] == 1
+    assert 0.1 <= controller.status()["elapsed_seconds"] < 1
+
+
+def test_middleware_rejects_new_work_while_draining():
+    controller = DrainController(grace_seconds=0)
+    seen = []
+    app = FastAPI()
+    app.add_middleware(DrainMiddleware, controller=controller)
+
+    @app.post("/chat")
+    def chat(background_tasks: BackgroundTasks):
+        background_tasks.add_task(lambda: seen.append(controller.active_requests))
+        return {"message": "ok"}
+
+    @app.get("/posts/youtube/summary/jobs/{job_id}")
+    def job(job_id: str):
+        return {"job_id": job_id}
+
+    @app.get("/health/ready")
+    def ready():
+        return {"status": "ready"}
+
+    client = TestClient(app)
+    assert client.post("/chat").status_code == 200
+    # 응답 이후 실행되는 background task도 진행 중인 요청으로 집계
+    assert seen == [1] and controller.active_requests == 0
+
+    controller.draining = True
+    response = client.post("/chat")
+    assert response.status_code == 503 and response.json()["error"] == "draining"
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/posts/youtube/summary/jobs/abc").status_code == 200
+    assert client.get("/health/ready").status_code == 200
+
+
+def test_sse_connections_receive_reconnect_event():
+    async def run():
+        manager = SSEManager()
+        queue = await manager.connect("client-1")
+        closed = await manager.close_connections(retry_ms=500)
+        return closed, await queue.get(), await queue.get()
+
+    closed, event, sentinel = asyncio.run(run())
+    assert closed == 1
+    assert event.startswith("event: reconnect\nretry: 500\n") and event.endswith("\n\n")
+    assert sentinel is None
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from core.request_context import get_deadline
+from models.engine_server import EngineServer
+
+
+class FakeModel:
+    mode = "gcp-dev"
+    loader = SimpleNamespace(model_path="base", temperature=0.5, top_p=0.5, max_tokens=16, stop=[])
+
+    def __init__(self):
+        self.batch_done = threading.Event()
+        self.deadlines = []
+
+    def get_batch_responses(self, messages_list, trace, name, adapter_type):
+        self.deadlines.append(get_deadline())
+        self.batch_done.set()
+        return [{"status_code": 200, "content": messages[0]["content"]} for messages in messages_list]
+
+    def stream_response(self, messages, trace, name, adapter_type):
+        yield "first"
+        # batch가 실행될 때까지 stream이 끝나지 않음 (같은 스레드를 쓰면 교착)
+        assert self.batch_done.wait(2)
+        yield "second"
+
+
+def make_server():
+    server = EngineServer(FakeModel(), "inproc://engine-test", batch_window_ms=1)
+    server.pending = asyncio.Queue()
+    server.replies = []
+
+    async def reply(identity, request_id, reply_type, data=None, error=None):
+        server.replies.append((request_id, reply_type, error or data))
+    server._reply = reply
+    return server
+
+
+def _generate(request_id):
+    return {"op": "generate", "id": request_id, "messages": [{"role": "user", "content": request_id}]}
+
+
+def test_abort_only_tracks_pending_requests():
+    async def scenario():
+        server = make_server()
+        # 이미 끝난 요청의 abort는 기록하지 않음
+        await server._dispatch(b"client", {"op": "abort", "id": "a0", "target": "finished"})
+        assert server.aborted == set()
+
+        await server._dispatch(b"client", _generate("g1"))
+        await server._dispatch(b"client", _generate("g2"))
+        await server._dispatch(b"client", {"op": "abort", "id": "a1", "target": "g1"})
+        assert server.aborted == {"g1"}
+
+        batch_task = asyncio.create_task(server._batch_loop())
+        await asyncio.sleep(0.05)
+        batch_task.cancel()
+        assert ("g1", "error", "aborted") in server.replies
+        assert ("g2", "result", {"status_code": 200, "content": "g2"}) in server.replies
+        assert server.aborted == set() and server.pending_ids == set()
+
+    asyncio.run(scenario())
+
+
+def test_stream_does_not_block_batches():
+    async def scenario():
+        server = make_server()
+        batch_task = asyncio.create_task(server._batch_loop())
+        stream = asyncio.create_task(server._dispatch(b"client", {"op": "stream", "id": "s1", "messages": []}))
+        await asyncio.sleep(0.01)
+        await server._dispatch(b"client", _generate("g1"))
+        await asyncio.wait_for(stream, 3)
+        batch_task.cancel()
+        assert [reply for reply in server.replies if reply[0] == "s1"] == [
+            ("s1", "chunk", "first"), ("s1", "chunk", "second"), ("s1", "end", None)
+        ]
+        assert ("g1", "result", {"status_code": 200, "content": "g1"}) in server.replies
+
+    asyncio.run(scenario())
+
+
+def test_batch_runs_with_latest_request_deadline():
+    async def scenario():
+        server = make_server()
+        now = time.time()
+        await server._dispatch(b"client", {**_generate("g1"), "deadline": now + 30})
+        await server._dispatch(b"client", {**_generate("g2"), "deadline": now + 60})
+        batch_task = asyncio.create_task(server._batch_loop())
+        await asyncio.sleep(0.05)
+        await server._dispatch(b"client", {"op": "batch", "id": "b1", "messages_list": [[]]})
+        batch_task.cancel()
+        assert server.model.deadlines == [now + 60, None]
+
+    asyncio.run(scenario())
@@ -0,0 +1,37 @@
+from core.extractive import extractive_compress, split_segments, textrank_scores
+
+
+def test_split_segments_respects_length():
+    units = ["가나다라마바사"] * 100
+    segments = split_segments(units, segment_chars=50)
+    assert all(len(segment) <= 60 for segment in segments)
+    assert " ".join(segments) == " ".join(units)
+
+
+def test_textrank_prefers_central_sentences():
+    segments = [
+        "파이썬 리스트 컴프리헨션 문법을 배웁니다",
+        "리스트 컴프리헨션은 파이썬에서 리스트를 만드는 문법입니다",
+        "파이썬 리스트 컴프리헨션 예제를 봅시다",
+        "오늘 점심은 김치찌개였습니다",
+    ]
+    scores = textrank_scores(segments)
+    assert scores.argmin() == 3
+    assert abs(scores.sum() - 1) < 1e-6
+
+
+def test_extractive_compress_budget_and_order():
+    units = [f"{topic} 관련 설명 문장 {i}입니다." for i in range(50) for topic in ["파이썬 리스트", "점심 메뉴"]]
+    selected, stats = extractive_compress(units, budget_chars=300, segment_chars=40)
+    assert stats["compressed_chars"] <= 300
+    assert stats["selected_segments"] < stats["segments"]
+    segments = split_segments(units, 40)
+    positions = [segments.index(segment) for segment in selected]
+    assert positions == sorted(positions)
+
+
+def test_short_transcript_unchanged():
+    units = ["짧은 자막입니다."]
+    selected, stats = extractive_compress(units, budget_chars=1000)
+    assert selected == units
+    assert stats["compressed_chars"] == stats["original_chars"]
@@ -0,0 +1,34 @@
+from core.hash_ring import ConsistentHashRing
+
+NODES = ["http://a:8000", "http://b:8000", "http://c:8000"]
+
+
+def test_same_key_routes_to_same_node():
+    ring = ConsistentHashRing(NODES)
+    assert ring.get_node("stream:42") == ring.get_node("stream:42")
+
+
+def test_removing_node_only_moves_its_keys():
+    ring = ConsistentHashRing(NODES)
+    keys = [f"stream:{i}" for i in range(1000)]
+    before = {key: ring.get_node(key) for key in keys}
+
+    ring.remove_node("http://b:8000")
+    after = {key: ring.get_node(key) for key in keys}
+
+    for key in keys:
+        if before[key] != "http://b:8000":
+            assert after[key] == before[key]
+        assert after[key] != "http://b:8000"
+
+
+def test_bounded_load_spills_to_next_node():
+    ring = ConsistentHashRing(NODES, load_factor=1.0)
+    owner = ring.get_node("video:abc")
+    loads = {node: 0 for node in NODES}
+    loads[owner] = 10
+    assert ring.get_node("video:abc", loads) != owner
+
+
+def test_empty_ring_returns_none():
+    assert ConsistentHashRing().get_node("stream:1") is None
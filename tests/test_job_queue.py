@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.job_queue import JobQueue, JobStore, is_allowed_callback_url
+
+
+def test_jobs_are_processed_and_callbacks_batched(tmp_path):
+    received = []
+
+    async def handler(payload):
+        if payload["url"] == "bad":
+            return False, {"error": "invalid_format"}
+        return True, {"summary": payload["url"] + " 요약"}
+
+    def callback(request):
+        received.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    async def run():
+        queue = JobQueue(JobStore(str(tmp_path / "jobs.db")), "youtube_summary", handler,
+                         workers=2, poll_interval=0.05, callback_interval=0.05,
+                         callback_allowed_hosts=["backend"], callback_allowed_schemes=["http"])
+        await queue.start()
+        queue._client = httpx.AsyncClient(transport=httpx.MockTransport(callback))
+        jobs = [
+            queue.submit({"url": "a"}, "http://backend/callback"),
+            queue.submit({"url": "bad"}, "http://backend/callback"),
+            queue.submit({"url": "c"})
+        ]
+        for _ in range(100):
+            if all(queue.get(job["job_id"])["status"] in ("succeeded", "failed") for job in jobs) and received:
+                break
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.1)
+        await queue.stop()
+        return [queue.get(job["job_id"]) for job in jobs]
+
+    a, bad, c = asyncio.run(run())
+    assert a["status"] == "succeeded" and a["result"] == {"summary": "a 요약"}
+    assert bad["status"] == "failed" and bad["error"] == {"error": "invalid_format"}
+    assert c["status"] == "succeeded"
+    sent = [job["job_id"] for body in received for job in body["jobs"]]
+    assert sorted(sent) == sorted([a["job_id"], bad["job_id"]])
+
+
+def test_expired_running_job_is_reclaimed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.create("youtube_summary", {"url": "a"})
+    assert store.claim_next("youtube_summary", "worker-1", lease=60)["job_id"] == job["job_id"]
+    assert store.claim_next("youtube_summary", "worker-2", lease=60) is None
+    # heartbeat가 끊긴 작업(lease 만료)은 다른 워커가 다시 가져감
+    assert store.claim_next("youtube_summary", "worker-2", lease=-1)["job_id"] == job["job_id"]
+    # 늦게 끝난 이전 워커는 결과를 덮어쓰지 못함
+    assert not store.finish(job["job_id"], "worker-1", False, {"error": "stale"})
+    assert store.finish(job["job_id"], "worker-2", True, {"summary": "요약"})
+    assert store.get(job["job_id"])["result"] == {"summary": "요약"}
+
+
+def test_job_fails_after_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.create("youtube_summary", {"url": "a"}, "http://backend/callback")
+    for worker in ("worker-1", "worker-2"):
+        assert store.fail_exhausted("youtube_summary", -1, 2) == []
+        assert store.claim_next("youtube_summary", worker, lease=-1, max_attempts=2)["job_id"] == job["job_id"]
+    # 두 번 가져갔지만 끝나지 않은 작업은 다시 가져가지 않고 failed 처리
+    assert store.claim_next("youtube_summary", "worker-3", lease=-1, max_attempts=2) is None
+    failed = store.fail_exhausted("youtube_summary", -1, 2)
+    assert [f["job_id"] for f in failed] == [job["job_id"]]
+    assert failed[0]["status"] == "failed" and failed[0]["error"]["error"] == "max_attempts_exceeded"
+    assert store.pending_callbacks("youtube_summary")[0]["job_id"] == job["job_id"]
+
+
+def test_failed_callbacks_are_requeued_with_backoff(tmp_path):
+    attempts = []
+
+    async def handler(payload):
+        return True, {"summary": "요약"}
+
+    def callback(request):
+        attempts.append(json.loads(request.content))
+        return httpx.Response(503 if len(attempts) < 3 else 200)
+
+    async def run():
+        queue = JobQueue(JobStore(str(tmp_path / "jobs.db")), "youtube_summary", handler, poll_interval=0.05,
+                         callback_interval=0.02, callback_retries=1, callback_max_backoff=0.05,
+                         callback_allowed_hosts=["backend"], callback_allowed_schemes=["http"])
+        await queue.start()
+        queue._client = httpx.AsyncClient(transport=httpx.MockTransport(callback))
+        job = queue.submit({"url": "a"}, "http://backend/callback")
+        for _ in range(100):
+            if not queue.store.pending_callbacks("youtube_summary") and len(attempts) >= 3:
+                break
+            await asyncio.sleep(0.02)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    # 두 번 실패한 callback도 버리지 않고 다시 보내 전송 완료 처리
+    assert len(attempts) == 3 and attempts[-1]["jobs"][0]["job_id"] == job["job_id"]
+
+
+def test_callback_url_allowlist(tmp_path):
+    allowed = [".tenten.example", "backend"]
+    assert is_allowed_callback_url("https://api.tenten.example/jobs", allowed)
+    assert is_allowed_callback_url("https://tenten.example/jobs", allowed)
+    assert is_allowed_callback_url("https://backend:8443/jobs", allowed)
+    assert not is_allowed_callback_url("http://backend/jobs", allowed)  # scheme 불일치
+    assert not is_allowed_callback_url("https://tenten.example.evil.com/jobs", allowed)
+    assert not is_allowed_callback_url("https://169.254.169.254/latest/meta-data", allowed)
+    assert not is_allowed_callback_url("file:///etc/passwd", allowed)
+
+    async def handler(payload):
+        return True, {}
+
+    queue = JobQueue(JobStore(str(tmp_path / "jobs.db")), "youtube_summary", handler)
+    with pytest.raises(ValueError):
+        queue.submit({"url": "a"}, "https://backend/jobs")  # 허용 목록이 비어 있으면 callback 사용 불가
+    assert queue.submit({"url": "a"})["status"] == "queued"
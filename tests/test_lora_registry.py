@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from models.lora_registry import LoRARegistry, validate_adapter
+
+
+def _request(lora_name, lora_int_id, lora_path):
+    return SimpleNamespace(lora_name=lora_name, lora_int_id=lora_int_id, lora_path=lora_path)
+
+
+def _registry(unloaded=None, drain_timeout=5):
+    return LoRARegistry(
+        _request,
+        unload_fn=(unloaded.append if unloaded is not None else None),
+        download_fn=lambda path, revision: f"/cache/{path}@{revision or 'main'}",
+        validate_fn=lambda local_path: None,
+        drain_timeout=drain_timeout
+    )
+
+
+SPECS = [
+    {"adapter_type": "youtube_summary", "lora_name": "article_summary", "path": "org/summary"},
+    {"adapter_type": "social_bot", "lora_name": "sns_chat", "path": "org/bot"},
+]
+
+
+def test_preload_and_use():
+    registry = _registry()
+    registry.preload(SPECS)
+    assert registry.get("social_bot").lora_path == "/cache/org/bot@main"
+    assert {registry.get(spec["adapter_type"]).lora_int_id for spec in SPECS} == {1, 2}
+    with registry.use("youtube_summary") as lora_request:
+        assert lora_request.lora_name == "article_summary"
+        assert registry.list_adapters()["adapters"][0]["in_flight"] == 1
+    info = registry.list_adapters()["adapters"][0]
+    assert info["in_flight"] == 0 and info["requests"] == 1
+    with pytest.raises(ValueError):
+        with registry.use("unknown"):
+            pass
+
+
+def test_swap_drains_previous_version():
+    unloaded = []
+    registry = _registry(unloaded)
+    registry.preload(SPECS[:1])
+    assert registry.version_key("youtube_summary") == "article_summary:org/summary@main"
+    release = threading.Event()
+
+    def in_flight_request():
+        with registry.use("youtube_summary"):
+            release.wait(1)
+
+    worker = threading.Thread(target=in_flight_request)
+    worker.start()
+    time.sleep(0.05)
+    threading.Timer(0.1, release.set).start()
+    result = registry.swap({**SPECS[0], "revision": "v2"})
+    worker.join()
+
+    # 새 버전은 새 id, 이전 버전은 진행 중인 요청이 끝난 뒤 엔진에서 내림
+    assert result["drained"] and result["lora_int_id"] == 2 and result["previous"]["lora_int_id"] == 1
+    assert registry.get("youtube_summary").lora_path == "/cache/org/summary@v2"
+    assert registry.version_key("youtube_summary") == "article_summary:org/summary@v2"
+    assert unloaded == [1]
+
+
+def test_add_and_remove():
+    unloaded = []
+    registry = _registry(unloaded)
+    registry.preload(SPECS)
+    with pytest.raises(ValueError):
+        registry.add(SPECS[0])
+    registry.add({"adapter_type": "translation", "lora_name": "translate", "path": "org/translate"})
+    assert registry.get("translation").lora_int_id == 3
+    result = registry.remove("social_bot")
+    assert result["drained"] and unloaded == [2] and registry.get("social_bot") is None
+    with pytest.raises(ValueError):
+        registry.remove("social_bot")
+
+
+def test_failed_swap_keeps_previous_version():
+    registry = _registry()
+    registry.preload(SPECS[:1])
+
+    def failing_validate(local_path):
+        raise ValueError("adapter weights not found")
+
+    registry.validate_fn = failing_validate
+    with pytest.raises(ValueError):
+        registry.swap({**SPECS[0], "revision": "broken"})
+    assert registry.get("youtube_summary").lora_int_id == 1
+
+
+def test_validate_adapter(tmp_path):
+    with pytest.raises(ValueError):
+        validate_adapter(str(tmp_path))
+    (tmp_path / "adapter_config.json").write_text(json.dumps({"r": 8}))
+    with pytest.raises(ValueError):
+        validate_adapter(str(tmp_path))
+    (tmp_path / "adapter_model.safetensors").write_bytes(b"")
+    validate_adapter(str(tmp_path))
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from collections import deque
+from types import SimpleNamespace
+
+from core.pregen_pool import PregenPool
+
+
+def make_request(board_type, words):
+    return SimpleNamespace(board_type=board_type, posts=[SimpleNamespace(content=word) for word in words])
+
+
+def test_fills_when_idle_and_serves_similar_context():
+    idle = {"value": True}
+    generated = []
+
+    def generate(request):
+        generated.append(request.board_type)
+        return f"{request.board_type} 게시글 {len(generated)}"
+
+    async def run():
+        pool = PregenPool(generate, lambda: idle["value"], size=2, fill_interval=0.02)
+        await pool.start()
+        pool.observe(make_request("free", ["오늘 점심 뭐 먹지", "시험 공부 중"]))
+        for _ in range(100):
+            if len(pool.pools.get("free", ())) == 2:
+                break
+            await asyncio.sleep(0.01)
+        # 유휴 상태가 아니면 더 채우지 않음
+        idle["value"] = False
+        hit = pool.take(make_request("free", ["오늘 점심 뭐 먹지", "시험 공부 중", "배고파"]))
+        miss = pool.take(make_request("free", ["완전히 다른 이야기"]))
+        await asyncio.sleep(0.05)
+        await pool.stop()
+        return pool, hit, miss
+
+    pool, hit, miss = asyncio.run(run())
+    assert hit == "free 게시글 1"
+    assert miss is None
+    assert len(generated) == 2
+    assert len(pool.pools["free"]) == 1
+
+
+def test_expired_entries_are_not_served():
+    pool = PregenPool(lambda request: None, lambda: True, size=1, max_age=10)
+    request = make_request("free", ["안녕"])
+    pool.observe(request)
+    pool.pools["free"] = deque([
+        {"content": "오래된 게시글", "tokens": frozenset({"안녕"}), "created_at": time.time() - 60}
+    ])
+    assert pool.take(request) is None
+
+
+def test_empty_generation_waits_before_retrying():
+    calls = []
+
+    async def run():
+        pool = PregenPool(lambda request: calls.append(request) or None, lambda: True, size=1, fill_interval=10)
+        await pool.start()
+        pool.observe(make_request("free", ["안녕"]))
+        await asyncio.sleep(0.1)
+        await pool.stop()
+
+    asyncio.run(run())
+    assert len(calls) == 1
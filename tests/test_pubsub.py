@@ -0,0 +1,135 @@
+import asyncio
+import fnmatch
+
+from core.pubsub import InMemoryBroker, RedisBroker
+from core.sse_manager import SSEManager
+
+
+class FakeRedisServer:
+    """PUBLISH / PSUBSCRIBE만 지원하는 로컬 RESP 서버 (테스트용 stand-in)"""
+    def __init__(self):
+        self.subscribers = []  # (pattern, writer)
+        self.writers = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for writer in self.writers:
+            writer.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    def bulk(value):
+        data = value.encode("utf-8")
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    async def read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2].decode("utf-8"))
+        return args
+
+    async def handle(self, reader, writer):
+        self.writers.append(writer)
+        while True:
+            command = await self.read_command(reader)
+            if command is None:
+                break
+            name = command[0].upper()
+            if name == "PSUBSCRIBE":
+                self.subscribers.append((command[1], writer))
+                writer.write(b"*3\r\n" + self.bulk("psubscribe") + self.bulk(command[1]) + b":1\r\n")
+            elif name == "PUBLISH":
+                receivers = 0
+                for pattern, subscriber in self.subscribers:
+                    if fnmatch.fnmatchcase(command[1], pattern):
+                        subscriber.write(
+                            b"*4\r\n" + self.bulk("pmessage") + self.bulk(pattern)
+                            + self.bulk(command[1]) + self.bulk(command[2])
+                        )
+                        receivers += 1
+                writer.write(b":%d\r\n" % receivers)
+            await writer.drain()
+
+
+async def collect(queue, count):
+    return [await asyncio.wait_for(queue.get(), 2) for _ in range(count)]
+
+
+def test_in_memory_broker_pattern_subscription():
+    async def scenario():
+        broker = InMemoryBroker()
+        received = []
+
+        async def handler(channel, message):
+            received.append((channel, message))
+
+        await broker.subscribe("stream:*", handler)
+        await broker.publish("stream:1", "a")
+        await broker.publish("other:1", "b")
+        return received
+
+    assert asyncio.run(scenario()) == [("stream:1", "a")]
+
+
+def test_sse_fan_out_across_replicas_over_redis_protocol():
+    async def scenario():
+        server = FakeRedisServer()
+        port = await server.start()
+        replica_a = SSEManager()
+        replica_b = SSEManager()
+        await replica_a.start(RedisBroker(f"redis://127.0.0.1:{port}/0"))
+        await replica_b.start(RedisBroker(f"redis://127.0.0.1:{port}/0"))
+        queue = await replica_b.connect("client-on-b")
+
+        await replica_a.broadcast_batch([f"token{i}" for i in range(20)], stream_id="s1")
+        await replica_a.broadcast("done", stream_id="s1")
+        messages = await collect(queue, 21)
+
+        await replica_a.stop()
+        await replica_b.stop()
+        await server.stop()
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert messages == [f"token{i}" for i in range(20)] + ["done"]
+
+
+def test_duplicate_sequence_is_dropped():
+    async def scenario():
+        manager = SSEManager()
+        await manager.start(InMemoryBroker())
+        queue = await manager.connect("client")
+        envelope = manager._envelope("s1", "hello")
+        await manager.broker.publish("stream:s1", envelope)
+        await manager.broker.publish("stream:s1", envelope)
+        return queue.qsize()
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_publish_sequence_state_is_released():
+    async def scenario():
+        manager = SSEManager(stream_ttl=0.05)
+        await manager.start(InMemoryBroker())
+        await manager.connect("client")
+        manager._envelope("s1", "hello")
+        await asyncio.sleep(0.1)
+        manager._envelope("s2", "hello")
+        # s1은 TTL 동안 발행이 없어 정리됨
+        assert list(manager.publish_seq) == ["s2"]
+        # 로컬 구독자가 모두 끊겨도 다른 replica의 구독자를 위해 진행 중인 스트림의 시퀀스는 유지
+        manager.disconnect("client")
+        assert list(manager.publish_seq) == ["s2"]
+        manager.forget_stream("s2")
+        assert not manager.publish_seq
+
+    asyncio.run(scenario())
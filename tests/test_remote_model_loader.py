@@ -0,0 +1,47 @@
+import threading
+
+import msgspec
+import zmq
+
+from models.model_loader import RemoteModelLoader
+
+_INFO = {"mode": "gcp-dev", "model_path": "base", "temperature": 0.5, "top_p": 0.5, "max_tokens": 16, "stop": []}
+
+
+class FakeEngine:
+    """info에만 응답하고 generate는 응답하지 않는 엔진 워커 (받은 요청을 기록)"""
+    def __init__(self, address):
+        self.received = []
+        self.aborted = threading.Event()
+        self._socket = zmq.Context.instance().socket(zmq.ROUTER)
+        self._socket.bind(address)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        encoder, decoder = msgspec.msgpack.Encoder(), msgspec.msgpack.Decoder()
+        while self._socket.poll(5000):
+            identity, payload = self._socket.recv_multipart()
+            request = decoder.decode(payload)
+            self.received.append(request)
+            if request["op"] == "info":
+                self._socket.send_multipart([identity, encoder.encode({"id": request["id"], "type": "result", "data": _INFO})])
+            elif request["op"] == "abort":
+                self.aborted.set()
+                break
+        self._socket.close(linger=0)
+
+
+def test_engine_receives_abort_after_client_timeout(tmp_path):
+    address = f"ipc://{tmp_path}/engine.sock"
+    engine = FakeEngine(address)
+    loader = RemoteModelLoader(address, timeout=0.2)
+
+    response = loader.get_response([{"role": "user", "content": "hi"}], None)
+
+    assert response["status_code"] == 500 and response["error"] == "engine worker timeout"
+    assert engine.aborted.wait(5)
+    generate, abort = engine.received[1], engine.received[-1]
+    assert generate["op"] == "generate" and abort["target"] == generate["id"]
+    # 다음 요청은 새 소켓으로 전송
+    assert loader._local.socket is None
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from core.request_context import (
+    DeadlineMiddleware, check_deadline, deadline_scope, get_deadline, has_budget, min_timeout,
+    parse_deadline_defaults, remaining
+)
+from core.scheduler import RequestScheduler
+from utils.error_handler import DeadlineExceededError
+
+
+def test_deadline_scope():
+    assert remaining() is None
+    with deadline_scope(10):
+        assert 9 < remaining() <= 10
+        assert has_budget(5) and not has_budget(20)
+        assert min_timeout(120) <= 10
+        assert min_timeout(1) == 1
+    assert get_deadline() is None
+
+    with deadline_scope(-1):
+        with pytest.raises(DeadlineExceededError):
+            check_deadline()
+        assert min_timeout(None) == 0
+
+
+def _resolve(middleware, path, headers=()):
+    return middleware._resolve({"type": "http", "path": path, "headers": list(headers)})
+
+
+def test_middleware_resolve():
+    middleware = DeadlineMiddleware(None, parse_deadline_defaults("/chat/stream=0,/chat=120,/posts/bot=30"))
+    now = time.time()
+    assert _resolve(middleware, "/chat/stream") is None
+    assert 119 < _resolve(middleware, "/chat") - now <= 121
+    assert _resolve(middleware, "/unknown") is None
+    # 헤더 값이 기본값보다 짧으면 헤더 값 사용, 길면 기본값으로 제한
+    assert 4 < _resolve(middleware, "/posts/bot", [(b"x-request-timeout-ms", b"5000")]) - now <= 6
+    assert 29 < _resolve(middleware, "/posts/bot", [(b"x-request-timeout-ms", b"60000")]) - now <= 31
+    assert _resolve(middleware, "/unknown", [(b"x-request-deadline", str(now + 3).encode())]) == pytest.approx(now + 3)
+    assert _resolve(middleware, "/unknown", [(b"x-request-timeout-ms", b"abc")]) is None
+
+
+def test_middleware_sets_context():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(remaining())
+
+    middleware = DeadlineMiddleware(app, {"/chat": 60})
+    asyncio.run(middleware({"type": "http", "path": "/chat", "headers": []}, None, None))
+    assert 59 < seen[0] <= 60
+    assert get_deadline() is None
+
+
+def test_scheduler_drops_expired():
+    async def run():
+        scheduler = RequestScheduler(max_concurrency=1)
+        await scheduler.acquire("summary", "holder")
+
+        # 대기 중에 마감이 지나면 DeadlineExceededError, 슬롯은 다음 요청에 넘어감
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceededError):
+                await scheduler.acquire("chat", "late")
+        waiter = asyncio.create_task(scheduler.acquire("posts", "ok"))
+        await asyncio.sleep(0)
+        scheduler.release("summary")
+        await asyncio.wait_for(waiter, 1)
+        assert scheduler.in_flight["posts"] == 1 and scheduler.in_flight["chat"] == 0
+        scheduler.release("posts")
+
+        with pytest.raises(DeadlineExceededError):
+            await scheduler.acquire("chat", deadline=time.time() - 1)
+
+    asyncio.run(run())
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+from core.scheduler import RequestScheduler, parse_class_limits
+
+
+async def _run_in_order(scheduler, requests, hold_class="summary"):
+    """hold_class 슬롯을 잡은 상태에서 requests를 대기시킨 뒤, 실행 순서를 반환"""
+    order = []
+    await scheduler.acquire(hold_class, "holder")
+
+    async def worker(request_class, key, label):
+        async with scheduler.slot(request_class, key):
+            order.append(label)
+
+    tasks = []
+    for request_class, key, label in requests:
+        tasks.append(asyncio.create_task(worker(request_class, key, label)))
+        await asyncio.sleep(0)
+    scheduler.release(hold_class)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_priority_classes():
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = asyncio.run(_run_in_order(scheduler, [
+        ("batch", None, "batch"), ("posts", None, "posts"), ("chat", None, "chat"), ("recomments", None, "recomments")
+    ]))
+    assert order == ["chat", "recomments", "posts", "batch"]
+
+
+def test_fair_queuing_across_keys():
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = asyncio.run(_run_in_order(scheduler, [
+        ("posts", "A", "A1"), ("posts", "A", "A2"), ("posts", "A", "A3"), ("posts", "B", "B1")
+    ]))
+    assert order == ["A1", "B1", "A2", "A3"]
+
+
+def test_class_bulkhead():
+    async def run():
+        scheduler = RequestScheduler(max_concurrency=4, class_limits={"summary": 1})
+        await scheduler.acquire("summary")
+        waiting = asyncio.create_task(scheduler.acquire("summary"))
+        await asyncio.sleep(0.01)
+        blocked = not waiting.done()
+        # 다른 클래스는 남은 슬롯을 사용
+        await asyncio.wait_for(scheduler.acquire("chat"), timeout=1)
+        scheduler.release("summary")
+        await asyncio.wait_for(waiting, timeout=1)
+        return blocked
+
+    assert asyncio.run(run())
+
+
+def test_aging_prevents_starvation():
+    async def run():
+        scheduler = RequestScheduler(max_concurrency=1, aging_seconds=0.01)
+        order = []
+        await scheduler.acquire("chat", "holder")
+
+        async def worker(request_class, label):
+            async with scheduler.slot(request_class):
+                order.append(label)
+
+        old = asyncio.create_task(worker("batch", "batch"))
+        await asyncio.sleep(0.1)  # batch가 오래 대기 -> 우선순위 상승
+        new = asyncio.create_task(worker("chat", "chat"))
+        await asyncio.sleep(0)
+        scheduler.release("chat")
+        await asyncio.gather(old, new)
+        return order
+
+    assert asyncio.run(run()) == ["batch", "chat"]
+
+
+def test_slot_sync_from_worker_thread():
+    async def run():
+        scheduler = RequestScheduler(max_concurrency=1)
+        scheduler.attach(asyncio.get_running_loop())
+
+        def blocking_call():
+            with scheduler.slot_sync("summary", "video"):
+                time.sleep(0.01)
+                return scheduler.total_in_flight
+
+        in_flight = await asyncio.to_thread(blocking_call)
+        await asyncio.sleep(0)
+        return in_flight, scheduler.total_in_flight
+
+    assert asyncio.run(run()) == (1, 0)
+
+
+def test_parse_class_limits():
+    assert parse_class_limits("chat=4, summary=1") == {"chat": 4, "summary": 1}
@@ -0,0 +1,47 @@
+from core.simhash_index import SimHashIndex, simhash
+
+WORDS = ["오늘은", "파이썬", "비동기", "프로그래밍", "예제", "함께", "살펴보겠습니다", "이벤트", "루프", "코루틴",
+         "태스크", "스케줄링", "네트워크", "요청", "응답", "서버", "클라이언트", "성능", "측정", "결과"]
+BASE = " ".join(WORDS[(i * 7 + i // 3) % len(WORDS)] + str(i % 13) for i in range(400))
+
+
+def test_near_duplicate_has_small_distance():
+    edited = BASE + " [음악] 구독과 좋아요 부탁드립니다"
+    distance = bin(simhash(BASE) ^ simhash(edited)).count("1")
+    assert distance <= 3
+
+
+def test_lookup_returns_stored_summary_for_near_duplicate(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = SimHashIndex(path=path, max_distance=3, save_interval=0)
+    index.add("video-a", BASE, "요약 A")
+
+    reloaded = SimHashIndex(path=path, max_distance=3)
+    match = reloaded.lookup(BASE + " [박수]")
+    assert match["video_id"] == "video-a"
+    assert match["summary"] == "요약 A"
+
+
+def test_unrelated_transcript_is_not_matched():
+    index = SimHashIndex(max_distance=3)
+    index.add("video-a", BASE, "요약 A")
+    other = " ".join(f"주말 캠핑에서 {i}번째로 요리한 메뉴와 장비를 소개합니다" for i in range(40))
+    assert index.lookup(other) is None
+
+
+def test_index_is_bounded():
+    index = SimHashIndex(max_entries=2)
+    for i in range(3):
+        index.add(f"video-{i}", " ".join(f"문장 {i} {j} 내용 {j * i}" for j in range(60)), f"요약 {i}")
+    assert list(index.entries) == ["video-1", "video-2"]
+
+
+def test_summary_from_other_model_version_is_not_reused(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = SimHashIndex(path=path, save_interval=0)
+    index.add("video-a", BASE, "요약 A", version="base|summary@v1")
+
+    reloaded = SimHashIndex(path=path)
+    assert reloaded.lookup(BASE, version="base|summary@v2") is None
+    assert reloaded.lookup(BASE) is None
+    assert reloaded.lookup(BASE, version="base|summary@v1")["summary"] == "요약 A"
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from utils.startup_profiler import StartupProfiler, current_rss_mb
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# API 모드 cold start 예산 (CI 환경 차이를 고려해 환경변수로 조정 가능)
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "5"))
+RSS_BUDGET_MB = float(os.getenv("STARTUP_RSS_BUDGET_MB", "400"))
+GPU_MODULES = ("vllm", "torch", "transformers")
+
+_API_MODE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+from models.model_loader import ModelLoader
+model = ModelLoader(mode="api-dev")
+from utils.startup_profiler import current_rss_mb
+print(json.dumps({
+    "import_seconds": time.perf_counter() - start,
+    "rss_mb": current_rss_mb(),
+    "gpu_modules": [name for name in %r if name in sys.modules],
+}))
+""" % (GPU_MODULES,)
+
+
+def test_profiler_phases():
+    profiler = StartupProfiler()
+    time.sleep(0.01)
+    profiler.mark("imports")
+    with profiler.phase("model"):
+        data = bytearray(8 * 1024 * 1024)
+    summary = profiler.summary()
+    assert [phase["name"] for phase in summary["phases"]] == ["imports", "model"]
+    assert summary["phases"][0]["seconds"] >= 0.01
+    assert summary["total_seconds"] >= summary["phases"][0]["seconds"]
+    assert "model" in profiler.report()
+    assert current_rss_mb() > 0
+    del data
+
+
+def test_api_mode_cold_start_budget(tmp_path):
+    # API 모드에서는 GPU 라이브러리를 import하지 않고, import 시간/RSS가 예산 안에 있어야 함
+    env = {**os.environ, "PYTHONPATH": ROOT, "LLM_MODE": "api-dev", "GEMINI_API_KEY": "dummy"}
+    result = subprocess.run(
+        [sys.executable, "-c", _API_MODE_SCRIPT],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    assert measured["gpu_modules"] == []
+    assert measured["import_seconds"] < IMPORT_BUDGET_SECONDS
+    assert measured["rss_mb"] < RSS_BUDGET_MB
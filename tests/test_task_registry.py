@@ -0,0 +1,27 @@
+import asyncio
+
+from core.task_registry import SQLiteTaskRegistry
+
+
+def test_stale_cancellation_only_cancels_earlier_tasks(tmp_path):
+    async def scenario():
+        db_path = str(tmp_path / "state.db")
+        owner = SQLiteTaskRegistry(db_path, poll_interval=0.01)
+        other = SQLiteTaskRegistry(db_path)
+
+        old_task = asyncio.create_task(asyncio.sleep(10))
+        owner.register("stream-1", old_task)
+        other.cancel("stream-1")  # 다른 워커가 받은 중단 요청
+        await asyncio.sleep(0.01)
+        # 취소 요청 이후 같은 stream_id로 시작한 작업 (owner가 아직 취소 요청을 확인하기 전)
+        new_task = asyncio.create_task(asyncio.sleep(10))
+        owner.register("stream-1", new_task)
+
+        await owner.start()
+        await asyncio.sleep(0.1)
+        await owner.stop()
+        assert old_task.cancelled()
+        assert not new_task.done()
+        new_task.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,32 @@
+from core.transcript_cleaner import TranscriptCleaner, collapse_repeats, remove_overlap, strip_annotations
+
+
+def test_strip_annotations():
+    assert strip_annotations("[음악] 안녕하세요 [박수] 여러분 ♪") == "안녕하세요 여러분"
+
+
+def test_remove_overlap():
+    assert remove_overlap("오늘은 날씨가 정말 좋네요".split(), "정말 좋네요 산책을 갑니다".split()) == ["산책을", "갑니다"]
+    assert remove_overlap("정말 좋네요".split(), "정말 좋네요".split()) == []
+    # 한 단어 우연한 일치는 유지
+    assert remove_overlap("그래서 우리는".split(), "우리는 갑니다".split()) == ["우리는", "갑니다"]
+
+
+def test_collapse_repeats():
+    assert collapse_repeats("진짜 진짜 진짜 맛있어요".split()) == ["진짜", "맛있어요"]
+    assert collapse_repeats("이거 보세요 이거 보세요 여기".split()) == ["이거", "보세요", "여기"]
+
+
+def test_clean_reports_reduction():
+    units = ["[음악]", "음 오늘은 파이썬을", "오늘은 파이썬을 배워 봅시다", "오늘은 파이썬을 배워 봅시다", "어 정말 정말 쉬워요"]
+    cleaned, stats = TranscriptCleaner().clean(units)
+    assert cleaned == ["오늘은 파이썬을", "배워 봅시다", "정말 쉬워요"]
+    assert stats["original_units"] == 5 and stats["cleaned_units"] == 3
+    assert 0 < stats["reduction_ratio"] < 1
+
+
+def test_disabled_steps_keep_text():
+    units = ["음 안녕하세요", "안녕하세요"]
+    cleaned, stats = TranscriptCleaner(steps=[]).clean(units)
+    assert cleaned == units
+    assert stats["reduction_ratio"] == 0.0
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+from youtube_transcript_api._errors import RequestBlocked, TranscriptsDisabled
+
+from core.transcript_fetcher import AsyncRateLimiter, TranscriptFetcher
+
+
+class FakeClient:
+    def __init__(self, errors=(), delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    def fetch(self, video_id, languages):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return [{"text": f"{video_id} 자막"}]
+
+
+def make_fetcher(client, **kwargs):
+    fetcher = TranscriptFetcher(backoff=0.01, rate=0, **kwargs)
+    fetcher.clients = [client]
+    fetcher._client_cycle = iter(lambda: client, None)
+    return fetcher
+
+
+def test_retries_transient_errors():
+    client = FakeClient(errors=[RequestBlocked("abc")])
+    fetcher = make_fetcher(client)
+    assert asyncio.run(fetcher.fetch("abc", ["ko"])) == [{"text": "abc 자막"}]
+    assert client.calls == 2
+    fetcher.close()
+
+
+def test_does_not_retry_permanent_errors():
+    client = FakeClient(errors=[TranscriptsDisabled("abc")])
+    fetcher = make_fetcher(client)
+    with pytest.raises(TranscriptsDisabled):
+        asyncio.run(fetcher.fetch("abc", ["ko"]))
+    assert client.calls == 1
+    fetcher.close()
+
+
+def test_deadline():
+    fetcher = make_fetcher(FakeClient(delay=0.5), timeout=0.1)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(fetcher.fetch("abc", ["ko"]))
+    fetcher.close()
+
+
+def test_rate_limiter():
+    async def run():
+        limiter = AsyncRateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
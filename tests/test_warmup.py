@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.endpoints.health_router import router as health_router
+from core.request_context import remaining
+from core.warmup import Warmup, WarmupStep, _build_steps
+from models.lora_registry import LoRARegistry
+from models.model_loader import GCPModelLoader
+
+
+def test_records_steps_and_becomes_ready():
+    deadlines = []
+
+    def failing_prompt():
+        raise ConnectionError("langfuse unreachable")
+
+    warmup = Warmup([
+        WarmupStep("prompt:chats_bot", failing_prompt),
+        WarmupStep("generate:social_bot:chat", lambda: (deadlines.append(remaining()), time.sleep(0.01)), required=True),
+    ], step_timeout=30)
+    assert not warmup.ready and warmup.status == "pending"
+    asyncio.run(warmup.run())
+
+    # 선택 단계 실패는 기록만 하고 ready
+    assert warmup.ready
+    summary = warmup.summary()
+    assert [step["name"] for step in summary["steps"]] == ["prompt:chats_bot", "generate:social_bot:chat"]
+    assert not summary["steps"][0]["ok"] and "ConnectionError" in summary["steps"][0]["error"]
+    assert summary["steps"][1]["ok"] and summary["steps"][1]["seconds"] >= 0.01
+    # 단계는 마감 시각이 설정된 상태로 실행
+    assert 0 < deadlines[0] <= 30
+
+
+def test_required_step_failure_keeps_not_ready():
+    def failing_generation():
+        raise RuntimeError("engine error")
+
+    warmup = Warmup([WarmupStep("generate:youtube_summary:summary_final", failing_generation, required=True)])
+    asyncio.run(warmup.run())
+    assert warmup.status == "failed" and not warmup.ready
+
+
+def test_readiness_endpoint():
+    app = FastAPI()
+    app.include_router(health_router, prefix="/health")
+    app.state.startup_profile = {"total_seconds": 1.0, "phases": []}
+    client = TestClient(app)
+
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+
+    app.state.warmup = Warmup([])
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["status"] == "pending"
+
+    asyncio.run(app.state.warmup.run())
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready" and response.json()["startup"]["total_seconds"] == 1.0
+
+
+class FakeTokenizer:
+    def apply_chat_template(self, messages, add_generation_prompt=True, tokenize=False):
+        return messages[-1]["content"]
+
+    def __call__(self, prompt):
+        return {"input_ids": prompt.split()}
+
+
+class FakeLLM:
+    def generate(self, prompts, sampling_params, lora_request=None):
+        prompts = prompts if isinstance(prompts, list) else [prompts]
+        return [SimpleNamespace(outputs=[SimpleNamespace(text=f"{lora_request.lora_name}: {prompt}", token_ids=[1])])
+                for prompt in prompts]
+
+
+def test_warms_up_adapter_added_through_registry():
+    registry = LoRARegistry(
+        lambda lora_name, lora_int_id, lora_path: SimpleNamespace(lora_name=lora_name, lora_int_id=lora_int_id),
+        download_fn=lambda path, revision: path,
+        validate_fn=lambda local_path: None
+    )
+    registry.preload([
+        {"adapter_type": "youtube_summary", "lora_name": "article_summary", "path": "org/summary"},
+        {"adapter_type": "social_bot", "lora_name": "sns_chat", "path": "org/bot"},
+        {"adapter_type": "review_bot", "lora_name": "review", "path": "org/review"},
+    ])
+    loader = GCPModelLoader.__new__(GCPModelLoader)
+    loader.tokenizer = FakeTokenizer()
+    loader.lora_registry = registry
+    loader.batcher = None
+    loader.sampling_params = None
+    loader.model_vllm = FakeLLM()
+    loader._generate_lock = threading.Lock()
+    model = SimpleNamespace(mode="gcp-dev", loader=loader, get_response=loader.get_response)
+
+    steps = [step for step in _build_steps(SimpleNamespace(state=SimpleNamespace(model=model)), True, 1)
+             if step.name == "generate:review_bot:default"]
+    warmup = Warmup(steps)
+    asyncio.run(warmup.run())
+    # 기본 두 adapter 외에 등록된 adapter도 필수 단계로 예열되어 ready
+    assert len(steps) == 1 and steps[0].required
+    assert warmup.ready
@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from core.transcript_cleaner import create_transcript_cleaner
+from services import youtube_summary_service
+from services.youtube_summary_service import YouTubeSummaryService
+from utils.error_handler import SubtitlesNotFoundError
+
+
+class FakeFetcher:
+    def __init__(self, transcript):
+        self.transcript = transcript
+
+    async def fetch(self, video_id, languages):
+        return self.transcript
+
+
+def make_service(transcript):
+    service = YouTubeSummaryService.__new__(YouTubeSummaryService)
+    service.transcript_fetcher = FakeFetcher(transcript)
+    service.transcript_cleaner = create_transcript_cleaner()
+    return service
+
+
+def test_transcript_without_units_after_cleaning_is_not_found():
+    service = make_service([SimpleNamespace(text="[음악]"), SimpleNamespace(text="음 [박수]")])
+    trace = SimpleNamespace(update=lambda **_: None)
+    with pytest.raises(SubtitlesNotFoundError):
+        asyncio.run(service._prepare_transcript("https://www.youtube.com/watch?v=abc123", trace))
+
+
+class FakeStreamModel:
+    def __init__(self):
+        self.closed = False
+        self.streams = []
+
+    def slot(self, request_class, key=None):
+        return contextlib.nullcontext()
+
+    def stream_response(self, messages, trace, name, adapter_type):
+        stream = self._generate()
+        self.streams.append(stream)  # 참조가 남아 있어도 명시적으로 close 되어야 함
+        return stream
+
+    def _generate(self):
+        try:
+            for piece in ["최종 ", "요약"]:
+                yield piece
+        finally:
+            self.closed = True
+
+
+def test_stream_summary_closes_model_stream_when_client_disconnects(monkeypatch):
+    class FakePrompt:
+        def __init__(self, mode):
+            pass
+
+        def create_final_messages(self, chunk_summaries):
+            return None, [{"role": "user", "content": " ".join(chunk_summaries)}]
+
+    async def prepare(url, trace):
+        return "abc123", ["첫 문장", "둘째 문장"], "첫 문장 둘째 문장", {}
+
+    monkeypatch.setattr(youtube_summary_service, "YoutubeSummaryPrompt", FakePrompt)
+    service = YouTubeSummaryService.__new__(YouTubeSummaryService)
+    trace = SimpleNamespace(update=lambda **_: None)
+    service.langfuse = SimpleNamespace(trace=lambda **_: trace)
+    service.logger = logging.getLogger(__name__)
+    service.mode = "api-dev"
+    service.model = FakeStreamModel()
+    service.simhash_index = None
+    service.extractive_threshold = 0
+    service._prepare_transcript = prepare
+    service._split_chunks = lambda text, units: (units, False)
+    service._summarize_chunk = lambda chunk, *args: f"{chunk} 요약"
+
+    async def scenario():
+        events = service.stream_summary("https://www.youtube.com/watch?v=abc123")
+        async for event, data in events:
+            if event == "token":
+                break  # 첫 토큰 이후 클라이언트 연결 종료
+        await events.aclose()
+
+    asyncio.run(scenario())
+    assert service.model.closed
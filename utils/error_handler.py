@@ -40,4 +40,12 @@ class InternalServerError(Exception):
     서버 내부에서 예기치 못한 오류가 발생했을 때 사용합니다.
     - 예: AI 모델 호출 실패, 로직 버그 등
     """
-    pass
\ No newline at end of file
+    pass
+
+#### 504 ERROR ####
+class DeadlineExceededError(Exception):
+    """
+    요청의 마감 시각(deadline)이 지나 처리를 중단했을 때 사용합니다.
+    - 예: 스케줄러 대기 중 마감 초과, 요약 청크 처리 중 마감 초과 등
+    """
+    pass
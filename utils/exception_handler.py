@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
+from utils.error_handler import DeadlineExceededError
 
 def register_exception_handlers(app):
     @app.exception_handler(StarletteHTTPException)
@@ -17,6 +18,12 @@ def register_exception_handlers(app):
         logging.error("요청 유효성 검증 실패", exc_info=True, extra=extra)
         return JSONResponse(status_code=422, content={"detail": exc.errors()})
 
+    @app.exception_handler(DeadlineExceededError)
+    async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError):
+        extra = {'request_info': f"{request.method} {request.url} (status: 504)"}
+        logging.warning(f"요청 마감 시각 초과: {exc}", extra=extra)
+        return JSONResponse(status_code=504, content={"error": "deadline_exceeded", "message": "요청 처리 시간이 초과되었습니다."})
+
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         extra = {'request_info': f"{request.method} {request.url} (status: 500)"}
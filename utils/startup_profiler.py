@@ -0,0 +1,69 @@
+import os
+import resource
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 RSS(MB), /proc를 읽을 수 없으면 최대 RSS"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StartupProfiler:
+    """
+    서버 시작 단계(import, 모델 로딩, 서비스 초기화 등)별 소요 시간과 RSS 증가량 기록
+    - mark(name): 직전 mark 이후 구간을 하나의 단계로 기록 (모듈 최상단 import 구간 등)
+    - phase(name): with 블록 구간을 하나의 단계로 기록
+    """
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.start_rss_mb = current_rss_mb()
+        self.phases = []
+        self._last_mark = self.started_at
+        self._last_rss_mb = self.start_rss_mb
+
+    def _record(self, name: str, started: float, start_rss_mb: float):
+        now, rss_mb = time.perf_counter(), current_rss_mb()
+        self.phases.append({
+            "name": name,
+            "seconds": round(now - started, 4),
+            "rss_mb": round(rss_mb, 1),
+            "rss_delta_mb": round(rss_mb - start_rss_mb, 1)
+        })
+        self._last_mark, self._last_rss_mb = now, rss_mb
+
+    def mark(self, name: str):
+        self._record(name, self._last_mark, self._last_rss_mb)
+
+    @contextmanager
+    def phase(self, name: str):
+        started, start_rss_mb = time.perf_counter(), current_rss_mb()
+        try:
+            yield
+        finally:
+            self._record(name, started, start_rss_mb)
+
+    def summary(self) -> dict:
+        return {
+            "total_seconds": round(time.perf_counter() - self.started_at, 4),
+            "rss_mb": round(current_rss_mb(), 1),
+            "phases": list(self.phases)
+        }
+
+    def report(self, title: Optional[str] = None) -> str:
+        summary = self.summary()
+        lines = [title or "시작 단계별 소요 시간/메모리:"]
+        for phase in summary["phases"]:
+            lines.append(f"  - {phase['name']:<16} {phase['seconds']:>8.3f}s  RSS {phase['rss_mb']:>8.1f}MB ({phase['rss_delta_mb']:+.1f}MB)")
+        lines.append(f"  = total {summary['total_seconds']:.3f}s, RSS {summary['rss_mb']:.1f}MB")
+        return "\n".join(lines)
+
+
+# main.py가 가장 먼저 import하여 프로세스 시작 직후부터 측정
+startup_profiler = StartupProfiler()